@@ -0,0 +1,4 @@
+"""
+Paquete de benchmarks
+Ejecutar desde la raíz del proyecto: python -m benchmarks.<modulo>
+"""
@@ -0,0 +1,62 @@
+"""
+Benchmark de APIRedam contra el servidor simulado local
+
+Levanta el servidor en un hilo, recorre una búsqueda paginada completa,
+descarga detalles y fuerza la expiración del ViewState para medir la
+re-inicialización automática.
+
+Uso:
+    python -m benchmarks.bench_api_simulada [filas] [latencia]
+"""
+
+import sys
+import time
+
+from benchmarks.servidor_simulado import EstadoSimulado, ServidorSimulado
+from services.api_redam import APIRedam
+from services.planificador import PlanificadorSolicitudes
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    latencia = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+    
+    estado = EstadoSimulado(filas=filas, latencia=latencia)
+    servidor = ServidorSimulado(('127.0.0.1', 0), estado)
+    servidor.iniciar_en_hilo()
+    
+    api = APIRedam(
+        base_url=servidor.base_url,
+        usar_cache=False,
+        prefetch_detalles=0,
+        planificador=PlanificadorSolicitudes(tasa=1000, rafaga=1000)
+    )
+    
+    inicio = time.perf_counter()
+    resultados = api.buscar_por_nombres('GARCIA', '', 'JUAN', 'ABCD')
+    next(resultados)
+    t_primera = time.perf_counter() - inicio
+    total = 1 + sum(1 for _ in resultados)
+    t_total = time.perf_counter() - inicio
+    print(f"Búsqueda paginada: {total} filas en {t_total:.2f} s "
+          f"(primera fila en {t_primera * 1000:.0f} ms, {estado.peticiones} peticiones)")
+    
+    inicio = time.perf_counter()
+    for id_deudor in range(1, 51):
+        api.obtener_detalle_deudor(str(id_deudor))
+    t_detalle = time.perf_counter() - inicio
+    print(f"Detalle: {t_detalle / 50 * 1000:.1f} ms por deudor")
+    
+    # Cada búsqueda abre su propia vista; el detalle usa la del cliente,
+    # que es la que queda expirada
+    estado.expirar_todos()
+    inicio = time.perf_counter()
+    detalle = api.obtener_detalle_deudor('51')
+    print(f"Tras expirar el ViewState: detalle {'obtenido' if detalle else 'vacío'} en "
+          f"{(time.perf_counter() - inicio) * 1000:.0f} ms, estado: {api.obtener_estado_sesion()}")
+    
+    servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
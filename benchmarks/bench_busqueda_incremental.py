@@ -0,0 +1,105 @@
+"""
+Benchmark de la búsqueda por nombres mientras se escribe
+
+Simula a un usuario que teclea apellido paterno, materno y nombres letra por
+letra sobre un registro local grande, y compara el tiempo por tecla de
+buscar cada vez en todo el registro con el de BusquedaIncremental, que
+refina los candidatos anteriores.
+
+Uso:
+    python -m benchmarks.bench_busqueda_incremental [deudores]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from models.deudor_alimentario import DeudorAlimentario
+from services.busqueda_incremental import BusquedaIncremental
+from services.registro_local import RegistroLocal
+
+SILABAS = ['GAR', 'CI', 'A', 'LO', 'PEZ', 'MA', 'NI', 'QUIS', 'PE', 'TO',
+           'RRES', 'FLO', 'RES', 'SAN', 'CHEZ', 'RO', 'DRI', 'GUEZ', 'VAR', 'GAS']
+NOMBRES = ['JUAN CARLOS', 'MARIA ELENA', 'PEDRO ANTONIO', 'ROSA', 'LUIS ALBERTO',
+           'ANA LUCIA', 'JORGE', 'CARMEN ROSA']
+
+# Lo que escribe el usuario, campo por campo
+ESCRITURA = ('GARCIA', 'PEZ', 'ROSA')
+
+
+def generar_apellidos():
+    """Apellidos sintéticos de dos y tres sílabas"""
+    apellidos = [a + b for a in SILABAS for b in SILABAS]
+    apellidos += [a + b + c for a in SILABAS[:10] for b in SILABAS for c in SILABAS]
+    return apellidos
+
+
+def generar_registro(total):
+    """Registro local con deudores sintéticos, fechas en orden creciente"""
+    apellidos = generar_apellidos()
+    azar = random.Random(0)
+    base = datetime(2008, 1, 1)
+    deudores = []
+    for i in range(total):
+        fecha = base + timedelta(days=i * 6000 // total)
+        deudores.append((DeudorAlimentario(
+            azar.choice(apellidos),
+            azar.choice(apellidos),
+            azar.choice(NOMBRES),
+            'DNI', str(10000000 + i), fecha.strftime('%d/%m/%Y')
+        ), 0))
+    registro = RegistroLocal()
+    registro.agregar_lote(deudores)
+    return registro
+
+
+def teclas():
+    """Criterios tras cada tecla, desde el mínimo de la búsqueda en vivo"""
+    criterios = []
+    paterno, materno, nombres = ESCRITURA
+    for n in range(2, len(paterno) + 1):
+        criterios.append((paterno[:n], '', ''))
+    for n in range(1, len(materno) + 1):
+        criterios.append((paterno, materno[:n], ''))
+    for n in range(1, len(nombres) + 1):
+        criterios.append((paterno, materno, nombres[:n]))
+    return criterios
+
+
+def medir(buscar):
+    """Tiempo y cantidad de resultados de cada tecla"""
+    tiempos = []
+    for criterios in teclas():
+        inicio = time.perf_counter()
+        resultados = buscar(*criterios)
+        tiempos.append((time.perf_counter() - inicio, len(resultados)))
+    return tiempos
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    
+    inicio = time.perf_counter()
+    registro = generar_registro(total)
+    print(f"Registro de {len(registro)} deudores creado en {time.perf_counter() - inicio:.1f} s")
+    
+    completa = medir(lambda *c: registro.buscar_por_nombres(*BusquedaIncremental.normalizar(*c)))
+    sesion = BusquedaIncremental(registro)
+    incremental = medir(sesion.buscar)
+    
+    print(f"{'tecla':<28}{'resultados':>12}{'completa ms':>14}{'incremental ms':>16}")
+    for criterios, (t_c, n_c), (t_i, n_i) in zip(teclas(), completa, incremental):
+        assert n_c == n_i, criterios
+        texto = ' / '.join(c for c in criterios if c)
+        print(f"{texto:<28}{n_i:>12}{t_c * 1000:>14.1f}{t_i * 1000:>16.1f}")
+    
+    print(f"Peor tecla: completa {max(t for t, _ in completa) * 1000:.1f} ms, "
+          f"incremental {max(t for t, _ in incremental) * 1000:.1f} ms")
+    print(f"Total:      completa {sum(t for t, _ in completa) * 1000:.1f} ms, "
+          f"incremental {sum(t for t, _ in incremental) * 1000:.1f} ms "
+          f"({sesion.completas} búsquedas completas, {sesion.refinadas} refinadas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark de la exportación de resultados
+
+Exporta deudores sintéticos (cada uno con un expediente y su demandante)
+a cada formato, generándolos sobre la marcha como lo hace la búsqueda, y
+mide filas por segundo, tamaño del archivo y memoria máxima del proceso.
+La memoria no debe crecer con el número de filas.
+
+Uso:
+    python -m benchmarks.bench_exportacion [deudores]
+"""
+
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from benchmarks.paginas_sinteticas import datos_fila
+from models.deudor_alimentario import DeudorAlimentario
+from models.expediente import Expediente
+from models.demandante import Demandante
+from services import exportacion
+
+
+def generar_deudores(total):
+    """Genera deudores sintéticos uno a uno, con un expediente cada uno"""
+    for i in range(total):
+        d = datos_fila(i, total)
+        paterno, materno, nombres = d['nombre_completo'].split(' ', 2)
+        deudor = DeudorAlimentario(paterno, materno, nombres, d['tipo_documento'],
+                                   d['numero_documento'], d['fecha_registro'])
+        expediente = Expediente(f"{i:05d}-2020-0-1801-JP-FC-01", 'LIMA',
+                                'JUZGADO DE PAZ LETRADO', 'SECRETARIO', 850.0,
+                                10200.0 + i % 1000, 510.0)
+        expediente.demandante = Demandante(materno, paterno, 'MARIA', 'HIJO(A)')
+        deudor.expedientes.append(expediente)
+        yield deudor
+
+
+def memoria_maxima_mb():
+    """Memoria residente máxima del proceso hasta ahora"""
+    maxima = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxima / 1024 if sys.platform != 'darwin' else maxima / (1024 * 1024)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    
+    formatos = [exportacion.FORMATO_CSV, exportacion.FORMATO_JSONL]
+    if exportacion.pa is not None:
+        formatos += [exportacion.FORMATO_PARQUET, exportacion.FORMATO_ARROW]
+    else:
+        print("pyarrow no está instalado: se omiten Parquet y Arrow")
+    
+    inicio = time.perf_counter()
+    for _ in generar_deudores(total):
+        pass
+    t_generar = time.perf_counter() - inicio
+    print(f"Deudores: {total} (generarlos toma {t_generar:.1f} s, incluido abajo)")
+    
+    with tempfile.TemporaryDirectory() as carpeta:
+        for formato in formatos:
+            ruta = os.path.join(carpeta, f"resultados.{formato}")
+            inicio = time.perf_counter()
+            exportados = exportacion.exportar(generar_deudores(total), ruta, formato)
+            tiempo = time.perf_counter() - inicio
+            tamano = os.path.getsize(ruta) / (1024 * 1024)
+            print(f"{formato:<8}{exportados / tiempo:>12,.0f} deudores/s"
+                  f"{tamano / tiempo:>10.1f} MB/s{tamano:>10.1f} MB"
+                  f"   memoria máxima {memoria_maxima_mb():.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
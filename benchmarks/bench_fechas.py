@@ -0,0 +1,61 @@
+"""
+Benchmark de la conversión de fechas dd/mm/yyyy
+
+Convierte una columna de fechas de registro (repetidas como en el REDAM:
+muchos deudores por día) con datetime.strptime, con el conversor por
+posiciones sin memoria y con convertir_fecha, y comprueba que los tres
+dan el mismo resultado.
+
+Uso:
+    python -m benchmarks.bench_fechas [fechas]
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+from utils.fechas import convertir_fecha, _convertir, FORMATO_FECHA
+
+
+def generar_fechas(total, dias=6000):
+    """Fechas de registro en texto, repartidas en un rango de días"""
+    base = datetime(2008, 1, 1)
+    textos = [(base + timedelta(days=d)).strftime(FORMATO_FECHA) for d in range(dias)]
+    return [textos[i * 7919 % dias] for i in range(total)]
+
+
+def strptime(texto):
+    try:
+        return datetime.strptime(texto, FORMATO_FECHA)
+    except ValueError:
+        return None
+
+
+def medir(convertir, fechas):
+    """Tiempo y resultados de convertir toda la columna"""
+    inicio = time.perf_counter()
+    resultados = [convertir(t) for t in fechas]
+    return time.perf_counter() - inicio, resultados
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    fechas = generar_fechas(total)
+    print(f"Fechas: {total} ({len(set(fechas))} distintas)")
+    
+    convertir_fecha.cache_clear()
+    referencia = None
+    for nombre, convertir in (('datetime.strptime', strptime),
+                              ('por posiciones', _convertir),
+                              ('convertir_fecha', convertir_fecha)):
+        tiempo, resultados = medir(convertir, fechas)
+        if referencia is None:
+            referencia, t_referencia = resultados, tiempo
+        assert resultados == referencia, nombre
+        print(f"{nombre:<20}{total / tiempo / 1e6:>8.2f} M/s{tiempo:>8.1f} s"
+              f"{t_referencia / tiempo:>8.1f}x")
+    print(convertir_fecha.cache_info())
+
+
+if __name__ == '__main__':
+    main()
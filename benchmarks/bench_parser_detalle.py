@@ -0,0 +1,68 @@
+"""
+Benchmark del parseo de la página de detalle
+
+Compara el costo de parsear_detalle con el de construir el árbol y
+recorrerlo una sola vez. Con la extracción en una pasada la relación
+debe mantenerse cercana a 1.
+
+Uso:
+    python -m benchmarks.bench_parser_detalle [repeticiones]
+"""
+
+import sys
+import time
+
+from bs4 import BeautifulSoup
+from benchmarks.paginas_sinteticas import generar_pagina_detalle
+from services.parser_html import PARSERS, PATRON_DECLARACION_XML, crear_parser, lxml_html
+
+
+def recorrido_bs4(html):
+    """Construye el árbol BeautifulSoup y lo recorre completo una vez"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return sum(1 for _ in soup.descendants)
+
+
+def recorrido_lxml(html):
+    """Construye el árbol lxml y lo recorre completo una vez"""
+    raiz = lxml_html.document_fromstring(PATRON_DECLARACION_XML.sub('', html, count=1))
+    return sum(1 for _ in raiz.iter())
+
+
+RECORRIDOS = {
+    'html.parser': recorrido_bs4,
+    'lxml': recorrido_lxml,
+}
+
+
+def medir(funcion, argumento, repeticiones):
+    """Retorna el mejor tiempo en segundos"""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(argumento)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    html = generar_pagina_detalle()
+    
+    for nombre in PARSERS:
+        try:
+            parser = crear_parser(nombre)
+        except ValueError as e:
+            print(f"{nombre:12s} no disponible: {e}")
+            continue
+        
+        t_detalle = medir(parser.parsear_detalle, html, repeticiones)
+        t_recorrido = medir(RECORRIDOS[nombre], html, repeticiones)
+        
+        print(f"{nombre:12s} detalle: {t_detalle * 1000:6.2f} ms   "
+              f"un recorrido: {t_recorrido * 1000:6.2f} ms   "
+              f"relación: {t_detalle / t_recorrido:4.2f}x")
+
+
+if __name__ == '__main__':
+    main()
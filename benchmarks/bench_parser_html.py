@@ -0,0 +1,102 @@
+"""
+Benchmark de los backends de parseo HTML sobre páginas sintéticas
+
+Para cada backend mide el parseo completo del documento y el modo
+restringido a la tabla de resultados (tiempo total, tiempo hasta la
+primera fila y pico de memoria Python). Los tiempos son la mediana de
+varias repeticiones.
+
+Uso:
+    python -m benchmarks.bench_parser_html [filas] [repeticiones]
+"""
+
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.paginas_sinteticas import generar_pagina_resultados, generar_pagina_detalle
+from services.parser_html import PARSERS, crear_parser
+
+
+def medir(funcion, argumento, repeticiones):
+    """Retorna la mediana del tiempo (segundos) y el último resultado"""
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion(argumento)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos), resultado
+
+
+def medir_iteracion(parser, html, restringido, repeticiones):
+    """Retorna (mediana del tiempo total, mediana del tiempo a la primera fila, filas)"""
+    totales = []
+    primeras = []
+    
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        primera = None
+        filas = []
+        
+        for deudor in parser.iterar_resultados(html, restringido=restringido):
+            if primera is None:
+                primera = time.perf_counter() - inicio
+            filas.append(deudor)
+        
+        total = time.perf_counter() - inicio
+        totales.append(total)
+        primeras.append(primera or total)
+    
+    return statistics.median(totales), statistics.median(primeras), filas
+
+
+def medir_memoria(parser, html, restringido):
+    """Retorna el pico de memoria Python al recorrer los resultados sin guardarlos"""
+    tracemalloc.start()
+    for _ in parser.iterar_resultados(html, restringido=restringido):
+        pass
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    pagina = generar_pagina_resultados(filas)
+    detalle = generar_pagina_detalle()
+    
+    print(f"Página de resultados: {filas} filas, {len(pagina) / 1024:.0f} KB "
+          f"(mediana de {repeticiones} repeticiones)")
+    
+    referencia = None
+    for nombre in PARSERS:
+        try:
+            parser = crear_parser(nombre)
+        except ValueError as e:
+            print(f"{nombre:12s} no disponible: {e}")
+            continue
+        
+        t_detalle, datos = medir(parser.parsear_detalle, detalle, 20)
+        
+        for restringido in (False, True):
+            total, primera, deudores = medir_iteracion(parser, pagina, restringido, repeticiones)
+            pico = medir_memoria(parser, pagina, restringido)
+            
+            if referencia is None:
+                referencia = (deudores, datos)
+            iguales = (deudores, datos) == referencia
+            
+            modo = 'restringido' if restringido else 'completo'
+            print(f"{nombre:12s} {modo:12s} resultados: {total * 1000:8.1f} ms   "
+                  f"primera fila: {primera * 1000:7.1f} ms   "
+                  f"memoria Python: {pico / 1024 / 1024:6.1f} MB   "
+                  f"filas: {len(deudores)}   idéntico: {iguales}")
+        
+        print(f"{nombre:12s} detalle: {t_detalle * 1000:6.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
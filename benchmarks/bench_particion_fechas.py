@@ -0,0 +1,82 @@
+"""
+Benchmark de la búsqueda por fechas particionada
+
+Contra el servidor simulado (con latencia por petición), recorre un rango
+de fechas amplio con una sola búsqueda paginada y con
+buscar_por_fechas_particionado, comprueba que entregan los mismos deudores
+y mide el tiempo total y el de la primera fila.
+
+Uso:
+    python -m benchmarks.bench_particion_fechas [filas] [latencia] [concurrencia]
+"""
+
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.servidor_simulado import EstadoSimulado, ServidorSimulado
+from services.api_redam import APIRedam
+from services.planificador import PlanificadorSolicitudes
+
+INICIO = datetime(2010, 1, 1)
+FIN = datetime(2012, 12, 31)
+
+
+def medir(buscar):
+    """
+    Ejecuta la búsqueda y recorre los resultados
+    
+    Args:
+        buscar (callable): Retorna los resultados (la primera página se
+            pide al llamarla, así que entra en la medición)
+    
+    Returns:
+        tuple: (ids, segundos totales, segundos hasta la primera fila)
+    """
+    inicio = time.perf_counter()
+    primera = None
+    ids = []
+    for deudor in buscar():
+        if primera is None:
+            primera = time.perf_counter() - inicio
+        ids.append(deudor['id'])
+    return ids, time.perf_counter() - inicio, primera
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    latencia = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    concurrencia = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    
+    estado = EstadoSimulado(filas=filas, latencia=latencia)
+    servidor = ServidorSimulado(('127.0.0.1', 0), estado)
+    servidor.iniciar_en_hilo()
+    
+    api = APIRedam(
+        base_url=servidor.base_url,
+        usar_cache=False,
+        planificador=PlanificadorSolicitudes(tasa=200, rafaga=20)
+    )
+    
+    print(f"Rango {INICIO:%d/%m/%Y} - {FIN:%d/%m/%Y}, {filas} filas en el servidor, "
+          f"latencia {latencia * 1000:.0f} ms")
+    
+    secuencial, t_secuencial, p_secuencial = medir(
+        lambda: api.buscar_por_fechas(INICIO, FIN, 'ABCD'))
+    print(f"Una búsqueda paginada: {len(secuencial)} filas en {t_secuencial:.2f} s "
+          f"(primera fila en {p_secuencial * 1000:.0f} ms)")
+    
+    particionada, t_particion, p_particion = medir(
+        lambda: api.buscar_por_fechas_particionado(INICIO, FIN, 'ABCD',
+                                                   max_concurrencia=concurrencia))
+    print(f"Particionada por meses ({concurrencia} a la vez): {len(particionada)} filas en "
+          f"{t_particion:.2f} s (primera fila en {p_particion * 1000:.0f} ms)")
+    
+    assert sorted(secuencial) == sorted(particionada)
+    print(f"Mismos deudores; {t_secuencial / t_particion:.1f}x más rápido")
+    
+    servidor.shutdown()
+
+
+if __name__ == '__main__':
+    main()
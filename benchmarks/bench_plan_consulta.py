@@ -0,0 +1,111 @@
+"""
+Benchmark de las consultas compuestas
+
+Compara, sobre un registro local grande, resolver nombre + rango de fechas +
+distrito como se hacía antes (una búsqueda completa por criterio y luego la
+intersección de los resultados) con el plan de PlanificadorConsulta, y
+muestra el plan elegido para cada consulta.
+
+Uso:
+    python -m benchmarks.bench_plan_consulta [deudores]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from models.consulta import Consulta
+from models.deudor_alimentario import DeudorAlimentario
+from models.expediente import Expediente
+from services.plan_consulta import PlanificadorConsulta
+from services.registro_local import RegistroLocal
+from benchmarks.bench_busqueda_incremental import generar_apellidos, NOMBRES
+
+DISTRITOS = ['LIMA', 'LIMA NORTE', 'LIMA SUR', 'CALLAO', 'AREQUIPA', 'CUSCO', 'PIURA',
+             'LA LIBERTAD', 'LAMBAYEQUE', 'JUNIN', 'PUNO', 'TACNA', 'ICA', 'LORETO']
+
+CONSULTAS = [
+    dict(apellido_paterno='GARCIA', fecha_inicial=datetime(2015, 1, 1),
+         fecha_final=datetime(2015, 6, 30), distrito_judicial='LIMA'),
+    dict(apellido_paterno='GAR', nombres='ROSA', fecha_inicial=datetime(2019, 3, 1),
+         fecha_final=datetime(2019, 3, 31)),
+    dict(distrito_judicial='CUSCO', fecha_inicial=datetime(2012, 1, 1),
+         fecha_final=datetime(2012, 12, 31), apellido_materno='PEZ'),
+]
+
+
+def generar_registro(total):
+    """Registro con deudores sintéticos de uno o dos expedientes"""
+    apellidos = generar_apellidos()
+    azar = random.Random(0)
+    base = datetime(2008, 1, 1)
+    deudores = []
+    for i in range(total):
+        fecha = base + timedelta(days=azar.randrange(6000))
+        deudor = DeudorAlimentario(azar.choice(apellidos), azar.choice(apellidos),
+                                   azar.choice(NOMBRES), 'DNI', str(10000000 + i),
+                                   fecha.strftime('%d/%m/%Y'))
+        for _ in range(azar.randint(1, 2)):
+            deudor.expedientes.append(Expediente(
+                f"{i:05d}-2020-0-1801-JP-FC-01", azar.choice(DISTRITOS),
+                'JUZGADO DE PAZ LETRADO', 'SECRETARIO', 850.0, 10200.0, 510.0))
+        deudores.append((deudor, 0))
+    registro = RegistroLocal()
+    registro.agregar_lote(deudores)
+    return registro
+
+
+def por_separado(registro, criterios):
+    """Una búsqueda completa por criterio e intersección de los resultados"""
+    conjuntos = []
+    if 'apellido_paterno' in criterios:
+        conjuntos.append(registro.buscar_por_nombres(
+            criterios['apellido_paterno'], criterios.get('apellido_materno', ''),
+            criterios.get('nombres', '')))
+    if 'fecha_inicial' in criterios:
+        conjuntos.append(registro.buscar_por_fechas(criterios['fecha_inicial'],
+                                                    criterios['fecha_final']))
+    if 'distrito_judicial' in criterios:
+        conjuntos.append([d for d in registro if any(
+            e.distrito_judicial == criterios['distrito_judicial'] for e in d.expedientes)])
+    if 'apellido_paterno' not in criterios and ('apellido_materno' in criterios
+                                                or 'nombres' in criterios):
+        conjuntos.append([d for d in registro
+                          if criterios.get('apellido_materno', '') in d.apellido_materno
+                          and criterios.get('nombres', '') in d.nombres])
+    
+    claves = set.intersection(*({(d.tipo_documento, d.numero_documento) for d in c}
+                                for c in conjuntos))
+    return [d for d in conjuntos[0] if (d.tipo_documento, d.numero_documento) in claves]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    
+    inicio = time.perf_counter()
+    registro = generar_registro(total)
+    print(f"Registro de {len(registro)} deudores creado en {time.perf_counter() - inicio:.1f} s\n")
+    planificador = PlanificadorConsulta(registro)
+    
+    for argumentos in CONSULTAS:
+        consulta = Consulta('COMPUESTA')
+        consulta.consultar_compuesta(**argumentos)
+        criterios = consulta.ejecutar_consulta()
+        
+        inicio = time.perf_counter()
+        esperados = por_separado(registro, criterios)
+        t_separado = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        resultados, plan = planificador.consultar(criterios)
+        t_plan = time.perf_counter() - inicio
+        
+        assert ({id(d) for d in resultados} == {id(d) for d in esperados}), argumentos
+        print(plan.explicar())
+        print(f"  {len(resultados)} resultados: por separado {t_separado * 1000:.1f} ms, "
+              f"con plan {t_plan * 1000:.1f} ms ({t_separado / t_plan:.0f}x)\n")
+
+
+if __name__ == '__main__':
+    main()
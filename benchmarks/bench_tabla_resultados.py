@@ -0,0 +1,113 @@
+"""
+Benchmark de la tabla de resultados
+
+Compara el tiempo hasta ver la tabla con datos entre el llenado anterior
+(QTableWidgetItem por celda y QPushButton por fila) y TablaResultados
+(modelo + delegado). Con el modelo el tiempo no debe depender del número
+de filas.
+
+También mide ordenar (por fecha y por nombre) y filtrar los resultados ya
+mostrados, la primera vez y al repetir.
+
+Uso:
+    QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_tabla_resultados [filas]
+"""
+
+import random
+import sys
+import time
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem, QPushButton
+
+from benchmarks.paginas_sinteticas import datos_fila
+from models.deudor_alimentario import DeudorAlimentario
+from views.tabla_resultados import TablaResultados
+
+# El llenado anterior es lineal; se mide con menos filas y se extrapola
+FILAS_WIDGETS = 2000
+
+
+def generar_deudores(total):
+    """Crea deudores sintéticos"""
+    deudores = []
+    for i in range(total):
+        d = datos_fila(i, total)
+        paterno, materno, nombres = d['nombre_completo'].split(' ', 2)
+        deudores.append(DeudorAlimentario(
+            paterno, materno, nombres,
+            d['tipo_documento'], d['numero_documento'], d['fecha_registro']
+        ))
+    return deudores
+
+
+def llenar_con_widgets(tabla, deudores):
+    """Reproduce el mostrar_resultados anterior de las pestañas"""
+    tabla.setRowCount(len(deudores))
+    for i, deudor in enumerate(deudores):
+        tabla.setItem(i, 0, QTableWidgetItem(deudor.obtener_nombre_completo()))
+        tabla.setItem(i, 1, QTableWidgetItem(deudor.tipo_documento))
+        tabla.setItem(i, 2, QTableWidgetItem(deudor.numero_documento))
+        tabla.setItem(i, 3, QTableWidgetItem(deudor.fecha_registro))
+        boton = QPushButton("Ver Detalle")
+        boton.setStyleSheet("""
+            QPushButton {
+                background-color: #4CAF50;
+                color: white;
+                border: none;
+                padding: 5px 10px;
+                border-radius: 3px;
+            }
+        """)
+        tabla.setCellWidget(i, 4, boton)
+
+
+def medir(app, tabla, llenar):
+    """Tiempo hasta terminar de llenar y dibujar la tabla"""
+    inicio = time.perf_counter()
+    llenar()
+    tabla.repaint()
+    app.processEvents()
+    return time.perf_counter() - inicio
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    app = QApplication.instance() or QApplication(sys.argv)
+    deudores = generar_deudores(filas)
+    
+    tabla_widgets = QTableWidget(0, 5)
+    tabla_widgets.resize(1000, 600)
+    tabla_widgets.show()
+    muestra = deudores[:min(filas, FILAS_WIDGETS)]
+    t_widgets = medir(app, tabla_widgets, lambda: llenar_con_widgets(tabla_widgets, muestra))
+    t_widgets_total = t_widgets * filas / len(muestra)
+    
+    tabla_modelo = TablaResultados()
+    tabla_modelo.resize(1000, 600)
+    tabla_modelo.show()
+    t_modelo = medir(app, tabla_modelo, lambda: tabla_modelo.mostrar(deudores))
+    
+    print(f"Filas: {filas}")
+    print(f"QTableWidget + botones: {t_widgets * 1000:8.1f} ms con {len(muestra)} filas "
+          f"(~{t_widgets_total:.1f} s estimados para {filas})")
+    print(f"TablaResultados:        {t_modelo * 1000:8.1f} ms con {filas} filas")
+    
+    # Orden y filtro en la vista, con los resultados en orden de llegada
+    random.Random(0).shuffle(deudores)
+    tabla_modelo.mostrar(deudores)
+    operaciones = [
+        ("Ordenar por fecha", lambda: tabla_modelo.sortByColumn(3, Qt.AscendingOrder)),
+        ("Invertir orden fecha", lambda: tabla_modelo.sortByColumn(3, Qt.DescendingOrder)),
+        ("Ordenar por nombre", lambda: tabla_modelo.sortByColumn(0, Qt.AscendingOrder)),
+        ("Filtrar 'GARCIA'", lambda: tabla_modelo.filtrar('GARCIA')),
+        ("Afinar 'GARCIA LOPEZ'", lambda: tabla_modelo.filtrar('GARCIA LOPEZ')),
+        ("Quitar filtro", lambda: tabla_modelo.filtrar('')),
+    ]
+    for nombre, operacion in operaciones:
+        t = medir(app, tabla_modelo, operacion)
+        print(f"{nombre + ':':<24}{t * 1000:8.1f} ms ({tabla_modelo.modelo.rowCount()} filas visibles)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark de la validación masiva
+
+Valida columnas sintéticas de documentos y nombres (con un porcentaje de
+valores inválidos) fila por fila con Validaciones y por columna con
+ValidacionMasiva, comprueba que las máscaras coinciden y mide filas por
+segundo.
+
+Uso:
+    python -m benchmarks.bench_validacion_masiva [filas]
+"""
+
+import random
+import sys
+import time
+
+from utils.validaciones import Validaciones
+from utils.validacion_masiva import ValidacionMasiva
+
+NOMBRES = ['GARCIA', 'LOPEZ', 'PEÑA', 'NUÑEZ-ROJAS', 'MARIA JOSE', 'JUAN CARLOS',
+           'FERNANDEZ', 'TORRES', 'QUISPE', 'MAMANI', 'ROSA 2', 'LUIS@']
+
+
+def generar_columnas(total):
+    """Columnas de DNI, carnets, pasaportes y nombres con ~10 % de errores"""
+    azar = random.Random(0)
+    dnis, carnets, pasaportes, nombres = [], [], [], []
+    for i in range(total):
+        error = azar.random() < 0.1
+        dnis.append(f"{azar.randrange(10 ** 7):07d}" if error else f"{10000000 + i}")
+        carnets.append(f"{azar.randrange(10 ** 9):09d}" + ('X' if error else ''))
+        pasaportes.append(('P-' if error else 'P') + f"{azar.randrange(10 ** 8):08d}")
+        nombres.append(azar.choice(NOMBRES))
+    return {
+        'dni': dnis,
+        'carnet_extranjeria': carnets,
+        'pasaporte': pasaportes,
+        'nombres': nombres,
+    }
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    columnas = generar_columnas(total)
+    print(f"Filas por columna: {total}")
+    print(f"{'columna':<20}{'fila a fila':>16}{'masiva':>16}{'inválidas':>12}")
+    
+    for nombre, valores in columnas.items():
+        escalar = getattr(Validaciones, f"validar_{nombre}")
+        masiva = getattr(ValidacionMasiva, f"validar_{nombre}")
+        
+        inicio = time.perf_counter()
+        esperado = [escalar(v) for v in valores]
+        t_escalar = time.perf_counter() - inicio
+        
+        inicio = time.perf_counter()
+        resultado = masiva(valores)
+        t_masiva = time.perf_counter() - inicio
+        
+        assert list(resultado.mascara) == esperado, nombre
+        print(f"{nombre:<20}{total / t_escalar / 1e6:>12.2f} M/s{total / t_masiva / 1e6:>12.2f} M/s"
+              f"{resultado.invalidos:>12}")
+
+
+if __name__ == '__main__':
+    main()
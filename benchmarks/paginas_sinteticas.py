@@ -0,0 +1,197 @@
+"""
+Generador de páginas HTML sintéticas con el formato del REDAM
+"""
+
+from datetime import datetime, timedelta
+
+NOMBRES = ['JUAN CARLOS', 'MARIA ELENA', 'PEDRO ANTONIO', 'ROSA', 'LUIS ALBERTO']
+APELLIDOS = ['GARCIA', 'LOPEZ', 'FERNANDEZ', 'TORRES', 'QUISPE', 'MAMANI', 'FLORES']
+
+TABLA_ID = 'formConsulta:tablaResultados'
+
+# Las fechas de registro sintéticas se reparten en este periodo
+FECHA_BASE = datetime(2008, 1, 1)
+DIAS_PERIODO = 6000
+
+
+def datos_fila(i, total, semilla=0):
+    """
+    Datos determinísticos del deudor sintético i
+    
+    Args:
+        i (int): Índice del deudor (0..total-1)
+        total (int): Tamaño del registro sintético
+        semilla (int): Semilla para variar los nombres
+    
+    Returns:
+        dict: id, nombre_completo, tipo_documento, numero_documento, fecha_registro
+    """
+    k = i + semilla
+    nombre = (f"{APELLIDOS[k % 7]} {APELLIDOS[(k // 7) % 7]} "
+              f"{NOMBRES[(k // 49) % 5]}")
+    fecha = FECHA_BASE + timedelta(days=i * DIAS_PERIODO // max(total, 1))
+    
+    return {
+        'id': str(i + 1),
+        'nombre_completo': nombre,
+        'tipo_documento': 'DNI',
+        'numero_documento': str(10000000 + i),
+        'fecha_registro': fecha.strftime('%d/%m/%Y')
+    }
+
+
+def generar_filas(indices, total, semilla=0):
+    """
+    Genera las filas tr de la tabla de resultados
+    
+    Args:
+        indices (iterable): Índices de los deudores a incluir
+        total (int): Tamaño del registro sintético
+        semilla (int): Semilla para variar los nombres
+    
+    Returns:
+        str: HTML de las filas
+    """
+    partes = []
+    for i in indices:
+        d = datos_fila(i, total, semilla)
+        partes.append(
+            f'<tr class="ui-widget-content"><td> <span>{d["nombre_completo"]}</span> </td>'
+            f'<td>{d["tipo_documento"]}</td><td>{d["numero_documento"]}</td>'
+            f'<td>{d["fecha_registro"]}</td>'
+            f'<td><button type="button" onclick="verDetalle(\'{d["id"]}\');return false;">'
+            f'Ver</button></td></tr>'
+        )
+    return '\n'.join(partes)
+
+
+def generar_pagina_consulta(view_state, contenido=''):
+    """
+    Genera la página del formulario de consulta con su ViewState
+    
+    Args:
+        view_state (str): Token javax.faces.ViewState
+        contenido (str): HTML adicional dentro del formulario (resultados)
+    
+    Returns:
+        str: HTML de la página
+    """
+    return '\n'.join([
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<html><head><title>REDAM</title></head><body>',
+        '<form id="formConsulta">',
+        f'<input type="hidden" name="javax.faces.ViewState" value="{view_state}" />',
+        contenido,
+        '</form></body></html>',
+    ])
+
+
+def generar_tabla_resultados(indices, total, semilla=0, hay_siguiente=False):
+    """
+    Genera la tabla de resultados con su header y, si aplica, el paginador
+    
+    Args:
+        indices (iterable): Índices de los deudores de la página
+        total (int): Tamaño del registro sintético
+        semilla (int): Semilla para variar los nombres
+        hay_siguiente (bool): Si True, el botón "siguiente" queda habilitado
+    
+    Returns:
+        str: HTML de la tabla
+    """
+    estado = 'ui-state-default' if hay_siguiente else 'ui-state-default ui-state-disabled'
+    return '\n'.join([
+        f'<table id="{TABLA_ID}" class="ui-datatable">',
+        '<thead><tr><th>Apellidos y Nombres</th><th>Tipo Doc.</th>'
+        '<th>N° Documento</th><th>Fecha Registro</th><th></th></tr></thead><tbody>',
+        generar_filas(indices, total, semilla),
+        '</tbody></table>',
+        f'<div class="ui-paginator"><a class="ui-paginator-next {estado}">&gt;</a></div>',
+    ])
+
+
+def generar_respuesta_parcial(indices, total, view_state, semilla=0):
+    """
+    Genera la partial-response AJAX con las filas de una página
+    
+    Args:
+        indices (iterable): Índices de los deudores de la página
+        total (int): Tamaño del registro sintético
+        view_state (str): Token javax.faces.ViewState
+        semilla (int): Semilla para variar los nombres
+    
+    Returns:
+        str: XML de la respuesta parcial
+    """
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<partial-response><changes>'
+        f'<update id="{TABLA_ID}"><![CDATA[{generar_filas(indices, total, semilla)}]]></update>'
+        f'<update id="javax.faces.ViewState"><![CDATA[{view_state}]]></update>'
+        '</changes></partial-response>'
+    )
+
+
+def generar_pagina_resultados(filas, semilla=0):
+    """
+    Genera una página de resultados con la tabla tablaResultados
+    
+    Args:
+        filas (int): Número de filas de datos
+        semilla (int): Semilla para variar los nombres
+    
+    Returns:
+        str: HTML de la página
+    """
+    tabla = generar_tabla_resultados(range(filas), filas, semilla)
+    return generar_pagina_consulta('-123:456', tabla)
+
+
+def generar_pagina_detalle(id_deudor=1, total=None):
+    """
+    Genera una página de detalle de deudor
+    
+    Args:
+        id_deudor (int): ID del deudor
+        total (int): Tamaño del registro sintético (para fecha coherente)
+    
+    Returns:
+        str: HTML de la página
+    """
+    i = int(id_deudor) - 1
+    datos = datos_fila(i, total or int(id_deudor))
+    paterno, materno, nombres = datos['nombre_completo'].split(' ', 2)
+    
+    campos = [
+        ('apellidoPaterno', paterno),
+        ('apellidoMaterno', materno),
+        ('nombres', nombres),
+        ('tipoDocumento', datos['tipo_documento']),
+        ('numeroDocumento', datos['numero_documento']),
+        ('distritoJudicial', 'LIMA'),
+        ('organoJurisdiccional', '1° JUZGADO DE PAZ LETRADO'),
+        ('secretario', 'DR. MARTINEZ SILVA ROBERTO'),
+        ('numeroExpediente', f'{int(id_deudor):05d}-2024-0-1801-JP-FC-01'),
+        ('pensionMensual', 'S/ 1,500.00'),
+        ('importeAdeudado', 'S/ 4,500.00'),
+        ('interes', 'S/ 450.00'),
+        ('demandanteNombre', 'RODRIGUEZ PEREZ MARIA ELENA'),
+        ('demandanteRelacion', 'MADRE'),
+    ]
+    
+    # Relleno para que la página tenga un tamaño realista
+    relleno = ''.join(
+        f'<div class="ui-g"><span class="etiqueta">Campo {i}</span></div>'
+        for i in range(200)
+    )
+    filas = ''.join(
+        f'<tr><td>{id_campo}</td><td><span id="formDetalle:{id_campo}">{valor}</span></td></tr>'
+        for id_campo, valor in campos
+    )
+    
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<html><head><title>Detalle</title></head><body>'
+        f'<form id="formDetalle">{relleno}<table>{filas}</table></form>'
+        '</body></html>'
+    )
@@ -0,0 +1,420 @@
+"""
+Servidor local que simula los endpoints del REDAM
+
+Sirve consultaDeudor.xhtml, captcha.xhtml y detalleDeudor.xhtml con manejo
+de ViewState al estilo JSF (incluida su expiración), tablas de resultados
+sintéticas paginadas, latencia y errores inyectados. Con --grabar actúa
+como proxy hacia el servidor real y guarda cada respuesta; con --reproducir
+responde offline con lo grabado.
+
+Uso:
+    python -m benchmarks.servidor_simulado --filas 10000 --latencia 0.2 --errores 0.05
+    python -m benchmarks.servidor_simulado --grabar grabacion/ --origen https://casillas.pj.gob.pe/redam
+    python -m benchmarks.servidor_simulado --reproducir grabacion/
+    
+    api = APIRedam(base_url="http://127.0.0.1:8080/redam")
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import struct
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from benchmarks.paginas_sinteticas import (
+    FECHA_BASE, DIAS_PERIODO, TABLA_ID, generar_pagina_consulta,
+    generar_tabla_resultados, generar_respuesta_parcial, generar_pagina_detalle
+)
+
+RUTA_CONSULTA = '/redam/services/consultaDeudor.xhtml'
+RUTA_CAPTCHA = '/redam/services/captcha.xhtml'
+RUTA_DETALLE = '/redam/services/detalleDeudor.xhtml'
+
+PAGINA_VIEW_EXPIRADO = (
+    '<html><body><h1>Error</h1>'
+    '<p>javax.faces.application.ViewExpiredException: viewId:/services/consultaDeudor.xhtml '
+    '- La sesión ha expirado</p></body></html>'
+)
+
+# Campos que cambian en cada petición y no identifican la respuesta grabada
+CAMPOS_VOLATILES = ('javax.faces.ViewState', 'formConsulta:captcha')
+
+
+def generar_png_captcha():
+    """Genera un PNG gris de 120x40 como imagen de captcha"""
+    ancho, alto = 120, 40
+    filas = b''.join(b'\x00' + b'\xc0' * ancho for _ in range(alto))
+    
+    def bloque(tipo, datos):
+        return (struct.pack('>I', len(datos)) + tipo + datos +
+                struct.pack('>I', zlib.crc32(tipo + datos) & 0xffffffff))
+    
+    return (b'\x89PNG\r\n\x1a\n' +
+            bloque(b'IHDR', struct.pack('>IIBBBBB', ancho, alto, 8, 0, 0, 0, 0)) +
+            bloque(b'IDAT', zlib.compress(filas)) +
+            bloque(b'IEND', b''))
+
+
+class EstadoSimulado:
+    """
+    Estado compartido del servidor: ViewStates vigentes y última consulta
+    de cada uno (para paginar)
+    """
+    
+    def __init__(self, filas=1000, filas_por_pagina=50, latencia=0.0,
+                 errores=0.0, expira_view_state=1800, semilla=0):
+        self.filas = filas
+        self.filas_por_pagina = filas_por_pagina
+        self.latencia = latencia
+        self.errores = errores
+        self.expira_view_state = expira_view_state
+        self.semilla = semilla
+        
+        self._lock = threading.Lock()
+        self._view_states = {}  # token -> (creado, indices de la última consulta)
+        self._azar = random.Random(semilla)
+        self.peticiones = 0
+        self.errores_inyectados = 0
+        self.view_states_expirados = 0
+    
+    def nuevo_view_state(self):
+        """Crea y registra un ViewState"""
+        token = f"{uuid.uuid4().int % 10**9}:{uuid.uuid4().int % 10**9}"
+        with self._lock:
+            self._view_states[token] = (time.monotonic(), range(0))
+        return token
+    
+    def view_state_valido(self, token):
+        """Indica si el ViewState existe y no ha expirado"""
+        with self._lock:
+            entrada = self._view_states.get(token)
+            if entrada is None:
+                return False
+            if time.monotonic() - entrada[0] > self.expira_view_state:
+                del self._view_states[token]
+                self.view_states_expirados += 1
+                return False
+            return True
+    
+    def guardar_consulta(self, token, indices):
+        """Asocia el resultado de la consulta al ViewState (como JSF)"""
+        with self._lock:
+            creado, _ = self._view_states[token]
+            self._view_states[token] = (creado, indices)
+    
+    def ultima_consulta(self, token):
+        """Retorna los índices de la última consulta del ViewState"""
+        with self._lock:
+            return self._view_states.get(token, (0, range(0)))[1]
+    
+    def expirar_todos(self):
+        """Invalida todos los ViewStates (simula reinicio del servidor)"""
+        with self._lock:
+            self.view_states_expirados += len(self._view_states)
+            self._view_states.clear()
+    
+    def simular_red(self):
+        """
+        Aplica la latencia configurada y decide si inyectar un error
+        
+        Returns:
+            bool: True si la petición debe fallar
+        """
+        with self._lock:
+            self.peticiones += 1
+            demora = self.latencia * self._azar.uniform(0.5, 1.5) if self.latencia else 0
+            fallar = self._azar.random() < self.errores
+            if fallar:
+                self.errores_inyectados += 1
+        
+        if demora:
+            time.sleep(demora)
+        return fallar
+    
+    def buscar(self, formulario):
+        """
+        Resuelve una consulta contra el registro sintético
+        
+        Args:
+            formulario (dict): Campos del formulario de consulta
+        
+        Returns:
+            range or list: Índices de los deudores encontrados
+        """
+        tipo = formulario.get('formConsulta:tipoConsulta')
+        
+        if tipo == '2':
+            numero = formulario.get('formConsulta:numeroDocumento', '')
+            i = int(numero) - 10000000 if numero.isdigit() else -1
+            return [i] if 0 <= i < self.filas else []
+        
+        if tipo == '3':
+            try:
+                inicio = datetime.strptime(formulario['formConsulta:fechaInicio'], '%d/%m/%Y')
+                fin = datetime.strptime(formulario['formConsulta:fechaFin'], '%d/%m/%Y')
+            except (KeyError, ValueError):
+                return range(0)
+            
+            # Inversa de la fecha sintética: fecha(i) = base + i * periodo // filas
+            def primer_indice(fecha):
+                dias = (fecha - FECHA_BASE).days
+                return max(0, min(self.filas, -(-dias * self.filas // DIAS_PERIODO)))
+            
+            return range(primer_indice(inicio), primer_indice(fin + timedelta(days=1)))
+        
+        # Búsqueda por nombres: todo el registro sintético coincide
+        return range(self.filas)
+
+
+class GrabadorRespuestas:
+    """
+    Guarda y recupera respuestas por (método, ruta, formulario sin campos volátiles)
+    """
+    
+    def __init__(self, directorio):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+    
+    def clave(self, metodo, ruta, formulario):
+        """Calcula la clave de una petición"""
+        estable = sorted((k, v) for k, v in formulario.items() if k not in CAMPOS_VOLATILES)
+        texto = json.dumps([metodo, ruta, estable], ensure_ascii=False)
+        return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+    
+    def guardar(self, clave, estado, tipo_contenido, cuerpo):
+        """Guarda una respuesta"""
+        with open(os.path.join(self.directorio, f'{clave}.json'), 'w', encoding='utf-8') as archivo:
+            json.dump({
+                'estado': estado,
+                'tipo_contenido': tipo_contenido,
+                'cuerpo': base64.b64encode(cuerpo).decode('ascii')
+            }, archivo)
+    
+    def cargar(self, clave):
+        """
+        Carga una respuesta grabada
+        
+        Returns:
+            tuple or None: (estado, tipo_contenido, cuerpo)
+        """
+        ruta = os.path.join(self.directorio, f'{clave}.json')
+        if not os.path.exists(ruta):
+            return None
+        with open(ruta, 'r', encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        return datos['estado'], datos['tipo_contenido'], base64.b64decode(datos['cuerpo'])
+
+
+class ManejadorREDAM(BaseHTTPRequestHandler):
+    """
+    Atiende las peticiones según el modo del servidor
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # evita la demora de ACK entre header y cuerpo
+    
+    def log_message(self, formato, *args):
+        if self.server.verboso:
+            super().log_message(formato, *args)
+    
+    def do_GET(self):
+        self._atender('GET', {})
+    
+    def do_POST(self):
+        largo = int(self.headers.get('Content-Length') or 0)
+        cuerpo = self.rfile.read(largo).decode('utf-8')
+        self._atender('POST', dict(parse_qsl(cuerpo, keep_blank_values=True)))
+    
+    def _atender(self, metodo, formulario):
+        ruta = urlsplit(self.path).path
+        
+        if self.server.grabador is not None:
+            if self.server.origen:
+                self._grabar(metodo, ruta, formulario)
+            else:
+                self._reproducir(metodo, ruta, formulario)
+            return
+        
+        estado = self.server.estado
+        if estado.simular_red():
+            self._responder(503, 'text/html', b'<html><body>Servicio no disponible</body></html>')
+            return
+        
+        if ruta == RUTA_CAPTCHA:
+            self._responder(200, 'image/png', self.server.captcha)
+        elif ruta == RUTA_CONSULTA and metodo == 'GET':
+            self._html(generar_pagina_consulta(estado.nuevo_view_state()))
+        elif ruta == RUTA_CONSULTA:
+            self._consulta(formulario)
+        elif ruta == RUTA_DETALLE and metodo == 'POST':
+            self._detalle(formulario)
+        elif ruta.rstrip('/') == '/redam':
+            self._html('<html><body>REDAM</body></html>')
+        else:
+            self._responder(404, 'text/html', b'<html><body>No encontrado</body></html>')
+    
+    def _consulta(self, formulario):
+        estado = self.server.estado
+        token = formulario.get('javax.faces.ViewState', '')
+        if not estado.view_state_valido(token):
+            self._responder(500, 'text/html', PAGINA_VIEW_EXPIRADO.encode('utf-8'))
+            return
+        
+        por_pagina = estado.filas_por_pagina
+        
+        if formulario.get('javax.faces.partial.ajax') == 'true':
+            indices = estado.ultima_consulta(token)
+            primera = int(formulario.get(f'{TABLA_ID}_first', 0))
+            cantidad = int(formulario.get(f'{TABLA_ID}_rows', por_pagina))
+            pagina = indices[primera:primera + cantidad]
+            self._responder(200, 'text/xml', generar_respuesta_parcial(
+                pagina, estado.filas, token, estado.semilla).encode('utf-8'))
+            return
+        
+        indices = estado.buscar(formulario)
+        estado.guardar_consulta(token, indices)
+        tabla = ''
+        if len(indices):
+            tabla = generar_tabla_resultados(
+                indices[:por_pagina], estado.filas, estado.semilla,
+                hay_siguiente=len(indices) > por_pagina
+            )
+        self._html(generar_pagina_consulta(token, tabla))
+    
+    def _detalle(self, formulario):
+        estado = self.server.estado
+        if not estado.view_state_valido(formulario.get('javax.faces.ViewState', '')):
+            self._responder(500, 'text/html', PAGINA_VIEW_EXPIRADO.encode('utf-8'))
+            return
+        
+        id_deudor = formulario.get('formDetalle:idDeudor', '')
+        if not id_deudor.isdigit() or not 1 <= int(id_deudor) <= estado.filas:
+            self._html('<html><body>No se encontró el deudor</body></html>')
+            return
+        self._html(generar_pagina_detalle(id_deudor, estado.filas))
+    
+    def _grabar(self, metodo, ruta, formulario):
+        """Reenvía la petición al servidor real y guarda la respuesta"""
+        url = self.server.origen.rstrip('/') + ruta[len('/redam'):]
+        with self.server.lock_proxy:
+            datos = dict(formulario)
+            # El ViewState del cliente es el que entregó el servidor real
+            respuesta = self.server.sesion_proxy.request(
+                metodo, url, data=datos or None, timeout=30
+            )
+        tipo = respuesta.headers.get('Content-Type', 'text/html')
+        grabador = self.server.grabador
+        grabador.guardar(grabador.clave(metodo, ruta, formulario),
+                         respuesta.status_code, tipo, respuesta.content)
+        self._responder(respuesta.status_code, tipo, respuesta.content)
+    
+    def _reproducir(self, metodo, ruta, formulario):
+        """Responde con una respuesta grabada"""
+        grabador = self.server.grabador
+        grabada = grabador.cargar(grabador.clave(metodo, ruta, formulario))
+        if grabada is None:
+            self._responder(404, 'text/html', b'<html><body>Respuesta no grabada</body></html>')
+            return
+        self._responder(*grabada)
+    
+    def _html(self, texto):
+        self._responder(200, 'text/html; charset=UTF-8', texto.encode('utf-8'))
+    
+    def _responder(self, estado, tipo_contenido, cuerpo):
+        self.send_response(estado)
+        self.send_header('Content-Type', tipo_contenido)
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+
+class ServidorSimulado(ThreadingHTTPServer):
+    """
+    Servidor HTTP con el estado de la simulación
+    """
+    
+    daemon_threads = True
+    
+    def __init__(self, direccion, estado=None, grabador=None, origen=None, verboso=False):
+        super().__init__(direccion, ManejadorREDAM)
+        self.estado = estado or EstadoSimulado()
+        self.grabador = grabador
+        self.origen = origen
+        self.verboso = verboso
+        self.captcha = generar_png_captcha()
+        self.lock_proxy = threading.Lock()
+        self.sesion_proxy = None
+        
+        if origen:
+            import requests
+            self.sesion_proxy = requests.Session()
+    
+    @property
+    def base_url(self):
+        """URL base para APIRedam"""
+        host, puerto = self.server_address[:2]
+        return f"http://{host}:{puerto}/redam"
+    
+    def iniciar_en_hilo(self):
+        """
+        Atiende peticiones en un hilo de fondo (útil en benchmarks)
+        
+        Returns:
+            threading.Thread: Hilo del servidor
+        """
+        hilo = threading.Thread(target=self.serve_forever, daemon=True)
+        hilo.start()
+        return hilo
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor simulado del REDAM")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--puerto', type=int, default=8080)
+    parser.add_argument('--filas', type=int, default=1000, help="Tamaño del registro sintético")
+    parser.add_argument('--por-pagina', type=int, default=50, help="Filas por página")
+    parser.add_argument('--latencia', type=float, default=0.0, help="Segundos de latencia media")
+    parser.add_argument('--errores', type=float, default=0.0, help="Probabilidad de error 503")
+    parser.add_argument('--expira-view-state', type=float, default=1800,
+                        help="Segundos de vida de un ViewState")
+    parser.add_argument('--grabar', metavar='DIR', help="Actuar como proxy y grabar respuestas")
+    parser.add_argument('--origen', default='https://casillas.pj.gob.pe/redam',
+                        help="Servidor real para --grabar")
+    parser.add_argument('--reproducir', metavar='DIR', help="Responder con respuestas grabadas")
+    parser.add_argument('--verboso', action='store_true')
+    args = parser.parse_args()
+    
+    estado = EstadoSimulado(
+        filas=args.filas, filas_por_pagina=args.por_pagina, latencia=args.latencia,
+        errores=args.errores, expira_view_state=args.expira_view_state
+    )
+    grabador = None
+    origen = None
+    if args.grabar:
+        grabador = GrabadorRespuestas(args.grabar)
+        origen = args.origen
+    elif args.reproducir:
+        grabador = GrabadorRespuestas(args.reproducir)
+    
+    servidor = ServidorSimulado((args.host, args.puerto), estado, grabador, origen, args.verboso)
+    modo = 'grabación' if origen else 'reproducción' if grabador else 'sintético'
+    print(f"Servidor REDAM simulado ({modo}) en {servidor.base_url}")
+    
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nPeticiones: {estado.peticiones}  errores inyectados: {estado.errores_inyectados}")
+        servidor.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -6,28 +6,69 @@ import random
 import string
 import json
 import os
-from datetime import datetime
 from models.deudor_alimentario import DeudorAlimentario
 from models.expediente import Expediente
 from models.demandante import Demandante
+from services.coalescencia import CoalescedorSolicitudes
+from services.almacen_registro import AlmacenRegistro, RUTA_DEFECTO
+from services.busqueda_incremental import BusquedaIncremental
+from services.conversion_redam import (deudor_desde_resultado, completar_con_detalle,
+                                       tipo_en_registro)
+from services.exportacion import exportar
+from services.registro_local import RegistroLocal
+from services.sincronizacion import SincronizadorRegistro
 
 class ControladorREDAM:
     """
     Controlador principal del sistema REDAM
     """
     
-    def __init__(self, usar_api_real=False):
+    # Tipos de búsqueda (iterar_busqueda)
+    BUSQUEDA_NOMBRES = 'nombres'
+    BUSQUEDA_DNI = 'dni'
+    BUSQUEDA_FECHAS = 'fechas'
+    
+    def __init__(self, usar_api_real=False, api=None, ttl_registro=RegistroLocal.TTL_DEFECTO,
+                 ruta_registro=None, base_url=None, prefetch_detalles=0):
         """
         Constructor
         
+        Las búsquedas se responden primero desde el registro local. Con
+        usar_api_real, si el dato no está o ya venció se consulta el REDAM y
+        lo obtenido queda guardado en el registro local.
+        
         Args:
-            usar_api_real (bool): Si True, intenta usar API real (no implementado aún)
+            usar_api_real (bool): Si True, usa la API real como respaldo
+            api (APIRedam): Cliente a usar (por defecto se crea uno)
+            ttl_registro (float): Segundos de vigencia de los datos locales
+            ruta_registro (str): Archivo de la réplica local (por defecto
+                data/registro_local.db)
+            base_url (str): URL base alternativa del REDAM (por ejemplo, el
+                servidor simulado) para el cliente que se crea
+            prefetch_detalles (int): Cuántos detalles de cada búsqueda
+                precarga el cliente que se crea (0 la desactiva)
         """
-        self.usar_api = False  # Por ahora siempre False
-        self.captcha_actual = None
-        self.deudores_bd = self._cargar_datos_desde_json()
+        self.usar_api = usar_api_real
+        self.api = None
+        if usar_api_real:
+            try:
+                if api is None:
+                    from services.api_redam import APIRedam
+                    api = APIRedam(base_url=base_url, prefetch_detalles=prefetch_detalles)
+                self.api = api
+            except Exception as e:
+                print(f" No se pudo iniciar la API del REDAM, se usa solo el registro local: {e}")
+                self.usar_api = False
         
-        print(f"Controlador inicializado con {len(self.deudores_bd)} deudores")
+        self.captcha_actual = None   # código local (None si el captcha es del REDAM)
+        self.captcha_remoto = False  # True: el captcha vigente es la imagen del REDAM
+        self.registro = RegistroLocal(self._cargar_datos_desde_json(), ttl=ttl_registro)
+        self.almacen = None
+        self._cargar_replica_local(ruta_registro)
+        self.coalescedor = CoalescedorSolicitudes()
+        self.consultas_remotas = 0
+        
+        print(f"Controlador inicializado con {len(self.registro)} deudores")
     
     def _cargar_datos_desde_json(self):
         """
@@ -91,7 +132,7 @@ class ControladorREDAM:
             
             print(f"Cargados {len(deudores)} deudores desde JSON")
             return deudores
-            
+        
         except FileNotFoundError:
             print("Archivo deudores_mock.json no encontrado")
             return self._crear_datos_mock()
@@ -102,6 +143,54 @@ class ControladorREDAM:
             print(f" Error inesperado: {e}")
             return self._crear_datos_mock()
     
+    def _cargar_replica_local(self, ruta):
+        """
+        Agrega al registro los deudores de la réplica local sincronizada
+        
+        Sin la API real no hay nada que replicar: se lee la réplica si ya
+        existe, pero no se crea el archivo.
+        
+        Args:
+            ruta (str): Archivo SQLite de la réplica (None = ruta por defecto)
+        """
+        if not self.usar_api and not os.path.exists(ruta or RUTA_DEFECTO):
+            return
+        
+        try:
+            self.almacen = AlmacenRegistro(ruta)
+            self.registro.agregar_lote(self.almacen.cargar())
+            
+            SincronizadorRegistro(self.api, self.almacen).registrar_cobertura(self.registro)
+        except Exception as e:
+            print(f" No se pudo abrir la réplica local: {e}")
+            self.almacen = None
+    
+    def crear_sincronizador(self, **opciones):
+        """
+        Crea el trabajo que replica el REDAM en el almacén local
+        
+        Args:
+            **opciones: Argumentos adicionales de SincronizadorRegistro
+        
+        Returns:
+            SincronizadorRegistro: Sincronizador que mantiene al día este registro
+        """
+        if not self.usar_api or self.almacen is None:
+            raise Exception("La sincronización requiere la API real y la réplica local")
+        return SincronizadorRegistro(self.api, self.almacen, self.registro, **opciones)
+    
+    def crear_busqueda_incremental(self):
+        """
+        Crea una sesión de búsqueda por nombres mientras se escribe
+        
+        Solo consulta el registro local (sin captcha ni REDAM), por lo que
+        está pensada para instalaciones internas de confianza.
+        
+        Returns:
+            BusquedaIncremental: Sesión sobre el registro de este controlador
+        """
+        return BusquedaIncremental(self.registro)
+    
     def _crear_datos_mock(self):
         """
         Crea datos de prueba en memoria si no hay JSON
@@ -162,11 +251,28 @@ class ControladorREDAM:
     
     def generar_captcha(self):
         """
-        Genera código captcha aleatorio
+        Genera un captcha nuevo
+        
+        Con la API real se descarga la imagen del captcha de la sesión del
+        REDAM: la respuesta del usuario la valida el REDAM al buscar. Sin
+        API, o si no se pudo descargar, se genera un código local.
         
         Returns:
-            str: Código de 4 caracteres
+            str or bytes: Código local de 4 caracteres, o imagen (PNG) del
+                captcha del REDAM
         """
+        if self.usar_api:
+            try:
+                imagen = self.api.obtener_captcha_imagen()
+            except Exception as e:
+                print(f" No se pudo obtener el captcha del REDAM: {e}")
+                imagen = None
+            if imagen:
+                self.captcha_actual = None
+                self.captcha_remoto = True
+                return imagen
+        
+        self.captcha_remoto = False
         self.captcha_actual = ''.join(
             random.choices(string.ascii_uppercase + string.digits, k=4)
         )
@@ -176,18 +282,27 @@ class ControladorREDAM:
         """
         Valida el código captcha
         
+        El captcha del REDAM no puede comprobarse aquí: basta con que se
+        haya escrito algo, y la respuesta se envía con la búsqueda.
+        
         Args:
             codigo_ingresado (str): Código ingresado por el usuario
         
         Returns:
             bool: True si es correcto
         """
-        if not codigo_ingresado or not self.captcha_actual:
+        if not codigo_ingresado:
+            return False
+        
+        if self.captcha_remoto:
+            return bool(codigo_ingresado.strip())
+        
+        if not self.captcha_actual:
             return False
         
         return codigo_ingresado.strip().upper() == self.captcha_actual.upper()
     
-    def buscar_por_nombres(self, apellido_paterno, apellido_materno="", nombres=""):
+    def buscar_por_nombres(self, apellido_paterno, apellido_materno="", nombres="", captcha=""):
         """
         Busca deudores por nombres y apellidos
         
@@ -195,75 +310,303 @@ class ControladorREDAM:
             apellido_paterno (str): Apellido paterno
             apellido_materno (str): Apellido materno (opcional)
             nombres (str): Nombres
+            captcha (str): Respuesta al captcha del REDAM (si hay que consultarlo)
         
         Returns:
             list: Lista de DeudorAlimentario encontrados
         """
-        resultados = []
-        
-        for deudor in self.deudores_bd:
-            # Comparación case-insensitive
-            coincide_paterno = apellido_paterno.upper() in deudor.apellido_paterno.upper()
-            
-            coincide_materno = (
-                not apellido_materno or 
-                apellido_materno.upper() in deudor.apellido_materno.upper()
-            )
-            
-            coincide_nombres = (
-                not nombres or 
-                nombres.upper() in deudor.nombres.upper()
-            )
-            
-            if coincide_paterno and coincide_materno and coincide_nombres:
-                resultados.append(deudor)
-        
-        return resultados
+        return self._buscar_compartido(
+            self.BUSQUEDA_NOMBRES, apellido_paterno, apellido_materno, nombres, captcha=captcha
+        )
     
-    def buscar_por_dni(self, tipo_documento, numero_documento):
+    def buscar_por_dni(self, tipo_documento, numero_documento, captcha=""):
         """
         Busca deudores por documento de identidad
         
         Args:
             tipo_documento (str): Tipo de documento
             numero_documento (str): Número de documento
+            captcha (str): Respuesta al captcha del REDAM (si hay que consultarlo)
         
         Returns:
             list: Lista de DeudorAlimentario encontrados
         """
-        for deudor in self.deudores_bd:
-            if (deudor.tipo_documento == tipo_documento and 
-                deudor.numero_documento == numero_documento):
-                return [deudor]
-        
-        return []
+        return self._buscar_compartido(self.BUSQUEDA_DNI, tipo_documento, numero_documento,
+                                       captcha=captcha)
     
-    def buscar_por_fechas(self, fecha_inicio, fecha_fin):
+    def buscar_por_fechas(self, fecha_inicio, fecha_fin, captcha=""):
         """
         Busca deudores por rango de fechas de registro
         
         Args:
             fecha_inicio (datetime): Fecha inicial
             fecha_fin (datetime): Fecha final
+            captcha (str): Respuesta al captcha del REDAM (si hay que consultarlo)
         
         Returns:
             list: Lista de DeudorAlimentario encontrados
         """
-        resultados = []
+        return self._buscar_compartido(self.BUSQUEDA_FECHAS, fecha_inicio, fecha_fin,
+                                       captcha=captcha)
+    
+    def iterar_busqueda(self, tipo, *criterios, captcha=""):
+        """
+        Entrega los resultados a medida que se obtienen
         
-        for deudor in self.deudores_bd:
-            try:
-                # Convertir fecha de registro a datetime
-                fecha_registro = datetime.strptime(deudor.fecha_registro, '%d/%m/%Y')
-                
-                # Verificar si está en el rango
-                if fecha_inicio <= fecha_registro <= fecha_fin:
-                    resultados.append(deudor)
-            except ValueError:
-                # Si la fecha no se puede parsear, ignorar
-                continue
-        
-        return resultados
+        Los resultados locales se entregan de inmediato; los remotos, fila
+        a fila según llegan las páginas del REDAM. Sirve para que la vista
+        muestre la primera pantalla sin esperar la lista completa.
+        
+        Args:
+            tipo (str): BUSQUEDA_NOMBRES, BUSQUEDA_DNI o BUSQUEDA_FECHAS
+            *criterios: Los mismos argumentos que buscar_por_<tipo>
+            captcha (str): Respuesta al captcha del REDAM (si hay que consultarlo)
+        
+        Yields:
+            DeudorAlimentario: Deudores encontrados
+        """
+        clave = self._clave_busqueda(tipo, criterios)
+        locales, buscar = self._resolver(clave)
+        
+        if buscar is None:
+            yield from locales
+            return
+        
+        entregados = 0
+        try:
+            for deudor in self._iterar_remoto_compartido(clave, buscar, captcha):
+                entregados += 1
+                yield deudor
+        except Exception as e:
+            if entregados or not locales:
+                raise
+            print(f" Error al consultar el REDAM, se usa el registro local: {e}")
+            yield from locales
+    
+    def _clave_busqueda(self, tipo, criterios):
+        """
+        Normaliza los criterios de una búsqueda
+        
+        Args:
+            tipo (str): BUSQUEDA_NOMBRES, BUSQUEDA_DNI o BUSQUEDA_FECHAS
+            criterios (tuple): Argumentos de buscar_por_<tipo>
+        
+        Returns:
+            tuple: (tipo, *criterios normalizados), usada para coalescer y
+                para recordar consultas remotas
+        """
+        if tipo == self.BUSQUEDA_NOMBRES:
+            paterno, materno, nombres = (tuple(criterios) + ("", ""))[:3]
+            return (tipo, paterno.strip().upper(), materno.strip().upper(), nombres.strip().upper())
+        if tipo == self.BUSQUEDA_DNI:
+            tipo_documento, numero_documento = criterios
+            return (tipo, tipo_en_registro(tipo_documento), numero_documento.strip())
+        if tipo == self.BUSQUEDA_FECHAS:
+            fecha_inicio, fecha_fin = criterios
+            return (tipo, fecha_inicio, fecha_fin)
+        raise ValueError(f"Tipo de búsqueda no soportado: {tipo}")
+    
+    def _buscar_compartido(self, tipo, *criterios, captcha=""):
+        """Ejecuta la búsqueda; las idénticas en curso comparten la consulta al REDAM"""
+        clave = self._clave_busqueda(tipo, criterios)
+        return list(self._buscar(clave, captcha))
+    
+    def _buscar(self, clave, captcha=""):
+        """Responde desde el registro local o, si no alcanza, desde el REDAM"""
+        locales, buscar = self._resolver(clave)
+        if buscar is None:
+            return locales
+        return self._consultar_remoto(clave, locales, buscar, captcha)
+    
+    def _resolver(self, clave):
+        """
+        Busca en el registro local y decide si hace falta el REDAM
+        
+        Args:
+            clave (tuple): Resultado de _clave_busqueda
+        
+        Returns:
+            tuple: (resultados locales, método de APIRedam a consultar o
+                None si los locales son la respuesta)
+        """
+        tipo, criterios = clave[0], clave[1:]
+        
+        # La misma consulta ya respondida por el REDAM se repite tal cual:
+        # los índices locales no siempre reencuentran esas filas
+        previos = self.registro.resultados_consulta(clave)
+        if previos is not None:
+            return previos, None
+        
+        if tipo == self.BUSQUEDA_NOMBRES:
+            locales = self.registro.buscar_por_nombres(*criterios)
+            if self._respuesta_local_suficiente(locales):
+                return locales, None
+            return locales, self.api.buscar_por_nombres
+        
+        if tipo == self.BUSQUEDA_DNI:
+            deudor = self.registro.buscar_por_documento(*criterios)
+            locales = [deudor] if deudor is not None else []
+            if self._respuesta_local_suficiente(locales):
+                return locales, None
+            return locales, self.api.buscar_por_dni
+        
+        # Un rango con algunos resultados locales puede estar incompleto,
+        # salvo que esté dentro de lo replicado por la sincronización
+        locales = self.registro.buscar_por_fechas(*criterios)
+        if not self.usar_api or self.registro.fechas_cubiertas(*criterios):
+            return locales, None
+        return locales, self.api.buscar_por_fechas_particionado
+    
+    def _respuesta_local_suficiente(self, locales):
+        """
+        Indica si la búsqueda puede responderse sin consultar el REDAM
+        
+        Args:
+            locales (list): Resultados del registro local
+        
+        Returns:
+            bool: True si no hay API, o si hubo resultados y todos están
+                vigentes
+        """
+        if not self.usar_api:
+            return True
+        return bool(locales) and all(self.registro.vigente(d) for d in locales)
+    
+    def _consultar_remoto(self, clave, locales, buscar, captcha=""):
+        """
+        Consulta el REDAM y guarda lo obtenido en el registro local
+        
+        Si el REDAM falla y hay resultados locales (aunque vencidos), se
+        retornan esos en lugar del error.
+        
+        Args:
+            clave (tuple): Criterios normalizados de la consulta
+            locales (list): Resultados del registro local
+            buscar (callable): Método de búsqueda de APIRedam
+            captcha (str): Respuesta al captcha del REDAM
+        
+        Returns:
+            list: Lista de DeudorAlimentario
+        """
+        try:
+            return list(self._iterar_remoto_compartido(clave, buscar, captcha))
+        except Exception as e:
+            if locales:
+                print(f" Error al consultar el REDAM, se usa el registro local: {e}")
+                return locales
+            raise
+    
+    def _iterar_remoto_compartido(self, clave, buscar, captcha=""):
+        """
+        Igual que _iterar_remoto, pero las consultas idénticas en curso (de
+        buscar_por_* o de iterar_busqueda) recorren una sola consulta al REDAM
+        """
+        return self.coalescedor.iterar(clave, self._iterar_remoto, clave, buscar, captcha)
+    
+    def _iterar_remoto(self, clave, buscar, captcha=""):
+        """
+        Recorre los resultados del REDAM guardándolos en el registro local
+        
+        La consulta queda registrada como vigente solo si se recorrió
+        completa.
+        
+        Args:
+            clave (tuple): Criterios normalizados de la consulta
+            buscar (callable): Método de búsqueda de APIRedam
+            captcha (str): Respuesta al captcha del REDAM
+        
+        Yields:
+            DeudorAlimentario: Deudores obtenidos
+        """
+        self.consultas_remotas += 1
+        deudores = []
+        
+        for fila in buscar(*clave[1:], captcha or ''):
+            deudor = self.registro.agregar(deudor_desde_resultado(fila))
+            deudores.append(deudor)
+            yield deudor
+        
+        self.registro.registrar_consulta(clave, deudores)
+        self._guardar_en_replica(deudores)
+    
+    def _guardar_en_replica(self, deudores):
+        """Persiste en la réplica local los deudores obtenidos del REDAM"""
+        if self.almacen is None or not deudores:
+            return
+        try:
+            self.almacen.guardar_lote(deudores)
+        except Exception as e:
+            print(f" No se pudo guardar en la réplica local: {e}")
+    
+    def requiere_detalle(self, deudor):
+        """
+        Indica si completar_detalle consultará el REDAM para este deudor
+        
+        Args:
+            deudor (DeudorAlimentario): Deudor obtenido de una búsqueda
+        
+        Returns:
+            bool: True si falta el expediente y se puede descargar
+        """
+        return bool(self.usar_api and not deudor.expedientes and deudor.id_remoto)
+    
+    def completar_detalle(self, deudor):
+        """
+        Descarga del REDAM el expediente de un deudor que aún no lo tiene
+        
+        Args:
+            deudor (DeudorAlimentario): Deudor obtenido de una búsqueda
+        
+        Returns:
+            DeudorAlimentario: El mismo deudor, con expedientes si se pudo
+        """
+        if not self.requiere_detalle(deudor):
+            return deudor
+        
+        detalle = self.api.obtener_detalle_deudor(deudor.id_remoto)
+        if not detalle:
+            return deudor
+        
+        completar_con_detalle(deudor, detalle)
+        self.registro.agregar(deudor)
+        self._guardar_en_replica([deudor])
+        return deudor
+    
+    def exportar_busqueda(self, ruta, tipo, *criterios, formato=None, con_detalle=False,
+                          captcha="", progreso=None):
+        """
+        Exporta el resultado de una búsqueda a medida que se obtiene
+        
+        Los deudores pasan de iterar_busqueda al archivo sin acumularse
+        en una lista.
+        
+        Args:
+            ruta (str): Archivo de destino (.csv, .jsonl, .parquet, .arrow)
+            tipo (str): BUSQUEDA_NOMBRES, BUSQUEDA_DNI o BUSQUEDA_FECHAS
+            *criterios: Los mismos argumentos que buscar_por_<tipo>
+            formato (str): Formato (por defecto se deduce de la extensión)
+            con_detalle (bool): Descargar del REDAM el expediente de los
+                deudores que no lo tienen (una consulta por deudor)
+            captcha (str): Respuesta al captcha del REDAM (si hay que consultarlo)
+            progreso (callable): Recibe los deudores exportados hasta ahora
+                (opcional, ver exportacion.exportar)
+        
+        Returns:
+            int: Cantidad de deudores exportados
+        """
+        deudores = self.iterar_busqueda(tipo, *criterios, captcha=captcha)
+        if con_detalle:
+            deudores = (self.completar_detalle(deudor) for deudor in deudores)
+        return exportar(deudores, ruta, formato, progreso=progreso)
+    
+    def obtener_estadisticas_coalescencia(self):
+        """
+        Retorna cuántas búsquedas se compartieron con otra idéntica en curso
+        
+        Returns:
+            dict: Ejecuciones reales, llamadas ahorradas y en curso
+        """
+        return self.coalescedor.obtener_estadisticas()
     
     def obtener_expediente_completo(self, deudor, index_expediente=0):
         """
@@ -5,6 +5,20 @@ Sistema de consulta de deudores alimentarios morosos
 import sys
 from PyQt5.QtWidgets import QApplication
 from views.ventana_principal import VentanaPrincipal
+from views import monitor_latencia
+
+# --monitor-latencia[=archivo.json] mide los bloqueos de la interfaz y, al
+# salir, guarda las estadísticas en el archivo
+OPCION_MONITOR = '--monitor-latencia'
+SALIDA_MONITOR = 'latencia_ui.json'
+
+# --api-real[=url] consulta el REDAM (o el servidor de url) cuando el
+# registro local no alcanza, con el captcha del REDAM en las pestañas
+OPCION_API = '--api-real'
+
+# --precargar-detalles[=N] descarga en segundo plano el detalle de los
+# primeros N deudores de cada búsqueda en el REDAM (requiere --api-real)
+OPCION_PRECARGA = '--precargar-detalles'
 
 def main():
     """
@@ -15,13 +29,31 @@ def main():
         app = QApplication(sys.argv)
         app.setStyle('Fusion')  # Estilo moderno multiplataforma
         
-        # Crear ventana principal (sin parámetro por ahora)
-        ventana = VentanaPrincipal()
+        usar_api_real = False
+        base_url = None
+        prefetch_detalles = 0
+        for argumento in sys.argv[1:]:
+            if argumento == OPCION_MONITOR or argumento.startswith(OPCION_MONITOR + '='):
+                ruta = argumento.partition('=')[2] or SALIDA_MONITOR
+                monitor_latencia.activar(ruta_salida=ruta)
+                app.aboutToQuit.connect(monitor_latencia.desactivar)
+            elif argumento == OPCION_API or argumento.startswith(OPCION_API + '='):
+                usar_api_real = True
+                base_url = argumento.partition('=')[2] or None
+            elif argumento == OPCION_PRECARGA or argumento.startswith(OPCION_PRECARGA + '='):
+                from services.api_redam import APIRedam
+                prefetch_detalles = int(argumento.partition('=')[2] or APIRedam.PREFETCH_MAX_IDS)
+        
+        # Crear ventana principal; --busqueda-en-vivo activa la búsqueda
+        # por nombres mientras se escribe (instalaciones internas)
+        ventana = VentanaPrincipal(busqueda_en_vivo='--busqueda-en-vivo' in sys.argv,
+                                   usar_api_real=usar_api_real, base_url=base_url,
+                                   prefetch_detalles=prefetch_detalles)
         ventana.show()
         
         # Iniciar loop de eventos
         sys.exit(app.exec_())
-        
+    
     except Exception as e:
         print(f"Error al iniciar la aplicación: {e}")
         import traceback
@@ -16,7 +16,7 @@ class Consulta:
         Constructor de Consulta
         
         Args:
-            tipo_consulta (str): Tipo de búsqueda ('NOMBRES', 'DNI', 'FECHAS')
+            tipo_consulta (str): Tipo de búsqueda ('NOMBRES', 'DNI', 'FECHAS', 'COMPUESTA')
         """
         self.tipo_consulta = tipo_consulta
         self.apellido_paterno = ""
@@ -26,6 +26,7 @@ class Consulta:
         self.numero_documento = ""
         self.fecha_inicial = None
         self.fecha_final = None
+        self.distrito_judicial = ""
         self.codigo_validacion = None
         self.fecha_consulta = datetime.now()
     
@@ -78,7 +79,18 @@ class Consulta:
         if not tipo_documento or not numero_documento:
             raise ValueError("Tipo y número de documento son obligatorios")
         
-        # Validar según tipo de documento
+        self._validar_documento(tipo_documento, numero_documento)
+        
+        # Asignar valores
+        self.tipo_documento = tipo_documento
+        self.numero_documento = numero_documento.strip().upper()
+        self.tipo_consulta = "DNI"
+        
+        return True
+    
+    @staticmethod
+    def _validar_documento(tipo_documento, numero_documento):
+        """Valida el número según el tipo de documento (ValueError si no es válido)"""
         if tipo_documento == "DNI":
             if not Validaciones.validar_dni(numero_documento):
                 raise ValueError("DNI debe tener 8 dígitos")
@@ -90,13 +102,6 @@ class Consulta:
                 raise ValueError("Pasaporte debe tener entre 6 y 12 caracteres alfanuméricos")
         else:
             raise ValueError("Tipo de documento no válido")
-        
-        # Asignar valores
-        self.tipo_documento = tipo_documento
-        self.numero_documento = numero_documento.strip().upper()
-        self.tipo_consulta = "DNI"
-        
-        return True
     
     def consultar_por_fechas(self, fecha_inicial, fecha_final):
         """
@@ -113,6 +118,18 @@ class Consulta:
         if not fecha_inicial or not fecha_final:
             raise ValueError("Ambas fechas son obligatorias")
         
+        self._validar_rango_fechas(fecha_inicial, fecha_final)
+        
+        # Asignar valores
+        self.fecha_inicial = fecha_inicial
+        self.fecha_final = fecha_final
+        self.tipo_consulta = "FECHAS"
+        
+        return True
+    
+    @staticmethod
+    def _validar_rango_fechas(fecha_inicial, fecha_final):
+        """Valida orden, fechas futuras y rango máximo (ValueError si no es válido)"""
         # Validar que fecha inicial sea menor que fecha final
         if fecha_inicial > fecha_final:
             raise ValueError("La fecha inicial debe ser menor que la fecha final")
@@ -125,20 +142,72 @@ class Consulta:
         diferencia_dias = (fecha_final - fecha_inicial).days
         if diferencia_dias > 365:
             raise ValueError("El rango de fechas no puede superar 1 año")
+    
+    def consultar_compuesta(self, apellido_paterno="", apellido_materno="", nombres="",
+                            tipo_documento="", numero_documento="",
+                            fecha_inicial=None, fecha_final=None, distrito_judicial=""):
+        """
+        Configura una consulta que combina varios criterios
+        
+        Todos los criterios son opcionales, pero debe haber al menos uno;
+        cada uno se valida con las mismas reglas que en su consulta simple.
+        Se resuelve en el registro local con PlanificadorConsulta.
+        
+        Args:
+            apellido_paterno (str): Texto contenido en el apellido paterno
+            apellido_materno (str): Texto contenido en el apellido materno
+            nombres (str): Texto contenido en los nombres
+            tipo_documento (str): Tipo de documento (DNI, CE, PASAPORTE)
+            numero_documento (str): Número del documento
+            fecha_inicial (datetime): Inicio del rango de fechas de registro
+            fecha_final (datetime): Fin del rango de fechas de registro
+            distrito_judicial (str): Distrito judicial de algún expediente
+        
+        Returns:
+            bool: True si los datos son válidos
+        """
+        if not (apellido_paterno or apellido_materno or nombres or numero_documento
+                or fecha_inicial or fecha_final or distrito_judicial):
+            raise ValueError("Debe indicar al menos un criterio de búsqueda")
+        
+        for campo, texto in (("Apellido paterno", apellido_paterno),
+                             ("Apellido materno", apellido_materno),
+                             ("Nombres", nombres)):
+            if texto and not Validaciones.validar_nombres(texto):
+                raise ValueError(f"{campo} contiene caracteres inválidos")
+        
+        if numero_documento:
+            self._validar_documento(tipo_documento, numero_documento)
+        
+        if fecha_inicial or fecha_final:
+            if not fecha_inicial or not fecha_final:
+                raise ValueError("Ambas fechas son obligatorias")
+            self._validar_rango_fechas(fecha_inicial, fecha_final)
         
         # Asignar valores
+        self.apellido_paterno = apellido_paterno.strip().upper()
+        self.apellido_materno = apellido_materno.strip().upper()
+        self.nombres = nombres.strip().upper()
+        self.tipo_documento = tipo_documento if numero_documento else ""
+        self.numero_documento = numero_documento.strip().upper()
         self.fecha_inicial = fecha_inicial
         self.fecha_final = fecha_final
-        self.tipo_consulta = "FECHAS"
+        self.distrito_judicial = distrito_judicial.strip().upper()
+        self.tipo_consulta = "COMPUESTA"
         
         return True
     
-    def ejecutar_consulta(self):
+    def ejecutar_consulta(self, planificador=None):
         """
         Prepara la consulta para ser ejecutada
         
+        Args:
+            planificador (PlanificadorConsulta): Si se indica y la consulta es
+                COMPUESTA, se agrega el plan elegido (criterios['plan'])
+        
         Returns:
-            dict: Diccionario con los criterios de búsqueda
+            dict: Diccionario con los criterios de búsqueda (en una consulta
+                COMPUESTA, solo los criterios indicados)
         """
         criterios = {
             'tipo': self.tipo_consulta,
@@ -158,6 +227,22 @@ class Consulta:
             criterios['fecha_inicial'] = self.fecha_inicial
             criterios['fecha_final'] = self.fecha_final
         
+        elif self.tipo_consulta == "COMPUESTA":
+            campos = {
+                'apellido_paterno': self.apellido_paterno,
+                'apellido_materno': self.apellido_materno,
+                'nombres': self.nombres,
+                'tipo_documento': self.tipo_documento,
+                'numero_documento': self.numero_documento,
+                'fecha_inicial': self.fecha_inicial,
+                'fecha_final': self.fecha_final,
+                'distrito_judicial': self.distrito_judicial,
+            }
+            criterios.update((campo, valor) for campo, valor in campos.items() if valor)
+            
+            if planificador is not None:
+                criterios['plan'] = planificador.planificar(criterios)
+        
         return criterios
     
     def __str__(self):
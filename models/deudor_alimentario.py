@@ -9,6 +9,7 @@ class DeudorAlimentario:
         self.fecha_registro = fecha_registro
         self.foto = None
         self.expedientes = []
+        self.id_remoto = None  # id del deudor en el REDAM, si vino de la API
     
     def obtener_nombre_completo(self):
         return f"{self.apellido_paterno} {self.apellido_materno} {self.nombres}"
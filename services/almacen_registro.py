@@ -0,0 +1,149 @@
+"""
+Almacén persistente del registro local
+Responsabilidad: Guardar en disco la réplica de deudores y los puntos de
+control de la sincronización
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from services.conversion_redam import deudor_a_dict, deudor_desde_dict
+
+RUTA_DEFECTO = os.path.join(os.path.dirname(__file__), '..', 'data', 'registro_local.db')
+
+
+class AlmacenRegistro:
+    """
+    Réplica local (SQLite) de deudores, con upsert por documento
+    
+    Los deudores de un lote y su punto de control se escriben en la misma
+    transacción: si el proceso se interrumpe, el punto de control nunca
+    apunta más allá de lo que quedó guardado.
+    """
+    
+    def __init__(self, ruta=None):
+        """
+        Constructor
+        
+        Args:
+            ruta (str): Ruta del archivo SQLite (por defecto data/registro_local.db)
+        """
+        if ruta is None:
+            ruta = RUTA_DEFECTO
+        
+        self.ruta = ruta
+        
+        # La conexión se comparte entre hilos, protegida por el lock
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS deudor (
+                tipo_documento TEXT NOT NULL,
+                numero_documento TEXT NOT NULL,
+                datos TEXT NOT NULL,
+                actualizado REAL NOT NULL,
+                PRIMARY KEY (tipo_documento, numero_documento)
+            )
+        """)
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS punto_control (
+                clave TEXT PRIMARY KEY,
+                valor TEXT NOT NULL
+            )
+        """)
+        self._conexion.commit()
+    
+    def guardar(self, deudor, actualizado=None):
+        """
+        Inserta o actualiza un deudor
+        
+        Args:
+            deudor (DeudorAlimentario): Deudor a guardar
+            actualizado (float): time.time() de los datos (por defecto ahora)
+        """
+        self.guardar_lote([deudor], actualizado=actualizado)
+    
+    def guardar_lote(self, deudores, puntos_control=None, actualizado=None):
+        """
+        Inserta o actualiza varios deudores en una sola transacción
+        
+        Args:
+            deudores (iterable): DeudorAlimentario a guardar
+            puntos_control (dict): Claves de punto de control a fijar junto
+                con los deudores (opcional)
+            actualizado (float): time.time() de los datos (por defecto ahora)
+        """
+        if actualizado is None:
+            actualizado = time.time()
+        
+        filas = [
+            (d.tipo_documento, d.numero_documento,
+             json.dumps(deudor_a_dict(d), ensure_ascii=False), actualizado)
+            for d in deudores
+        ]
+        
+        with self._lock:
+            with self._conexion:
+                self._conexion.executemany(
+                    "INSERT OR REPLACE INTO deudor "
+                    "(tipo_documento, numero_documento, datos, actualizado) VALUES (?, ?, ?, ?)",
+                    filas
+                )
+                if puntos_control:
+                    self._conexion.executemany(
+                        "INSERT OR REPLACE INTO punto_control (clave, valor) VALUES (?, ?)",
+                        [(clave, str(valor)) for clave, valor in puntos_control.items()]
+                    )
+    
+    def cargar(self):
+        """
+        Lee todos los deudores guardados
+        
+        Returns:
+            list: Tuplas (DeudorAlimentario, actualizado)
+        """
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT datos, actualizado FROM deudor"
+            ).fetchall()
+        
+        return [(deudor_desde_dict(json.loads(datos)), actualizado) for datos, actualizado in filas]
+    
+    def obtener_punto_control(self, clave, defecto=None):
+        """
+        Lee un punto de control
+        
+        Args:
+            clave (str): Nombre del punto de control
+            defecto (str): Valor si no existe
+        
+        Returns:
+            str: Valor guardado o defecto
+        """
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT valor FROM punto_control WHERE clave = ?", (clave,)
+            ).fetchone()
+        return fila[0] if fila is not None else defecto
+    
+    def guardar_punto_control(self, clave, valor):
+        """
+        Fija un punto de control
+        
+        Args:
+            clave (str): Nombre del punto de control
+            valor (object): Valor (se guarda como texto)
+        """
+        self.guardar_lote([], puntos_control={clave: valor})
+    
+    def __len__(self):
+        with self._lock:
+            return self._conexion.execute("SELECT COUNT(*) FROM deudor").fetchone()[0]
+    
+    def cerrar(self):
+        """Cierra la conexión a la base de datos"""
+        with self._lock:
+            self._conexion.close()
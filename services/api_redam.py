@@ -5,8 +5,17 @@ Responsabilidad: Realizar peticiones HTTP y parsear respuestas
 
 import requests
 from bs4 import BeautifulSoup
-import re
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
+from services.cache_detalle import CacheDetalle
+from services.circuito import CircuitoRemoto, CircuitoAbierto
+from services.coalescencia import CoalescedorSolicitudes, ResultadosCompartidos
+from services.particion_fechas import buscar_fechas_particionado, PARTICION_MENSUAL
+from services.parser_html import crear_parser, detectar_paginacion, convertir_respuesta_parcial
+from services.planificador import PlanificadorSolicitudes, PRIORIDAD_INTERACTIVA, PRIORIDAD_LOTE
+from services.prefetch_detalle import PrefetchDetalle
 
 class APIRedam:
     """
@@ -15,9 +24,49 @@ class APIRedam:
     
     BASE_URL = "https://casillas.pj.gob.pe/redam"
     TIMEOUT = 30  # segundos
+    MAX_PAGINAS = 2000  # tope de páginas por búsqueda (por si el paginador no termina)
     
-    def __init__(self):
-        """Inicializa sesión HTTP"""
+    # Textos con los que JSF indica que el ViewState ya no es válido
+    MARCADORES_VIEW_EXPIRADO = (
+        'ViewExpiredException',
+        'viewExpired',
+        'La sesión ha expirado',
+        'Su sesión ha expirado',
+    )
+    
+    # Precarga de detalles tras cada búsqueda (desactivada por defecto:
+    # son PREFETCH_MAX_IDS consultas de detalle más por búsqueda)
+    PREFETCH_MAX_IDS = 10
+    PREFETCH_CONCURRENCIA = 3
+    
+    # Campos del formulario que no forman parte de los criterios de búsqueda
+    CAMPOS_NO_CRITERIO = ('formConsulta:captcha', 'javax.faces.ViewState')
+    
+    def __init__(self, parser_html=None, usar_cache=True, ruta_cache=None,
+                 prefetch_detalles=0, planificador=None,
+                 prioridad=PRIORIDAD_INTERACTIVA, base_url=None, circuito=None):
+        """
+        Inicializa sesión HTTP
+        
+        Args:
+            parser_html (str): Backend de parseo ('lxml' o 'html.parser').
+                Por defecto se usa el más rápido disponible.
+            usar_cache (bool): Si True, guarda en disco los detalles obtenidos
+            ruta_cache (str): Ruta del archivo de caché (opcional)
+            prefetch_detalles (int): Cuántos detalles precargar tras cada
+                búsqueda (0, por defecto, desactiva la precarga;
+                PREFETCH_MAX_IDS es un valor razonable para activarla)
+            planificador (PlanificadorSolicitudes): Planificador de salida
+                (por defecto el compartido por todo el proceso)
+            prioridad (int): Prioridad por defecto de las solicitudes
+            base_url (str): URL base alternativa (por ejemplo, un servidor
+                simulado local); por defecto BASE_URL
+            circuito (CircuitoRemoto): Circuit breaker a usar (por defecto
+                uno propio con sonda de salud en segundo plano)
+        """
+        if base_url:
+            self.BASE_URL = base_url.rstrip('/')
+        
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -28,6 +77,25 @@ class APIRedam:
         })
         self.view_state = None
         self.session_id = None
+        self.view_state_obtenido = None  # time.monotonic() del último ViewState
+        self.refrescos_sesion = 0
+        self.parser = crear_parser(parser_html)
+        self.cache_detalle = CacheDetalle(ruta_cache) if usar_cache else None
+        self.prefetch = None
+        if prefetch_detalles > 0:
+            self.prefetch = PrefetchDetalle(
+                self._precargar_detalle,
+                max_ids=prefetch_detalles,
+                max_concurrencia=self.PREFETCH_CONCURRENCIA
+            )
+        self._lock_sesion = threading.Lock()
+        self.planificador = planificador or PlanificadorSolicitudes.compartido()
+        self.prioridad = prioridad
+        self._contexto = threading.local()
+        self._hilo = threading.get_ident()  # el que usa self.session
+        self._principal = None  # cliente que creó a este (clientes auxiliares)
+        self.coalescedor = CoalescedorSolicitudes()
+        self.circuito = circuito or CircuitoRemoto(sonda=self._sondear)
     
     def inicializar_sesion(self):
         """
@@ -38,7 +106,7 @@ class APIRedam:
         """
         try:
             url = f"{self.BASE_URL}/services/consultaDeudor.xhtml"
-            response = self.session.get(url, timeout=self.TIMEOUT)
+            response = self._solicitar('GET', url)
             
             if response.status_code == 200:
                 # Extraer ViewState (token de JSF)
@@ -47,10 +115,11 @@ class APIRedam:
                 
                 if view_state_input:
                     self.view_state = view_state_input.get('value')
+                    self.view_state_obtenido = time.monotonic()
                     return True
             
             return False
-            
+        
         except requests.exceptions.RequestException as e:
             print(f"Error al inicializar sesión: {e}")
             return False
@@ -59,19 +128,24 @@ class APIRedam:
         """
         Obtiene la imagen del captcha
         
+        El captcha queda ligado a la sesión: primero se abre el formulario
+        (como hace el navegador) y la respuesta se envía luego con la
+        búsqueda desde esta misma sesión.
+        
         Returns:
             bytes: Imagen del captcha en formato bytes
         """
         try:
+            self._asegurar_sesion()
             url = f"{self.BASE_URL}/services/captcha.xhtml"
-            response = self.session.get(url, timeout=self.TIMEOUT)
+            response = self._solicitar('GET', url)
             
             if response.status_code == 200:
                 return response.content
             
             return None
-            
-        except requests.exceptions.RequestException as e:
+        
+        except Exception as e:
             print(f" Error al obtener captcha: {e}")
             return None
     
@@ -86,42 +160,20 @@ class APIRedam:
             captcha (str): Código captcha
         
         Returns:
-            list: Lista de diccionarios con datos de deudores
+            generator: Diccionarios con datos de deudores (ver _buscar)
         """
-        if not self.view_state:
-            if not self.inicializar_sesion():
-                raise Exception("No se pudo inicializar la sesión")
+        # Datos del formulario
+        data = {
+            'formConsulta': 'formConsulta',
+            'formConsulta:tipoConsulta': '1',  # 1 = Búsqueda por nombres
+            'formConsulta:apellidoPaterno': apellido_paterno.upper(),
+            'formConsulta:apellidoMaterno': apellido_materno.upper(),
+            'formConsulta:nombres': nombres.upper(),
+            'formConsulta:captcha': captcha.upper(),
+            'formConsulta:btnConsultar': 'Consultar'
+        }
         
-        try:
-            url = f"{self.BASE_URL}/services/consultaDeudor.xhtml"
-            
-            # Datos del formulario
-            data = {
-                'formConsulta': 'formConsulta',
-                'formConsulta:tipoConsulta': '1',  # 1 = Búsqueda por nombres
-                'formConsulta:apellidoPaterno': apellido_paterno.upper(),
-                'formConsulta:apellidoMaterno': apellido_materno.upper(),
-                'formConsulta:nombres': nombres.upper(),
-                'formConsulta:captcha': captcha.upper(),
-                'formConsulta:btnConsultar': 'Consultar',
-                'javax.faces.ViewState': self.view_state
-            }
-            
-            # Realizar petición POST
-            response = self.session.post(
-                url, 
-                data=data, 
-                timeout=self.TIMEOUT,
-                allow_redirects=True
-            )
-            
-            if response.status_code == 200:
-                return self._parsear_resultados(response.text)
-            else:
-                raise Exception(f"Error HTTP: {response.status_code}")
-                
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Error en la petición: {str(e)}")
+        return self._buscar(data)
     
     def buscar_por_dni(self, tipo_documento, numero_documento, captcha):
         """
@@ -133,88 +185,293 @@ class APIRedam:
             captcha (str): Código captcha
         
         Returns:
-            list: Lista de diccionarios con datos de deudores
+            generator: Diccionarios con datos de deudores (ver _buscar)
+        """
+        # Mapear tipo de documento
+        tipo_map = {
+            'DNI': '1',
+            'CARNET DE EXTRANJERÍA': '2',
+            'PASAPORTE': '3'
+        }
+        
+        data = {
+            'formConsulta': 'formConsulta',
+            'formConsulta:tipoConsulta': '2',  # 2 = Búsqueda por DNI
+            'formConsulta:tipoDocumento': tipo_map.get(tipo_documento, '1'),
+            'formConsulta:numeroDocumento': numero_documento,
+            'formConsulta:captcha': captcha.upper(),
+            'formConsulta:btnConsultar': 'Consultar'
+        }
+        
+        return self._buscar(data)
+    
+    def buscar_por_fechas(self, fecha_inicio, fecha_fin, captcha):
+        """
+        Busca deudores por rango de fechas
+        
+        Args:
+            fecha_inicio (datetime): Fecha inicial
+            fecha_fin (datetime): Fecha final
+            captcha (str): Código captcha
+        
+        Returns:
+            generator: Diccionarios con datos de deudores (ver _buscar)
+        """
+        data = {
+            'formConsulta': 'formConsulta',
+            'formConsulta:tipoConsulta': '3',  # 3 = Búsqueda por fechas
+            'formConsulta:fechaInicio': fecha_inicio.strftime('%d/%m/%Y'),
+            'formConsulta:fechaFin': fecha_fin.strftime('%d/%m/%Y'),
+            'formConsulta:captcha': captcha.upper(),
+            'formConsulta:btnConsultar': 'Consultar'
+        }
+        
+        return self._buscar(data)
+    
+    def buscar_por_fechas_particionado(self, fecha_inicio, fecha_fin, captcha,
+                                       particion=PARTICION_MENSUAL, max_concurrencia=4):
+        """
+        Busca por fechas dividiendo el rango en sub-ventanas concurrentes
+        
+        Útil para rangos amplios, que el servidor atiende lento o trunca.
+        Los resultados se entregan a medida que termina cada ventana, sin
+        repetir deudores. Las ventanas se consultan dentro de la sesión de
+        este cliente, que es la que resolvió el captcha.
+        
+        Args:
+            fecha_inicio (datetime): Fecha inicial
+            fecha_fin (datetime): Fecha final
+            captcha (str): Respuesta al captcha de la sesión de este cliente
+            particion (str): 'semanal' o 'mensual'
+            max_concurrencia (int): Ventanas consultadas a la vez
+        
+        Returns:
+            generator: Diccionarios con datos de deudores
+        """
+        self._asegurar_sesion()
+        return buscar_fechas_particionado(
+            self._crear_cliente_auxiliar, fecha_inicio, fecha_fin, captcha,
+            particion=particion, max_concurrencia=max_concurrencia
+        )
+    
+    def _crear_cliente_auxiliar(self):
+        """
+        Crea un cliente con ViewState propio dentro de la misma sesión
+        
+        Comparte las cookies (la sesión del servidor donde se resolvió el
+        captcha), el parser, el coalescedor, el planificador, la caché y el
+        circuito; solo el objeto requests.Session y el ViewState son suyos,
+        porque JSF conserva una consulta por vista y requests.Session no
+        debe usarse desde varios hilos. Cada búsqueda y cada ventana de
+        buscar_por_fechas_particionado se hace desde uno de estos clientes.
+        
+        Returns:
+            APIRedam: Cliente auxiliar
+        """
+        cliente = APIRedam(
+            parser_html=self.parser.nombre,
+            usar_cache=False,
+            prefetch_detalles=0,
+            planificador=self.planificador,
+            prioridad=self._prioridad_actual(),
+            base_url=self.BASE_URL,
+            circuito=self.circuito
+        )
+        cliente.session.cookies = self.session.cookies
+        cliente.parser = self.parser
+        cliente.coalescedor = self.coalescedor
+        cliente.cache_detalle = self.cache_detalle
+        cliente._principal = self
+        return cliente
+    
+    def _buscar(self, data):
+        """
+        Ejecuta la búsqueda, compartiéndola con otras idénticas en curso
+        
+        Si otro hilo ya está enviando el mismo formulario (mismos criterios
+        normalizados), se espera su primera página y se recorre el mismo
+        resultado en lugar de hacer otro POST.
+        
+        Args:
+            data (dict): Campos del formulario de consulta
+        
+        Returns:
+            generator: Diccionarios con datos de deudores
+        """
+        clave = tuple(sorted(
+            (campo, str(valor).strip().upper())
+            for campo, valor in data.items()
+            if campo not in self.CAMPOS_NO_CRITERIO
+        ))
+        resultados = self.coalescedor.ejecutar(clave, self._enviar_busqueda, data)
+        return iter(resultados)
+    
+    def _enviar_busqueda(self, data):
+        """
+        Envía el formulario de consulta y retorna los resultados paginados
+        
+        La búsqueda se hace desde un cliente auxiliar con su propio
+        ViewState: JSF guarda una sola consulta por vista, así que dos
+        búsquedas simultáneas en la misma vista (por ejemplo, desde dos
+        pestañas) se pisarían la paginación.
+        
+        Args:
+            data (dict): Campos del formulario de consulta
+        
+        Returns:
+            ResultadosCompartidos: Diccionarios con datos de deudores
         """
-        if not self.view_state:
-            if not self.inicializar_sesion():
-                raise Exception("No se pudo inicializar la sesión")
+        self._cancelar_prefetch()
+        
+        cliente = self._crear_cliente_auxiliar() if self._principal is None else self
+        primera_pagina, paginas = cliente._consultar(data)
+        
+        self._programar_prefetch(primera_pagina)
+        return ResultadosCompartidos(paginas)
+    
+    def _consultar(self, data):
+        """
+        Envía el formulario en la vista de este cliente
+        
+        La primera página se solicita de inmediato (los errores de captcha o
+        de red se lanzan aquí). Las páginas siguientes del paginador JSF se
+        piden solo cuando el consumidor del generador llega a ellas.
         
+        Args:
+            data (dict): Campos del formulario de consulta
+        
+        Returns:
+            tuple: (deudores de la primera página, generador de todos los deudores)
+        """
         try:
             url = f"{self.BASE_URL}/services/consultaDeudor.xhtml"
             
-            # Mapear tipo de documento
-            tipo_map = {
-                'DNI': '1',
-                'CARNET DE EXTRANJERÍA': '2',
-                'PASAPORTE': '3'
-            }
-            
-            data = {
-                'formConsulta': 'formConsulta',
-                'formConsulta:tipoConsulta': '2',  # 2 = Búsqueda por DNI
-                'formConsulta:tipoDocumento': tipo_map.get(tipo_documento, '1'),
-                'formConsulta:numeroDocumento': numero_documento,
-                'formConsulta:captcha': captcha.upper(),
-                'formConsulta:btnConsultar': 'Consultar',
-                'javax.faces.ViewState': self.view_state
-            }
-            
-            response = self.session.post(
-                url, 
-                data=data, 
-                timeout=self.TIMEOUT,
-                allow_redirects=True
-            )
+            # Realizar petición POST
+            response = self._post_formulario(url, data, allow_redirects=True)
             
             if response.status_code == 200:
-                return self._parsear_resultados(response.text)
+                primera_pagina = self._parsear_resultados(response.text)
+                paginacion = detectar_paginacion(response.text)
+                return primera_pagina, self._paginar(data, primera_pagina, paginacion)
             else:
                 raise Exception(f"Error HTTP: {response.status_code}")
-                
+        
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error en la petición: {str(e)}")
     
-    def buscar_por_fechas(self, fecha_inicio, fecha_fin, captcha):
+    def _paginar(self, data, primera_pagina, paginacion):
         """
-        Busca deudores por rango de fechas
+        Generador que recorre las páginas de resultados bajo demanda
+        
+        Termina con una página incompleta o vacía, con una página que repite
+        una anterior (el servidor ignoró el desplazamiento) o tras
+        MAX_PAGINAS. Si el ViewState se renueva a mitad de la paginación, la
+        vista nueva no tiene la búsqueda: se reenvía el formulario y se
+        sigue desde la primera fila aún no entregada.
         
         Args:
-            fecha_inicio (datetime): Fecha inicial
-            fecha_fin (datetime): Fecha final
-            captcha (str): Código captcha
+            data (dict): Campos del formulario de la búsqueda
+            primera_pagina (list): Deudores de la primera página
+            paginacion (dict): Resultado de detectar_paginacion (o None)
+        
+        Yields:
+            dict: Datos de cada deudor
+        """
+        yield from primera_pagina
+        
+        filas_por_pagina = len(primera_pagina)
+        if paginacion is None or not paginacion['siguiente'] or not filas_por_pagina:
+            return
+        
+        firmas = {self._firma_pagina(primera_pagina)}
+        refrescos = self.refrescos_sesion
+        primera_fila = filas_por_pagina
+        for _ in range(self.MAX_PAGINAS - 1):
+            deudores = self._obtener_pagina(paginacion['tabla_id'], primera_fila, filas_por_pagina)
+            if self.refrescos_sesion != refrescos:
+                refrescos = self._reenviar_busqueda(data)
+                deudores = self._obtener_pagina(paginacion['tabla_id'], primera_fila,
+                                                filas_por_pagina)
+                if self.refrescos_sesion != refrescos:
+                    raise Exception("La sesión expiró otra vez al repetir la búsqueda")
+            
+            if not deudores:
+                return
+            firma = self._firma_pagina(deudores)
+            if firma in firmas:
+                print(f" El paginador repitió una página en la fila {primera_fila}, se detiene")
+                return
+            firmas.add(firma)
+            
+            yield from deudores
+            
+            if len(deudores) < filas_por_pagina:
+                return
+            primera_fila += len(deudores)
+        
+        print(f" Se alcanzó el máximo de {self.MAX_PAGINAS} páginas por búsqueda")
+    
+    @staticmethod
+    def _firma_pagina(deudores):
+        """Identifica una página por su primera fila"""
+        primero = deudores[0]
+        return (primero.get('id'), primero.get('numero_documento'), primero.get('nombre_completo'))
+    
+    def _reenviar_busqueda(self, data):
+        """
+        Repite el formulario de búsqueda en el ViewState renovado
+        
+        Args:
+            data (dict): Campos del formulario de la búsqueda
         
         Returns:
-            list: Lista de diccionarios con datos de deudores
+            int: refrescos_sesion después de repetirla
+        """
+        print("ViewState renovado a mitad de la paginación, se repite la búsqueda")
+        refrescos = self.refrescos_sesion
+        url = f"{self.BASE_URL}/services/consultaDeudor.xhtml"
+        try:
+            response = self._post_formulario(url, dict(data), allow_redirects=True)
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Error en la petición: {str(e)}")
+        if response.status_code != 200 or self.refrescos_sesion != refrescos:
+            raise Exception("No se pudo repetir la búsqueda tras renovar la sesión")
+        return refrescos
+    
+    def _obtener_pagina(self, tabla_id, primera_fila, filas_por_pagina):
         """
-        if not self.view_state:
-            if not self.inicializar_sesion():
-                raise Exception("No se pudo inicializar la sesión")
+        Solicita una página de la tabla de resultados (AJAX de JSF)
         
+        Args:
+            tabla_id (str): ID de la tabla paginada
+            primera_fila (int): Índice de la primera fila de la página
+            filas_por_pagina (int): Tamaño de página
+        
+        Returns:
+            list: Deudores de la página
+        """
         try:
             url = f"{self.BASE_URL}/services/consultaDeudor.xhtml"
             
             data = {
-                'formConsulta': 'formConsulta',
-                'formConsulta:tipoConsulta': '3',  # 3 = Búsqueda por fechas
-                'formConsulta:fechaInicio': fecha_inicio.strftime('%d/%m/%Y'),
-                'formConsulta:fechaFin': fecha_fin.strftime('%d/%m/%Y'),
-                'formConsulta:captcha': captcha.upper(),
-                'formConsulta:btnConsultar': 'Consultar',
-                'javax.faces.ViewState': self.view_state
+                'javax.faces.partial.ajax': 'true',
+                'javax.faces.source': tabla_id,
+                'javax.faces.partial.execute': tabla_id,
+                'javax.faces.partial.render': tabla_id,
+                f'{tabla_id}_pagination': 'true',
+                f'{tabla_id}_first': str(primera_fila),
+                f'{tabla_id}_rows': str(filas_por_pagina),
+                'formConsulta': 'formConsulta'
             }
             
-            response = self.session.post(
-                url, 
-                data=data, 
-                timeout=self.TIMEOUT,
-                allow_redirects=True
-            )
+            response = self._post_formulario(url, data)
             
             if response.status_code == 200:
-                return self._parsear_resultados(response.text)
+                html = convertir_respuesta_parcial(response.text, tabla_id)
+                return self._parsear_resultados(html)
             else:
                 raise Exception(f"Error HTTP: {response.status_code}")
-                
+        
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error en la petición: {str(e)}")
     
@@ -222,6 +479,31 @@ class APIRedam:
         """
         Obtiene el detalle completo de un deudor
         
+        Args:
+            id_deudor (str): ID del deudor en el sistema
+        
+        Returns:
+            dict: Diccionario con información detallada
+        """
+        if id_deudor is None or not str(id_deudor).strip():
+            raise Exception("El deudor no tiene ID para consultar su detalle")
+        
+        if self.cache_detalle is not None:
+            detalle = self.cache_detalle.obtener(id_deudor)
+            if detalle is not None:
+                return detalle
+        
+        if self.prefetch is not None:
+            detalle = self.prefetch.obtener(id_deudor, timeout=self.TIMEOUT)
+            if detalle is not None:
+                return detalle
+        
+        return self._descargar_detalle(id_deudor)
+    
+    def _descargar_detalle(self, id_deudor):
+        """
+        Descarga y parsea el detalle desde el servidor
+        
         Args:
             id_deudor (str): ID del deudor en el sistema
         
@@ -233,24 +515,243 @@ class APIRedam:
             
             data = {
                 'formDetalle': 'formDetalle',
-                'formDetalle:idDeudor': id_deudor,
-                'javax.faces.ViewState': self.view_state
+                'formDetalle:idDeudor': id_deudor
             }
             
-            response = self.session.post(
-                url, 
-                data=data, 
-                timeout=self.TIMEOUT
-            )
+            response = self._post_formulario(url, data)
             
             if response.status_code == 200:
-                return self._parsear_detalle(response.text)
+                detalle = self._parsear_detalle(response.text)
+                if self.cache_detalle is not None:
+                    self.cache_detalle.guardar(id_deudor, detalle)
+                return detalle
             else:
                 raise Exception(f"Error HTTP: {response.status_code}")
-                
+        
         except requests.exceptions.RequestException as e:
             raise Exception(f"Error en la petición: {str(e)}")
     
+    def _precargar_detalle(self, id_deudor):
+        """Descarga un detalle para la precarga, con prioridad de lote"""
+        with self.con_prioridad(PRIORIDAD_LOTE):
+            return self._descargar_detalle(id_deudor)
+    
+    def _programar_prefetch(self, deudores):
+        """Precarga en segundo plano los detalles de los primeros resultados"""
+        if self.prefetch is not None:
+            self.prefetch.programar(d['id'] for d in deudores)
+    
+    def _cancelar_prefetch(self):
+        """Cancela la precarga de la búsqueda anterior"""
+        if self.prefetch is not None:
+            self.prefetch.cancelar()
+    
+    def invalidar_detalle(self, id_deudor=None):
+        """
+        Descarta detalles guardados en la caché
+        
+        Args:
+            id_deudor (str): ID a invalidar (None = toda la caché)
+        """
+        if self.cache_detalle is None:
+            return
+        
+        if id_deudor is None:
+            self.cache_detalle.limpiar()
+        else:
+            self.cache_detalle.invalidar(id_deudor)
+    
+    @contextmanager
+    def con_prioridad(self, prioridad):
+        """
+        Cambia la prioridad de las solicitudes del hilo actual
+        
+        Ejemplo:
+            with api.con_prioridad(PRIORIDAD_LOTE):
+                api.buscar_por_fechas(inicio, fin, captcha)
+        
+        Args:
+            prioridad (int): PRIORIDAD_INTERACTIVA o PRIORIDAD_LOTE
+        """
+        anterior = getattr(self._contexto, 'prioridad', None)
+        self._contexto.prioridad = prioridad
+        try:
+            yield self
+        finally:
+            self._contexto.prioridad = anterior
+    
+    def _solicitar(self, metodo, url, **kwargs):
+        """
+        Realiza una petición HTTP pasando por el circuito y el planificador
+        
+        Con el circuito abierto falla de inmediato con CircuitoAbierto en
+        lugar de esperar el TIMEOUT. Los errores de red y las respuestas 5xx
+        cuentan como fallo, salvo las de ViewState expirado (JSF suele
+        responderlas con 500): el servidor está bien y _post_formulario
+        renueva la sesión.
+        
+        Args:
+            metodo (str): 'GET' o 'POST'
+            url (str): URL destino
+            **kwargs: Argumentos para session.request
+        
+        Returns:
+            requests.Response: Respuesta del servidor
+        """
+        kwargs.setdefault('timeout', self.TIMEOUT)
+        response = self.circuito.ejecutar(
+            self.planificador.ejecutar,
+            self._sesion_del_hilo().request, metodo, url, prioridad=self._prioridad_actual(), **kwargs
+        )
+        
+        if response.status_code >= 500 and not self._view_state_expirado(response):
+            self.circuito.registrar_fallo(f"Error HTTP: {response.status_code}")
+        else:
+            self.circuito.registrar_exito()
+        return response
+    
+    def _sesion_del_hilo(self):
+        """
+        requests.Session del hilo actual
+        
+        requests.Session no es seguro entre hilos: el hilo que creó el
+        cliente usa self.session y cada otro hilo (pool de búsquedas,
+        precarga, sonda) una propia con los mismos encabezados y las mismas
+        cookies, es decir, la misma sesión del servidor.
+        
+        Returns:
+            requests.Session: Sesión HTTP para este hilo
+        """
+        sesion = getattr(self._contexto, 'sesion', None)
+        if sesion is None:
+            if threading.get_ident() == self._hilo:
+                sesion = self.session
+            else:
+                sesion = requests.Session()
+                sesion.headers.update(self.session.headers)
+                sesion.cookies = self.session.cookies
+            self._contexto.sesion = sesion
+        return sesion
+    
+    def _sondear(self):
+        """
+        Sonda de salud del circuito: consulta la página principal
+        
+        No pasa por el circuito (se ejecuta justamente cuando está abierto)
+        y usa una conexión aparte para no competir con la sesión JSF.
+        
+        Returns:
+            bool: True si el servidor responde sin error 5xx
+        """
+        try:
+            response = self.planificador.ejecutar(
+                requests.get, self.BASE_URL, prioridad=PRIORIDAD_LOTE,
+                headers=dict(self.session.headers), timeout=5
+            )
+            return response.status_code < 500
+        except requests.exceptions.RequestException:
+            return False
+    
+    def _prioridad_actual(self):
+        """Prioridad del hilo actual (con_prioridad) o la del cliente"""
+        prioridad = getattr(self._contexto, 'prioridad', None)
+        if prioridad is None:
+            prioridad = self.prioridad
+        return prioridad
+    
+    def _asegurar_sesion(self):
+        """Inicializa la sesión si aún no se tiene un ViewState"""
+        with self._lock_sesion:
+            if not self.view_state:
+                if not self.inicializar_sesion():
+                    raise Exception("No se pudo inicializar la sesión")
+    
+    def _post_formulario(self, url, data, **kwargs):
+        """
+        Envía un formulario JSF con el ViewState vigente
+        
+        Si el servidor responde que el ViewState expiró, re-inicializa
+        la sesión una sola vez y repite la petición.
+        
+        Args:
+            url (str): URL del formulario
+            data (dict): Campos del formulario (sin ViewState)
+            **kwargs: Argumentos adicionales para session.request
+        
+        Returns:
+            requests.Response: Respuesta del servidor
+        """
+        self._asegurar_sesion()
+        
+        view_state_usado = self.view_state
+        data['javax.faces.ViewState'] = view_state_usado
+        response = self._solicitar('POST', url, data=data, **kwargs)
+        
+        if self._view_state_expirado(response):
+            with self._lock_sesion:
+                # Otro hilo pudo haber refrescado la sesión mientras tanto
+                if self.view_state == view_state_usado:
+                    print("ViewState expirado, re-inicializando sesión")
+                    self.view_state = None
+                    self.refrescos_sesion += 1
+                    if self._principal is not None:
+                        self._principal._contar_refresco()
+            self._asegurar_sesion()
+            
+            data['javax.faces.ViewState'] = self.view_state
+            response = self._solicitar('POST', url, data=data, **kwargs)
+        
+        return response
+    
+    def _contar_refresco(self):
+        """Cuenta un refresco de un cliente auxiliar en obtener_estado_sesion"""
+        with self._lock_sesion:
+            self.refrescos_sesion += 1
+    
+    def _view_state_expirado(self, response):
+        """
+        Detecta si la respuesta indica un ViewState expirado
+        
+        Args:
+            response (requests.Response): Respuesta del servidor
+        
+        Returns:
+            bool: True si la sesión JSF expiró
+        """
+        texto = response.text or ''
+        
+        # Al expirar, JSF suele redirigir (muchas veces a la misma
+        # consultaDeudor.xhtml): si la redirección perdió el formulario
+        # enviado (el POST pasó a GET) o la página final no trae ViewState,
+        # la petición no se procesó
+        if response.history:
+            if response.request.method != response.history[0].request.method:
+                return True
+            if 'javax.faces.ViewState' not in texto:
+                return True
+        
+        return any(marcador in texto for marcador in self.MARCADORES_VIEW_EXPIRADO)
+    
+    def obtener_estado_sesion(self):
+        """
+        Retorna métricas de la sesión JSF
+        
+        Returns:
+            dict: Refrescos realizados (también los de los clientes
+                auxiliares de cada búsqueda), edad del ViewState en segundos y
+                búsquedas ahorradas por coalescencia y estado del circuito
+        """
+        edad = None
+        if self.view_state_obtenido is not None:
+            edad = time.monotonic() - self.view_state_obtenido
+        
+        return {
+            'refrescos': self.refrescos_sesion,
+            'edad_view_state': edad,
+            'coalescencia': self.coalescedor.obtener_estadisticas(),
+            'circuito': self.circuito.obtener_estado()
+        }
+    
     def _parsear_resultados(self, html):
         """
         Parsea el HTML de respuesta y extrae los deudores
@@ -261,33 +762,22 @@ class APIRedam:
         Returns:
             list: Lista de diccionarios con datos de deudores
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        deudores = []
-        
-        # Buscar tabla de resultados
-        tabla = soup.find('table', {'id': re.compile(r'.*tablaResultados.*')})
+        return list(self._iterar_resultados(html))
+    
+    def _iterar_resultados(self, html):
+        """
+        Itera los deudores de la página
         
-        if not tabla:
-            # No hay resultados
-            return []
+        Con lxml las filas se entregan a medida que se parsean (iterparse);
+        con html.parser, al terminar de parsear la página.
         
-        # Extraer filas (ignorar header)
-        filas = tabla.find_all('tr')[1:]  # Saltar header
+        Args:
+            html (str): HTML de la respuesta
         
-        for fila in filas:
-            celdas = fila.find_all('td')
-            
-            if len(celdas) >= 4:
-                deudor = {
-                    'nombre_completo': celdas[0].get_text(strip=True),
-                    'tipo_documento': celdas[1].get_text(strip=True),
-                    'numero_documento': celdas[2].get_text(strip=True),
-                    'fecha_registro': celdas[3].get_text(strip=True),
-                    'id': self._extraer_id_deudor(fila)
-                }
-                deudores.append(deudor)
-        
-        return deudores
+        Yields:
+            dict: Datos de cada deudor
+        """
+        return self.parser.iterar_resultados(html)
     
     def _parsear_detalle(self, html):
         """
@@ -299,59 +789,7 @@ class APIRedam:
         Returns:
             dict: Diccionario con información detallada
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        detalle = {}
-        
-        # Extraer datos personales
-        detalle['apellido_paterno'] = self._extraer_campo(soup, 'apellidoPaterno')
-        detalle['apellido_materno'] = self._extraer_campo(soup, 'apellidoMaterno')
-        detalle['nombres'] = self._extraer_campo(soup, 'nombres')
-        detalle['tipo_documento'] = self._extraer_campo(soup, 'tipoDocumento')
-        detalle['numero_documento'] = self._extraer_campo(soup, 'numeroDocumento')
-        
-        # Extraer datos judiciales
-        detalle['distrito_judicial'] = self._extraer_campo(soup, 'distritoJudicial')
-        detalle['organo_jurisdiccional'] = self._extraer_campo(soup, 'organoJurisdiccional')
-        detalle['secretario'] = self._extraer_campo(soup, 'secretario')
-        detalle['numero_expediente'] = self._extraer_campo(soup, 'numeroExpediente')
-        
-        # Extraer montos
-        detalle['pension_mensual'] = self._extraer_monto(soup, 'pensionMensual')
-        detalle['importe_adeudado'] = self._extraer_monto(soup, 'importeAdeudado')
-        detalle['interes'] = self._extraer_monto(soup, 'interes')
-        
-        # Extraer demandante
-        detalle['demandante_nombre'] = self._extraer_campo(soup, 'demandanteNombre')
-        detalle['demandante_relacion'] = self._extraer_campo(soup, 'demandanteRelacion')
-        
-        return detalle
-    
-    def _extraer_id_deudor(self, fila):
-        """Extrae el ID del deudor desde el botón de detalle"""
-        boton = fila.find('button') or fila.find('a')
-        if boton:
-            onclick = boton.get('onclick', '')
-            match = re.search(r"'(\d+)'", onclick)
-            if match:
-                return match.group(1)
-        return None
-    
-    def _extraer_campo(self, soup, id_campo):
-        """Extrae un campo del HTML por su ID"""
-        elemento = soup.find(id=re.compile(f'.*{id_campo}.*'))
-        if elemento:
-            return elemento.get_text(strip=True)
-        return ""
-    
-    def _extraer_monto(self, soup, id_campo):
-        """Extrae un monto y lo convierte a float"""
-        texto = self._extraer_campo(soup, id_campo)
-        # Limpiar formato: "S/ 1,500.00" -> 1500.00
-        texto = texto.replace('S/', '').replace(',', '').strip()
-        try:
-            return float(texto)
-        except ValueError:
-            return 0.0
+        return self.parser.parsear_detalle(html)
     
     def verificar_conexion(self):
         """
@@ -361,10 +799,8 @@ class APIRedam:
             bool: True si hay conexión
         """
         try:
-            response = self.session.get(
-                self.BASE_URL, 
-                timeout=5
-            )
+            response = self._solicitar('GET', self.BASE_URL, timeout=5)
             return response.status_code == 200
-        except:
+        except (requests.exceptions.RequestException, CircuitoAbierto) as e:
+            print(f"Sin conexión con el REDAM: {e}")
             return False
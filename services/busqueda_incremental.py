@@ -0,0 +1,118 @@
+"""
+Búsqueda incremental por nombres sobre el registro local
+Responsabilidad: Responder búsquedas sucesivas mientras el usuario escribe,
+refinando los candidatos de la búsqueda anterior en lugar de recorrer de
+nuevo todo el registro
+"""
+
+import threading
+from itertools import chain
+
+from services.registro_local import filtrar_por_nombres
+
+
+class BusquedaIncremental:
+    """
+    Sesión de búsqueda por nombres que recuerda su último resultado
+    
+    La búsqueda es por subcadena: si cada texto nuevo contiene al anterior
+    (el usuario siguió escribiendo), los resultados nuevos son un
+    subconjunto de los anteriores y basta con filtrarlos. Los candidatos se
+    guardan agrupados por apellido paterno, así que afinar el paterno solo
+    descarta grupos sin revisar sus filas.
+    
+    Si el registro cambió desde la última búsqueda, o el texto se acortó o
+    cambió, se vuelve a buscar en el registro completo.
+    """
+    
+    def __init__(self, registro):
+        """
+        Constructor
+        
+        Args:
+            registro (RegistroLocal): Registro donde buscar
+        """
+        self.registro = registro
+        self._lock = threading.Lock()
+        self._ultima = None  # (version, criterios, grupos)
+        self.completas = 0
+        self.refinadas = 0
+    
+    @staticmethod
+    def normalizar(apellido_paterno, apellido_materno="", nombres=""):
+        """
+        Criterios tal como los compara el registro
+        
+        Returns:
+            tuple: (paterno, materno, nombres) sin espacios extremos y en mayúsculas
+        """
+        return (apellido_paterno.strip().upper(), apellido_materno.strip().upper(),
+                nombres.strip().upper())
+    
+    def buscar(self, apellido_paterno, apellido_materno="", nombres=""):
+        """
+        Busca deudores por nombres, refinando la búsqueda anterior si se puede
+        
+        Args:
+            apellido_paterno (str): Apellido paterno
+            apellido_materno (str): Apellido materno (opcional)
+            nombres (str): Nombres (opcional)
+        
+        Returns:
+            list: Lista de DeudorAlimentario
+        """
+        criterios = self.normalizar(apellido_paterno, apellido_materno, nombres)
+        paterno, materno, nombres = criterios
+        
+        with self._lock:
+            ultima = self._ultima
+        
+        # La versión se lee antes de buscar: si el registro cambia durante
+        # la búsqueda, la siguiente no reutilizará este resultado
+        version = self.registro.version
+        
+        if ultima is not None and self._extiende(ultima, version, criterios):
+            grupos = self._refinar(ultima, criterios)
+            with self._lock:
+                self.refinadas += 1
+        else:
+            grupos = self.registro.agrupar_por_paterno(paterno, materno, nombres)
+            with self._lock:
+                self.completas += 1
+        
+        with self._lock:
+            self._ultima = (version, criterios, grupos)
+        
+        return list(chain.from_iterable(grupos.values()))
+    
+    def reiniciar(self):
+        """Olvida el último resultado (la próxima búsqueda será completa)"""
+        with self._lock:
+            self._ultima = None
+    
+    @staticmethod
+    def _extiende(ultima, version, criterios):
+        """Indica si los criterios solo agregan texto a los de la última búsqueda"""
+        version_anterior, anteriores, _ = ultima
+        if version_anterior != version:
+            return False
+        return all(anterior in nuevo for anterior, nuevo in zip(anteriores, criterios))
+    
+    @staticmethod
+    def _refinar(ultima, criterios):
+        """Filtra los grupos de la última búsqueda con los criterios nuevos"""
+        _, (paterno_ant, materno_ant, nombres_ant), grupos = ultima
+        paterno, materno, nombres = criterios
+        
+        # Solo se revisan los textos que cambiaron
+        materno = materno if materno != materno_ant else ""
+        nombres = nombres if nombres != nombres_ant else ""
+        
+        refinados = {}
+        for apellido, deudores in grupos.items():
+            if paterno != paterno_ant and paterno not in apellido:
+                continue
+            deudores = filtrar_por_nombres(deudores, materno, nombres)
+            if deudores:
+                refinados[apellido] = deudores
+        return refinados
@@ -0,0 +1,199 @@
+"""
+Caché persistente de detalles de deudores
+Responsabilidad: Guardar en disco los detalles ya parseados para no repetir
+la consulta remota
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CacheDetalle:
+    """
+    Caché en disco (SQLite) de diccionarios de detalle por id de deudor
+    
+    Las entradas vencen tras `ttl` segundos y, al superar `max_entradas`,
+    se eliminan las usadas hace más tiempo (LRU). Los accesos se anotan en
+    memoria y se escriben en lote (al guardar, al cerrar o cada
+    ACCESOS_POR_LOTE aciertos), no con un commit por acierto.
+    """
+    
+    TTL_DEFECTO = 24 * 60 * 60  # segundos
+    MAX_ENTRADAS_DEFECTO = 5000
+    ACCESOS_POR_LOTE = 100
+    
+    def __init__(self, ruta=None, ttl=TTL_DEFECTO, max_entradas=MAX_ENTRADAS_DEFECTO):
+        """
+        Constructor
+        
+        Args:
+            ruta (str): Ruta del archivo SQLite (por defecto data/cache_detalle.db)
+            ttl (float): Segundos de vigencia de cada entrada
+            max_entradas (int): Número máximo de detalles guardados
+        """
+        if ruta is None:
+            ruta_actual = os.path.dirname(__file__)
+            ruta = os.path.join(ruta_actual, '..', 'data', 'cache_detalle.db')
+        
+        self.ruta = ruta
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self.aciertos = 0
+        self.fallos = 0
+        self._accesos = {}  # id_deudor -> último acceso aún no escrito
+        
+        # La conexión se comparte entre hilos, protegida por el lock
+        self._lock = threading.Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("""
+            CREATE TABLE IF NOT EXISTS detalle (
+                id_deudor TEXT PRIMARY KEY,
+                datos TEXT NOT NULL,
+                guardado REAL NOT NULL,
+                ultimo_acceso REAL NOT NULL
+            )
+        """)
+        self._conexion.execute(
+            "CREATE INDEX IF NOT EXISTS idx_detalle_acceso ON detalle (ultimo_acceso)"
+        )
+        self._conexion.commit()
+    
+    def obtener(self, id_deudor):
+        """
+        Obtiene un detalle vigente
+        
+        Args:
+            id_deudor (str): ID del deudor
+        
+        Returns:
+            dict or None: Detalle guardado, None si no existe o venció
+        """
+        ahora = time.time()
+        
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT datos, guardado FROM detalle WHERE id_deudor = ?",
+                (str(id_deudor),)
+            ).fetchone()
+            
+            if fila is None or ahora - fila[1] > self.ttl:
+                if fila is not None:
+                    self._accesos.pop(str(id_deudor), None)
+                    self._conexion.execute(
+                        "DELETE FROM detalle WHERE id_deudor = ?", (str(id_deudor),)
+                    )
+                    self._conexion.commit()
+                self.fallos += 1
+                return None
+            
+            self._accesos[str(id_deudor)] = ahora
+            if len(self._accesos) >= self.ACCESOS_POR_LOTE:
+                self._escribir_accesos()
+                self._conexion.commit()
+            self.aciertos += 1
+        
+        return json.loads(fila[0])
+    
+    def guardar(self, id_deudor, detalle):
+        """
+        Guarda un detalle y aplica el límite de tamaño
+        
+        Args:
+            id_deudor (str): ID del deudor
+            detalle (dict): Detalle parseado
+        """
+        ahora = time.time()
+        datos = json.dumps(detalle, ensure_ascii=False)
+        
+        with self._lock:
+            self._accesos.pop(str(id_deudor), None)
+            self._escribir_accesos()  # el límite LRU necesita los accesos al día
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO detalle (id_deudor, datos, guardado, ultimo_acceso) "
+                "VALUES (?, ?, ?, ?)",
+                (str(id_deudor), datos, ahora, ahora)
+            )
+            self._conexion.execute(
+                "DELETE FROM detalle WHERE id_deudor IN ("
+                "  SELECT id_deudor FROM detalle ORDER BY ultimo_acceso DESC LIMIT -1 OFFSET ?"
+                ")",
+                (self.max_entradas,)
+            )
+            self._conexion.commit()
+    
+    def _escribir_accesos(self):
+        """Escribe los accesos pendientes (con el lock tomado, sin commit)"""
+        if not self._accesos:
+            return
+        self._conexion.executemany(
+            "UPDATE detalle SET ultimo_acceso = ? WHERE id_deudor = ?",
+            [(acceso, id_deudor) for id_deudor, acceso in self._accesos.items()]
+        )
+        self._accesos = {}
+    
+    def invalidar(self, id_deudor):
+        """
+        Elimina el detalle de un deudor
+        
+        Args:
+            id_deudor (str): ID del deudor
+        
+        Returns:
+            bool: True si existía la entrada
+        """
+        with self._lock:
+            self._accesos.pop(str(id_deudor), None)
+            cursor = self._conexion.execute(
+                "DELETE FROM detalle WHERE id_deudor = ?", (str(id_deudor),)
+            )
+            self._conexion.commit()
+            return cursor.rowcount > 0
+    
+    def limpiar(self):
+        """Elimina todas las entradas"""
+        with self._lock:
+            self._accesos = {}
+            self._conexion.execute("DELETE FROM detalle")
+            self._conexion.commit()
+    
+    def purgar_vencidos(self):
+        """
+        Elimina las entradas vencidas
+        
+        Returns:
+            int: Número de entradas eliminadas
+        """
+        limite = time.time() - self.ttl
+        with self._lock:
+            cursor = self._conexion.execute(
+                "DELETE FROM detalle WHERE guardado < ?", (limite,)
+            )
+            self._conexion.commit()
+            return cursor.rowcount
+    
+    def __len__(self):
+        with self._lock:
+            return self._conexion.execute("SELECT COUNT(*) FROM detalle").fetchone()[0]
+    
+    def obtener_estadisticas(self):
+        """
+        Retorna métricas de uso de la caché
+        
+        Returns:
+            dict: Entradas, aciertos y fallos
+        """
+        return {
+            'entradas': len(self),
+            'aciertos': self.aciertos,
+            'fallos': self.fallos
+        }
+    
+    def cerrar(self):
+        """Escribe los accesos pendientes y cierra la conexión a la base de datos"""
+        with self._lock:
+            self._escribir_accesos()
+            self._conexion.commit()
+            self._conexion.close()
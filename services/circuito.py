@@ -0,0 +1,237 @@
+"""
+Circuit breaker para el servidor del REDAM
+Responsabilidad: Dejar de esperar el TIMEOUT completo cuando el servidor
+está caído y detectar en segundo plano cuándo vuelve
+"""
+
+import threading
+import time
+
+ESTADO_CERRADO = 'cerrado'          # funcionamiento normal
+ESTADO_ABIERTO = 'abierto'          # las solicitudes fallan de inmediato
+ESTADO_SEMIABIERTO = 'semiabierto'  # se deja pasar una solicitud de prueba
+
+
+class CircuitoAbierto(Exception):
+    """
+    Se lanza en lugar de hacer la solicitud mientras el circuito está abierto
+    """
+
+
+class CircuitoRemoto:
+    """
+    Circuit breaker con sonda de salud en segundo plano
+    
+    Tras `umbral_fallos` fallos consecutivos el circuito se abre y las
+    solicitudes fallan sin tocar la red. Si hay sonda, un hilo la ejecuta
+    cada `intervalo_sonda` segundos y cierra el circuito cuando responde.
+    Sin sonda, pasado `tiempo_apertura` se permite una solicitud de prueba.
+    """
+    
+    UMBRAL_FALLOS = 3
+    TIEMPO_APERTURA = 30.0  # segundos
+    INTERVALO_SONDA = 10.0  # segundos
+    
+    def __init__(self, umbral_fallos=UMBRAL_FALLOS, tiempo_apertura=TIEMPO_APERTURA,
+                 sonda=None, intervalo_sonda=INTERVALO_SONDA):
+        """
+        Constructor
+        
+        Args:
+            umbral_fallos (int): Fallos consecutivos que abren el circuito
+            tiempo_apertura (float): Segundos abierto antes de la prueba
+                (solo si no hay sonda)
+            sonda (callable): Función sin argumentos que retorna True si el
+                servidor responde (opcional)
+            intervalo_sonda (float): Segundos entre ejecuciones de la sonda
+        """
+        self.umbral_fallos = umbral_fallos
+        self.tiempo_apertura = tiempo_apertura
+        self.sonda = sonda
+        self.intervalo_sonda = intervalo_sonda
+        
+        self._lock = threading.Lock()
+        self._estado = ESTADO_CERRADO
+        self._fallos_consecutivos = 0
+        self._abierto_desde = None
+        self._prueba_en_curso = False
+        self._hilo_sonda = None
+        self._detener_sonda = threading.Event()
+        self._observadores = []
+        
+        self.aperturas = 0
+        self.rechazadas = 0
+        self.ultimo_error = None
+    
+    @property
+    def estado(self):
+        """str: ESTADO_CERRADO, ESTADO_ABIERTO o ESTADO_SEMIABIERTO"""
+        with self._lock:
+            return self._estado
+    
+    def agregar_observador(self, callback):
+        """
+        Registra una función que se llama con el nuevo estado en cada cambio
+        
+        El callback puede ejecutarse en el hilo de la sonda.
+        
+        Args:
+            callback (callable): Función que recibe el estado (str)
+        """
+        with self._lock:
+            self._observadores.append(callback)
+    
+    def permitir(self):
+        """
+        Indica si una solicitud puede salir a la red
+        
+        Returns:
+            bool: False si el circuito está abierto
+        """
+        with self._lock:
+            if self._estado == ESTADO_CERRADO:
+                return True
+            
+            if (self._estado == ESTADO_ABIERTO and self.sonda is None
+                    and time.monotonic() - self._abierto_desde >= self.tiempo_apertura):
+                self._estado = ESTADO_SEMIABIERTO
+                self._prueba_en_curso = False
+                cambio = ESTADO_SEMIABIERTO
+            else:
+                cambio = None
+            
+            permitida = self._estado == ESTADO_SEMIABIERTO and not self._prueba_en_curso
+            if permitida:
+                self._prueba_en_curso = True
+            else:
+                self.rechazadas += 1
+        
+        if cambio:
+            self._notificar(cambio)
+        return permitida
+    
+    def ejecutar(self, funcion, *args, **kwargs):
+        """
+        Ejecuta la solicitud si el circuito lo permite
+        
+        Las excepciones de la función cuentan como fallo. Para clasificar
+        respuestas (por ejemplo HTTP 5xx) usar registrar_exito/registrar_fallo.
+        
+        Args:
+            funcion (callable): Solicitud a ejecutar
+            *args, **kwargs: Argumentos de la función
+        
+        Returns:
+            object: Resultado de la función
+        """
+        if not self.permitir():
+            raise CircuitoAbierto("El servidor del REDAM no está disponible; reintentando en segundo plano")
+        
+        try:
+            return funcion(*args, **kwargs)
+        except Exception as e:
+            self.registrar_fallo(e)
+            raise
+    
+    def registrar_exito(self):
+        """Registra una solicitud exitosa y cierra el circuito si no lo estaba"""
+        with self._lock:
+            self._fallos_consecutivos = 0
+            self._prueba_en_curso = False
+            if self._estado == ESTADO_CERRADO:
+                return
+            self._estado = ESTADO_CERRADO
+            self._abierto_desde = None
+            self._detener_sonda.set()
+        
+        self._notificar(ESTADO_CERRADO)
+    
+    def registrar_fallo(self, error=None):
+        """
+        Registra una solicitud fallida y abre el circuito al llegar al umbral
+        
+        Args:
+            error (object): Excepción o descripción del fallo
+        """
+        with self._lock:
+            self.ultimo_error = error
+            self._fallos_consecutivos += 1
+            self._prueba_en_curso = False
+            
+            reabrir = self._estado == ESTADO_SEMIABIERTO
+            if not reabrir and (self._estado == ESTADO_ABIERTO
+                                or self._fallos_consecutivos < self.umbral_fallos):
+                return
+            
+            self._estado = ESTADO_ABIERTO
+            self._abierto_desde = time.monotonic()
+            self.aperturas += 1
+            self._iniciar_sonda()
+        
+        print(f"Circuito abierto tras {self._fallos_consecutivos} fallos: {error}")
+        self._notificar(ESTADO_ABIERTO)
+    
+    def _iniciar_sonda(self):
+        """Lanza el hilo de la sonda si hay sonda y no está corriendo"""
+        if self.sonda is None:
+            return
+        if (self._hilo_sonda is not None and self._hilo_sonda.is_alive()
+                and not self._detener_sonda.is_set()):
+            return
+        
+        self._detener_sonda = threading.Event()
+        self._hilo_sonda = threading.Thread(
+            target=self._ejecutar_sonda, args=(self._detener_sonda,),
+            name='sonda-redam', daemon=True
+        )
+        self._hilo_sonda.start()
+    
+    def _ejecutar_sonda(self, detener):
+        """Consulta la sonda periódicamente hasta que el servidor responda"""
+        while not detener.wait(self.intervalo_sonda):
+            try:
+                disponible = self.sonda()
+            except Exception as e:
+                print(f"Error en la sonda de salud: {e}")
+                disponible = False
+            
+            if disponible:
+                self.registrar_exito()
+                return
+    
+    def _notificar(self, estado):
+        """Avisa a los observadores del cambio de estado"""
+        with self._lock:
+            observadores = list(self._observadores)
+        
+        for callback in observadores:
+            try:
+                callback(estado)
+            except Exception as e:
+                print(f"Error al notificar estado del circuito: {e}")
+    
+    def obtener_estado(self):
+        """
+        Retorna el estado y los contadores del circuito
+        
+        Returns:
+            dict: Estado, fallos consecutivos, aperturas, rechazadas,
+                segundos abierto y último error
+        """
+        with self._lock:
+            abierto = None
+            if self._abierto_desde is not None:
+                abierto = time.monotonic() - self._abierto_desde
+            
+            return {
+                'estado': self._estado,
+                'fallos_consecutivos': self._fallos_consecutivos,
+                'aperturas': self.aperturas,
+                'rechazadas': self.rechazadas,
+                'segundos_abierto': abierto,
+                'ultimo_error': str(self.ultimo_error) if self.ultimo_error else None
+            }
+    
+    def cerrar(self):
+        """Detiene la sonda en segundo plano"""
+        self._detener_sonda.set()
@@ -0,0 +1,210 @@
+"""
+Coalescencia de solicitudes idénticas en curso (single-flight)
+Responsabilidad: Que varias consultas iguales simultáneas compartan una sola
+ejecución y un solo resultado
+"""
+
+import threading
+from concurrent.futures import Future
+
+
+class CoalescedorSolicitudes:
+    """
+    Agrupa llamadas concurrentes con la misma clave
+    
+    La primera llamada ejecuta la función; las que llegan mientras está en
+    curso esperan y reciben el mismo resultado (o la misma excepción).
+    Con iterar, lo mismo para generadores: las llamadas idénticas recorren
+    un único generador sin esperar a que termine.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._en_curso = {}  # clave -> Future
+        self._flujos = {}    # clave -> [ResultadosCompartidos, consumidores]
+        self.ejecuciones = 0
+        self.coalescidas = 0
+    
+    def ejecutar(self, clave, funcion, *args, **kwargs):
+        """
+        Ejecuta la función o se une a una ejecución idéntica en curso
+        
+        Args:
+            clave (hashable): Criterios normalizados de la solicitud
+            funcion (callable): Función a ejecutar
+            *args, **kwargs: Argumentos de la función
+        
+        Returns:
+            object: Resultado compartido
+        """
+        with self._lock:
+            futuro = self._en_curso.get(clave)
+            propietario = futuro is None
+            if propietario:
+                futuro = Future()
+                self._en_curso[clave] = futuro
+                self.ejecuciones += 1
+            else:
+                self.coalescidas += 1
+        
+        if not propietario:
+            return futuro.result()
+        
+        try:
+            resultado = funcion(*args, **kwargs)
+        except BaseException as e:
+            futuro.set_exception(e)
+            raise
+        else:
+            futuro.set_result(resultado)
+            return resultado
+        finally:
+            with self._lock:
+                del self._en_curso[clave]
+    
+    def iterar(self, clave, funcion, *args, **kwargs):
+        """
+        Como ejecutar, para una función que entrega resultados de a uno
+        
+        La primera llamada crea el generador; las que llegan mientras alguien
+        lo recorre reciben los mismos elementos desde el principio, a medida
+        que se obtienen. La clave se libera cuando el último consumidor
+        termina o abandona el recorrido.
+        
+        Args:
+            clave (hashable): Criterios normalizados de la solicitud
+            funcion (callable): Función que retorna un generador
+            *args, **kwargs: Argumentos de la función
+        
+        Yields:
+            object: Elementos del generador compartido
+        """
+        with self._lock:
+            flujo = self._flujos.get(clave)
+            if flujo is None:
+                flujo = [ResultadosCompartidos(funcion(*args, **kwargs)), 0]
+                self._flujos[clave] = flujo
+                self.ejecuciones += 1
+            else:
+                self.coalescidas += 1
+            flujo[1] += 1
+        
+        try:
+            yield from flujo[0]
+        finally:
+            with self._lock:
+                flujo[1] -= 1
+                abandonado = flujo[1] == 0 and self._flujos.get(clave) is flujo
+                if abandonado:
+                    del self._flujos[clave]
+            if abandonado:
+                flujo[0].cerrar()
+    
+    def obtener_estadisticas(self):
+        """
+        Retorna contadores de uso
+        
+        Returns:
+            dict: Ejecuciones reales y llamadas ahorradas
+        """
+        with self._lock:
+            return {
+                'ejecuciones': self.ejecuciones,
+                'ahorradas': self.coalescidas,
+                'en_curso': len(self._en_curso) + len(self._flujos)
+            }
+
+
+_PENDIENTE = object()  # el consumidor debe pedir el siguiente elemento
+_FIN = object()        # el generador terminó
+
+
+class ResultadosCompartidos:
+    """
+    Iterable que permite a varios consumidores recorrer un mismo generador
+    
+    Los elementos se obtienen del generador original una sola vez, bajo
+    demanda, y se guardan para los consumidores que van más atrás. Un solo
+    consumidor a la vez avanza el generador, fuera del lock (avanzar puede
+    ser pedir otra página al REDAM): los que necesitan ese mismo elemento
+    esperan, los que van más atrás siguen leyendo lo ya guardado. Si el
+    generador falla, todos los consumidores reciben la misma excepción al
+    llegar a ese punto, no solo el que lo estaba avanzando.
+    """
+    
+    def __init__(self, generador):
+        self._generador = generador
+        self._elementos = []
+        self._terminado = False
+        self._error = None
+        self._avanzando = False  # un consumidor está dentro de next(generador)
+        self._cerrar_pendiente = False
+        self._condicion = threading.Condition()
+    
+    def __iter__(self):
+        posicion = 0
+        while True:
+            with self._condicion:
+                while posicion == len(self._elementos) and self._avanzando:
+                    self._condicion.wait()
+                
+                if posicion < len(self._elementos):
+                    elemento = self._elementos[posicion]
+                elif self._error is not None:
+                    raise self._error
+                elif self._terminado:
+                    return
+                else:
+                    self._avanzando = True
+                    elemento = _PENDIENTE
+            
+            if elemento is _PENDIENTE:
+                elemento = self._avanzar()
+                if elemento is _FIN:
+                    return
+            
+            posicion += 1
+            yield elemento
+    
+    def _avanzar(self):
+        """
+        Obtiene el siguiente elemento del generador (sin el lock), lo guarda
+        y despierta a los consumidores que lo esperan
+        
+        Returns:
+            object: El elemento, o _FIN si el generador terminó
+        """
+        elemento = _FIN
+        try:
+            elemento = next(self._generador)
+        except StopIteration:
+            pass
+        except Exception as e:
+            with self._condicion:
+                self._error = e
+            raise
+        finally:
+            with self._condicion:
+                if elemento is _FIN:
+                    self._terminado = True
+                else:
+                    self._elementos.append(elemento)
+                self._avanzando = False
+                cerrar = self._cerrar_pendiente
+                self._condicion.notify_all()
+            if cerrar:
+                self._generador.close()
+        
+        return elemento
+    
+    def cerrar(self):
+        """Cierra el generador original si no se terminó de recorrer"""
+        with self._condicion:
+            if self._terminado:
+                return
+            self._terminado = True
+            if self._avanzando:
+                # Lo cierra quien lo está avanzando, al salir de next
+                self._cerrar_pendiente = True
+                return
+        self._generador.close()
@@ -0,0 +1,205 @@
+"""
+Conversión entre los diccionarios de APIRedam y los modelos
+Responsabilidad: Armar DeudorAlimentario/Expediente/Demandante a partir de
+resultados y detalles remotos, y serializarlos para el almacén local
+"""
+
+from models.deudor_alimentario import DeudorAlimentario
+from models.expediente import Expediente
+from models.demandante import Demandante
+from services.parser_html import convertir_monto
+from utils.validacion_masiva import TIPOS_DOCUMENTO
+
+# Tipo de documento normalizado -> como lo guarda el registro (TabDNI y el REDAM)
+TIPO_EN_REGISTRO = {
+    'DNI': 'DNI',
+    'CE': 'CARNET DE EXTRANJERÍA',
+    'PASAPORTE': 'PASAPORTE',
+}
+
+
+def separar_nombre(nombre_completo):
+    """
+    Separa "PATERNO MATERNO NOMBRES" en sus tres partes
+    
+    Args:
+        nombre_completo (str): Nombre como lo muestra el REDAM
+    
+    Returns:
+        tuple: (apellido_paterno, apellido_materno, nombres)
+    """
+    partes = (nombre_completo or '').split(None, 2)
+    partes += [''] * (3 - len(partes))
+    return tuple(partes)
+
+
+def tipo_en_registro(tipo_documento):
+    """
+    Tipo de documento con el nombre que usa el registro local
+    
+    Args:
+        tipo_documento (str): Tipo como llega ("D.N.I.", "CE", "Carnet de extranjeria"...)
+    
+    Returns:
+        str: DNI, CARNET DE EXTRANJERÍA o PASAPORTE (u otro tipo, sin cambios)
+    """
+    texto = (tipo_documento or '').strip()
+    normalizado = TIPOS_DOCUMENTO.get(texto.replace('.', '').upper())
+    return TIPO_EN_REGISTRO.get(normalizado, texto)
+
+
+def a_monto(valor):
+    """
+    Convierte un monto del detalle a float
+    
+    Args:
+        valor (float or str): Número o texto "S/ 1,500.00"
+    
+    Returns:
+        float: Monto numérico
+    """
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    return convertir_monto(valor or '')
+
+
+def deudor_desde_resultado(fila):
+    """
+    Convierte una fila de resultados de APIRedam en DeudorAlimentario
+    
+    Args:
+        fila (dict): Datos de la fila (id, nombre_completo, documento, fecha)
+    
+    Returns:
+        DeudorAlimentario: Deudor sin expedientes
+    """
+    paterno, materno, nombres = separar_nombre(fila.get('nombre_completo', ''))
+    deudor = DeudorAlimentario(
+        paterno, materno, nombres,
+        tipo_en_registro(fila.get('tipo_documento', '')),
+        (fila.get('numero_documento') or '').strip(),
+        fila.get('fecha_registro', '')
+    )
+    deudor.id_remoto = fila.get('id') or None
+    return deudor
+
+
+def completar_con_detalle(deudor, detalle):
+    """
+    Agrega al deudor el expediente que viene en el detalle remoto
+    
+    El detalle trae los apellidos separados, más fiables que los obtenidos
+    al partir el nombre completo, así que también se actualizan.
+    
+    Args:
+        deudor (DeudorAlimentario): Deudor a completar
+        detalle (dict): Resultado de APIRedam.obtener_detalle_deudor
+    
+    Returns:
+        DeudorAlimentario: El mismo deudor
+    """
+    deudor.apellido_paterno = detalle.get('apellido_paterno') or deudor.apellido_paterno
+    deudor.apellido_materno = detalle.get('apellido_materno') or deudor.apellido_materno
+    deudor.nombres = detalle.get('nombres') or deudor.nombres
+    
+    expediente = Expediente(
+        detalle.get('numero_expediente', ''),
+        detalle.get('distrito_judicial', ''),
+        detalle.get('organo_jurisdiccional', ''),
+        detalle.get('secretario', ''),
+        a_monto(detalle.get('pension_mensual')),
+        a_monto(detalle.get('importe_adeudado')),
+        a_monto(detalle.get('interes'))
+    )
+    
+    paterno, materno, nombres = separar_nombre(detalle.get('demandante_nombre', ''))
+    expediente.demandante = Demandante(
+        paterno, materno, nombres, detalle.get('demandante_relacion', '')
+    )
+    
+    deudor.expedientes = [expediente]
+    return deudor
+
+
+def deudor_a_dict(deudor):
+    """
+    Serializa un deudor con sus expedientes
+    
+    Args:
+        deudor (DeudorAlimentario): Deudor a serializar
+    
+    Returns:
+        dict: Datos con el mismo formato que data/deudores_mock.json, más id_remoto
+    """
+    expedientes = []
+    for e in deudor.expedientes:
+        dem = e.demandante
+        expedientes.append({
+            'numero_expediente': e.numero_expediente,
+            'distrito_judicial': e.distrito_judicial,
+            'organo_jurisdiccional': e.organo_jurisdiccional,
+            'secretario': e.secretario,
+            'pension_mensual': e.pension_mensual,
+            'importe_adeudado': e.importe_adeudado,
+            'interes': e.interes,
+            'demandante': {
+                'apellido_paterno': dem.apellido_paterno,
+                'apellido_materno': dem.apellido_materno,
+                'nombres': dem.nombres,
+                'relacion': dem.relacion
+            } if dem is not None else None
+        })
+    
+    return {
+        'apellido_paterno': deudor.apellido_paterno,
+        'apellido_materno': deudor.apellido_materno,
+        'nombres': deudor.nombres,
+        'tipo_documento': deudor.tipo_documento,
+        'numero_documento': deudor.numero_documento,
+        'fecha_registro': deudor.fecha_registro,
+        'id_remoto': deudor.id_remoto,
+        'expedientes': expedientes
+    }
+
+
+def deudor_desde_dict(d):
+    """
+    Reconstruye un deudor serializado con deudor_a_dict
+    
+    Args:
+        d (dict): Datos del deudor
+    
+    Returns:
+        DeudorAlimentario: Deudor con sus expedientes
+    """
+    deudor = DeudorAlimentario(
+        d['apellido_paterno'],
+        d['apellido_materno'],
+        d['nombres'],
+        d['tipo_documento'],
+        d['numero_documento'],
+        d['fecha_registro']
+    )
+    deudor.id_remoto = d.get('id_remoto')
+    
+    for e in d.get('expedientes', []):
+        expediente = Expediente(
+            e['numero_expediente'],
+            e['distrito_judicial'],
+            e['organo_jurisdiccional'],
+            e['secretario'],
+            e['pension_mensual'],
+            e['importe_adeudado'],
+            e['interes']
+        )
+        dem = e.get('demandante')
+        if dem is not None:
+            expediente.demandante = Demandante(
+                dem['apellido_paterno'],
+                dem['apellido_materno'],
+                dem['nombres'],
+                dem['relacion']
+            )
+        deudor.expedientes.append(expediente)
+    
+    return deudor
@@ -0,0 +1,245 @@
+"""
+Exportación de resultados
+Responsabilidad: Escribir deudores a CSV, JSON Lines y formatos columnares
+(Parquet / Arrow IPC) consumiendo los resultados uno a uno, sin cargarlos
+todos en memoria
+"""
+
+import csv
+import json
+import os
+
+from services.conversion_redam import deudor_a_dict
+from utils.fechas import convertir_fecha
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow es opcional, solo para Parquet y Arrow
+    pa = None
+    pq = None
+
+
+FORMATO_CSV = 'csv'
+FORMATO_JSONL = 'jsonl'
+FORMATO_PARQUET = 'parquet'
+FORMATO_ARROW = 'arrow'
+
+EXTENSIONES = {
+    '.csv': FORMATO_CSV,
+    '.jsonl': FORMATO_JSONL,
+    '.ndjson': FORMATO_JSONL,
+    '.parquet': FORMATO_PARQUET,
+    '.arrow': FORMATO_ARROW,
+    '.feather': FORMATO_ARROW,
+}
+
+# Una fila por expediente (o una sola fila si el deudor no tiene)
+COLUMNAS = [
+    'apellido_paterno', 'apellido_materno', 'nombres',
+    'tipo_documento', 'numero_documento', 'fecha_registro', 'id_remoto',
+    'numero_expediente', 'distrito_judicial', 'organo_jurisdiccional', 'secretario',
+    'pension_mensual', 'importe_adeudado', 'interes', 'monto_total',
+    'demandante_apellido_paterno', 'demandante_apellido_materno',
+    'demandante_nombres', 'demandante_relacion',
+]
+COLUMNAS_MONTO = ('pension_mensual', 'importe_adeudado', 'interes', 'monto_total')
+
+# Filas por lote en los formatos columnares
+TAMANO_LOTE = 65536
+
+# Deudores entre dos avisos de progreso
+AVISO_PROGRESO = 1000
+
+
+def formato_de_ruta(ruta):
+    """
+    Deduce el formato de exportación por la extensión del archivo
+    
+    Args:
+        ruta (str): Ruta del archivo
+    
+    Returns:
+        str: FORMATO_CSV, FORMATO_JSONL, FORMATO_PARQUET o FORMATO_ARROW
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in EXTENSIONES:
+        raise Exception(f"Formato de exportación no soportado: '{extension}' "
+                        f"(use {', '.join(sorted(EXTENSIONES))})")
+    return EXTENSIONES[extension]
+
+
+def filas_de_deudor(deudor):
+    """
+    Aplana un deudor en filas de COLUMNAS
+    
+    Args:
+        deudor (DeudorAlimentario): Deudor con sus expedientes
+    
+    Returns:
+        list: Tuplas con los valores de COLUMNAS; los campos de expediente y
+            demandante quedan vacíos (None) si no los hay
+    """
+    datos = (deudor.apellido_paterno, deudor.apellido_materno, deudor.nombres,
+             deudor.tipo_documento, deudor.numero_documento, deudor.fecha_registro,
+             getattr(deudor, 'id_remoto', None))
+    
+    if not deudor.expedientes:
+        return [datos + (None,) * (len(COLUMNAS) - len(datos))]
+    
+    filas = []
+    for e in deudor.expedientes:
+        dem = e.demandante
+        filas.append(datos + (
+            e.numero_expediente, e.distrito_judicial, e.organo_jurisdiccional, e.secretario,
+            e.pension_mensual, e.importe_adeudado, e.interes, e.calcular_monto_total(),
+        ) + ((dem.apellido_paterno, dem.apellido_materno, dem.nombres, dem.relacion)
+             if dem is not None else (None,) * 4))
+    return filas
+
+
+def exportar(deudores, ruta, formato=None, progreso=None):
+    """
+    Exporta deudores a un archivo, consumiéndolos uno a uno
+    
+    Args:
+        deudores (iterable): DeudorAlimentario (lista o generador)
+        ruta (str): Archivo de destino
+        formato (str): Formato (por defecto se deduce de la extensión)
+        progreso (callable): Recibe los deudores leídos hasta ahora, cada
+            AVISO_PROGRESO (opcional)
+    
+    Returns:
+        int: Cantidad de deudores exportados
+    """
+    formato = formato or formato_de_ruta(ruta)
+    if progreso is not None:
+        deudores = _avisar_progreso(deudores, progreso)
+    if formato == FORMATO_CSV:
+        return exportar_csv(deudores, ruta)
+    if formato == FORMATO_JSONL:
+        return exportar_jsonl(deudores, ruta)
+    if formato in (FORMATO_PARQUET, FORMATO_ARROW):
+        return exportar_columnar(deudores, ruta, formato)
+    raise Exception(f"Formato de exportación no soportado: {formato}")
+
+
+def _avisar_progreso(deudores, progreso):
+    """Recorre los deudores llamando a progreso cada AVISO_PROGRESO"""
+    for total, deudor in enumerate(deudores, 1):
+        yield deudor
+        if total % AVISO_PROGRESO == 0:
+            progreso(total)
+
+
+def exportar_csv(deudores, ruta):
+    """
+    Exporta a CSV con una fila por expediente
+    
+    Se escribe con BOM UTF-8 para que Excel reconozca las tildes.
+    
+    Args:
+        deudores (iterable): DeudorAlimentario
+        ruta (str): Archivo de destino
+    
+    Returns:
+        int: Cantidad de deudores exportados
+    """
+    total = 0
+    with open(ruta, 'w', newline='', encoding='utf-8-sig') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(COLUMNAS)
+        for deudor in deudores:
+            escritor.writerows(filas_de_deudor(deudor))
+            total += 1
+    return total
+
+
+def exportar_jsonl(deudores, ruta):
+    """
+    Exporta a JSON Lines: un deudor por línea, con sus expedientes anidados
+    
+    Args:
+        deudores (iterable): DeudorAlimentario
+        ruta (str): Archivo de destino
+    
+    Returns:
+        int: Cantidad de deudores exportados
+    """
+    total = 0
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        for deudor in deudores:
+            archivo.write(json.dumps(deudor_a_dict(deudor), ensure_ascii=False))
+            archivo.write('\n')
+            total += 1
+    return total
+
+
+def exportar_columnar(deudores, ruta, formato=FORMATO_PARQUET):
+    """
+    Exporta a Parquet o Arrow IPC por lotes de TAMANO_LOTE filas
+    
+    La fecha de registro se guarda como fecha y los montos como números.
+    
+    Args:
+        deudores (iterable): DeudorAlimentario
+        ruta (str): Archivo de destino
+        formato (str): FORMATO_PARQUET o FORMATO_ARROW
+    
+    Returns:
+        int: Cantidad de deudores exportados
+    """
+    if pa is None:
+        raise Exception("La exportación a Parquet/Arrow requiere pyarrow (pip install pyarrow)")
+    
+    esquema = pa.schema([
+        (c, pa.float64() if c in COLUMNAS_MONTO
+         else pa.date32() if c == 'fecha_registro' else pa.string())
+        for c in COLUMNAS
+    ])
+    indice_fecha = COLUMNAS.index('fecha_registro')
+    fechas = {}  # las fechas se repiten: cada texto se convierte una vez
+    
+    if formato == FORMATO_PARQUET:
+        escritor = pq.ParquetWriter(ruta, esquema)
+    else:
+        escritor = pa.ipc.new_file(ruta, esquema)
+    
+    total = 0
+    try:
+        columnas = [[] for _ in COLUMNAS]
+        for deudor in deudores:
+            for fila in filas_de_deudor(deudor):
+                for columna, valor in zip(columnas, fila):
+                    columna.append(valor)
+            total += 1
+            
+            if len(columnas[0]) >= TAMANO_LOTE:
+                _escribir_lote(escritor, esquema, columnas, indice_fecha, fechas)
+                columnas = [[] for _ in COLUMNAS]
+        
+        if columnas[0]:
+            _escribir_lote(escritor, esquema, columnas, indice_fecha, fechas)
+    finally:
+        escritor.close()
+    
+    return total
+
+
+def _escribir_lote(escritor, esquema, columnas, indice_fecha, fechas):
+    """Convierte las columnas acumuladas en un lote y lo escribe"""
+    columnas[indice_fecha] = [
+        fechas[t] if t in fechas else fechas.setdefault(t, _a_fecha(t))
+        for t in columnas[indice_fecha]
+    ]
+    lote = pa.RecordBatch.from_arrays(
+        [pa.array(valores, type=campo.type) for valores, campo in zip(columnas, esquema)],
+        schema=esquema
+    )
+    escritor.write_batch(lote)
+
+
+def _a_fecha(texto):
+    """Fecha dd/mm/yyyy como date, o None si no se puede leer"""
+    fecha = convertir_fecha(texto)
+    return fecha.date() if fecha is not None else None
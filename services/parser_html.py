@@ -0,0 +1,495 @@
+"""
+Backends de parseo HTML para las respuestas del REDAM
+Responsabilidad: Convertir el HTML de resultados y detalle en diccionarios
+"""
+
+import io
+import re
+from bs4 import BeautifulSoup, SoupStrainer, Tag
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # lxml es opcional, se usa html.parser como respaldo
+    etree = None
+    lxml_html = None
+
+
+# Campos de texto del detalle: clave del diccionario -> fragmento del id HTML
+CAMPOS_DETALLE = [
+    ('apellido_paterno', 'apellidoPaterno'),
+    ('apellido_materno', 'apellidoMaterno'),
+    ('nombres', 'nombres'),
+    ('tipo_documento', 'tipoDocumento'),
+    ('numero_documento', 'numeroDocumento'),
+    ('distrito_judicial', 'distritoJudicial'),
+    ('organo_jurisdiccional', 'organoJurisdiccional'),
+    ('secretario', 'secretario'),
+    ('numero_expediente', 'numeroExpediente'),
+]
+
+# Campos de monto del detalle
+MONTOS_DETALLE = [
+    ('pension_mensual', 'pensionMensual'),
+    ('importe_adeudado', 'importeAdeudado'),
+    ('interes', 'interes'),
+]
+
+# Campos del demandante
+CAMPOS_DEMANDANTE = [
+    ('demandante_nombre', 'demandanteNombre'),
+    ('demandante_relacion', 'demandanteRelacion'),
+]
+
+IDS_DETALLE = [id_campo for _, id_campo in CAMPOS_DETALLE + MONTOS_DETALLE + CAMPOS_DEMANDANTE]
+
+PATRON_TABLA_RESULTADOS = re.compile(r'.*tablaResultados.*')
+PATRON_ID_DEUDOR = re.compile(r"'(\d+)'")
+PATRON_ID_TABLA = re.compile(r'<table[^>]*\sid="([^"]*tablaResultados[^"]*)"')
+PATRON_PAGINADOR_SIGUIENTE = re.compile(r'class="([^"]*ui-paginator-next[^"]*)"')
+PATRON_UPDATE_PARCIAL = re.compile(r'<update id="([^"]*)">\s*<!\[CDATA\[(.*?)\]\]>\s*</update>', re.S)
+PATRON_DECLARACION_XML = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def extraer_campos_por_id(elementos, obtener_texto, fragmentos=IDS_DETALLE):
+    """
+    Extrae en una sola pasada el texto de los elementos cuyos ids contienen
+    cada fragmento buscado
+    
+    Para cada fragmento se toma el primer elemento en orden de documento,
+    igual que soup.find(id=re.compile('.*fragmento.*')).
+    
+    Args:
+        elementos (iterable): Pares (id, elemento) en orden de documento
+        obtener_texto (callable): Convierte un elemento en texto
+        fragmentos (list): Fragmentos de id a buscar
+    
+    Returns:
+        dict: Fragmento de id -> texto extraído
+    """
+    pendientes = list(fragmentos)
+    campos = {}
+    
+    for id_elemento, elemento in elementos:
+        encontrados = [f for f in pendientes if f in id_elemento]
+        if not encontrados:
+            continue
+        
+        texto = obtener_texto(elemento)
+        for fragmento in encontrados:
+            campos[fragmento] = texto
+            pendientes.remove(fragmento)
+        
+        # Se corta el recorrido apenas se tienen todos los campos
+        if not pendientes:
+            break
+    
+    return campos
+
+
+def detectar_paginacion(html):
+    """
+    Detecta si la tabla de resultados tiene más páginas (paginador JSF)
+    
+    Args:
+        html (str): HTML de la respuesta
+    
+    Returns:
+        dict or None: {'tabla_id', 'siguiente'} o None si no hay paginador
+    """
+    tabla = PATRON_ID_TABLA.search(html)
+    siguiente = PATRON_PAGINADOR_SIGUIENTE.search(html)
+    
+    if not tabla or not siguiente:
+        return None
+    
+    return {
+        'tabla_id': tabla.group(1),
+        'siguiente': 'ui-state-disabled' not in siguiente.group(1)
+    }
+
+
+def convertir_respuesta_parcial(texto, tabla_id):
+    """
+    Convierte una partial-response AJAX de JSF en HTML con la tabla
+    
+    Al paginar, JSF solo devuelve las filas del tbody dentro de un CDATA.
+    Se envuelven en una tabla con header vacío para que los parsers las
+    traten igual que una página completa.
+    
+    Args:
+        texto (str): Cuerpo de la respuesta
+        tabla_id (str): ID de la tabla de resultados
+    
+    Returns:
+        str: HTML parseable (vacío si la respuesta no trae la tabla)
+    """
+    if '<partial-response' not in texto[:500]:
+        return texto
+    
+    for id_update, contenido in PATRON_UPDATE_PARCIAL.findall(texto):
+        if 'tablaResultados' not in id_update:
+            continue
+        if '<table' not in contenido:
+            contenido = f'<table id="{tabla_id}"><tr></tr>{contenido}</table>'
+        return contenido
+    
+    return ''
+
+
+def convertir_montos(textos):
+    """
+    Convierte en lote montos en texto a float
+    
+    Args:
+        textos (list): Montos con formato "S/ 1,500.00"
+    
+    Returns:
+        list: Montos numéricos (0.0 para los no válidos)
+    """
+    return [convertir_monto(texto) for texto in textos]
+
+
+def convertir_monto(texto):
+    """
+    Convierte un monto en texto a float
+    
+    Args:
+        texto (str): Monto con formato "S/ 1,500.00"
+    
+    Returns:
+        float: Monto numérico (0.0 si no es válido)
+    """
+    texto = texto.replace('S/', '').replace(',', '').strip()
+    try:
+        return float(texto)
+    except ValueError:
+        return 0.0
+
+
+def armar_detalle(campos):
+    """
+    Arma el diccionario de detalle a partir de los textos extraídos
+    
+    Args:
+        campos (dict): Fragmento de id -> texto extraído
+    
+    Returns:
+        dict: Diccionario con información detallada
+    """
+    detalle = {}
+    
+    for clave, id_campo in CAMPOS_DETALLE:
+        detalle[clave] = campos.get(id_campo, "")
+    
+    montos = convertir_montos([campos.get(id_campo, "") for _, id_campo in MONTOS_DETALLE])
+    for (clave, _), monto in zip(MONTOS_DETALLE, montos):
+        detalle[clave] = monto
+    
+    for clave, id_campo in CAMPOS_DEMANDANTE:
+        detalle[clave] = campos.get(id_campo, "")
+    
+    return detalle
+
+
+class ParserBeautifulSoup:
+    """
+    Backend basado en BeautifulSoup con el parser puro Python
+    """
+    
+    nombre = 'html.parser'
+    
+    def parsear_resultados(self, html):
+        """
+        Parsea el HTML de respuesta y extrae los deudores
+        
+        Args:
+            html (str): HTML de la respuesta
+        
+        Returns:
+            list: Lista de diccionarios con datos de deudores
+        """
+        return list(self.iterar_resultados(html))
+    
+    def iterar_resultados(self, html, restringido=False):
+        """
+        Itera los deudores de la tabla de resultados
+        
+        Las filas se entregan recién cuando el documento está parseado
+        entero: html.parser no permite ir entregándolas antes.
+        
+        Args:
+            html (str): HTML de la respuesta
+            restringido (bool): Si True, solo se conserva el árbol de la
+                tabla de resultados (SoupStrainer). El documento se tokeniza
+                igual completo, así que no adelanta la primera fila y, según
+                la página, puede resultar más lento (ver
+                benchmarks.bench_parser_html)
+        
+        Yields:
+            dict: Datos de cada deudor
+        """
+        filtro = {'id': PATRON_TABLA_RESULTADOS}
+        if restringido:
+            soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('table', filtro))
+        else:
+            soup = BeautifulSoup(html, 'html.parser')
+        
+        # Buscar tabla de resultados
+        tabla = soup.find('table', filtro)
+        
+        if not tabla:
+            # No hay resultados
+            return
+        
+        # Extraer filas (ignorar header)
+        filas = tabla.find_all('tr')[1:]  # Saltar header
+        
+        for fila in filas:
+            celdas = fila.find_all('td')
+            
+            if len(celdas) >= 4:
+                yield {
+                    'nombre_completo': celdas[0].get_text(strip=True),
+                    'tipo_documento': celdas[1].get_text(strip=True),
+                    'numero_documento': celdas[2].get_text(strip=True),
+                    'fecha_registro': celdas[3].get_text(strip=True),
+                    'id': self._extraer_id_deudor(fila)
+                }
+    
+    def parsear_detalle(self, html):
+        """
+        Parsea el HTML del detalle del deudor
+        
+        Args:
+            html (str): HTML de la respuesta
+        
+        Returns:
+            dict: Diccionario con información detallada
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+        
+        elementos = (
+            (nodo['id'], nodo) for nodo in soup.descendants
+            if isinstance(nodo, Tag) and nodo.get('id')
+        )
+        campos = extraer_campos_por_id(elementos, lambda e: e.get_text(strip=True))
+        
+        return armar_detalle(campos)
+    
+    def _extraer_id_deudor(self, fila):
+        """Extrae el ID del deudor desde el botón de detalle"""
+        boton = fila.find('button') or fila.find('a')
+        if boton:
+            onclick = boton.get('onclick', '')
+            match = PATRON_ID_DEUDOR.search(onclick)
+            if match:
+                return match.group(1)
+        return None
+
+
+class ParserLxml:
+    """
+    Backend basado en lxml (libxml2, implementado en C)
+    
+    Produce los mismos diccionarios que ParserBeautifulSoup sin construir
+    el árbol de objetos Python de BeautifulSoup.
+    """
+    
+    nombre = 'lxml'
+    
+    def parsear_resultados(self, html):
+        """
+        Parsea el HTML de respuesta y extrae los deudores
+        
+        Args:
+            html (str): HTML de la respuesta
+        
+        Returns:
+            list: Lista de diccionarios con datos de deudores
+        """
+        return list(self.iterar_resultados(html))
+    
+    def iterar_resultados(self, html, restringido=True):
+        """
+        Itera los deudores de la tabla de resultados
+        
+        Args:
+            html (str): HTML de la respuesta
+            restringido (bool): Si True (por defecto), se usa iterparse:
+                cada fila se entrega apenas se cierra su tr y luego se
+                libera, el resto del documento se descarta y la lectura
+                termina al cerrar la tabla de resultados
+        
+        Yields:
+            dict: Datos de cada deudor
+        """
+        if not html or not html.strip():
+            return
+        
+        if restringido:
+            yield from self._iterar_resultados_streaming(html)
+            return
+        
+        raiz = self._construir_arbol(html)
+        if raiz is None:
+            return
+        
+        tablas = raiz.xpath("//table[contains(@id, 'tablaResultados')]")
+        if not tablas:
+            return
+        
+        filas = tablas[0].iter('tr')
+        next(filas, None)  # Saltar header
+        
+        for fila in filas:
+            deudor = self._parsear_fila(fila)
+            if deudor is not None:
+                yield deudor
+    
+    def _iterar_resultados_streaming(self, html):
+        """Recorre el documento por eventos sin conservar el árbol"""
+        # Solo se generan eventos para table y tr, el resto lo resuelve libxml2
+        eventos = etree.iterparse(
+            io.BytesIO(html.encode('utf-8')),
+            events=('start', 'end'),
+            tag=('table', 'tr'),
+            html=True,
+            encoding='utf-8',
+            recover=True
+        )
+        
+        tabla = None
+        filas_vistas = 0
+        profundidad_tr = 0
+        
+        try:
+            for evento, elemento in eventos:
+                if tabla is None:
+                    if evento == 'start' and elemento.tag == 'table' \
+                            and 'tablaResultados' in (elemento.get('id') or ''):
+                        tabla = elemento
+                    elif evento == 'end':
+                        # Las tablas ajenas a los resultados no se conservan
+                        self._liberar(elemento)
+                    continue
+                
+                if elemento.tag == 'tr':
+                    if evento == 'start':
+                        profundidad_tr += 1
+                        continue
+                    
+                    profundidad_tr -= 1
+                    filas_vistas += 1
+                    if filas_vistas > 1:  # Saltar header
+                        deudor = self._parsear_fila(elemento)
+                        if deudor is not None:
+                            yield deudor
+                    if profundidad_tr == 0:
+                        self._liberar(elemento)
+                
+                elif evento == 'end' and elemento is tabla:
+                    # Solo interesa la primera tabla de resultados
+                    return
+        except etree.XMLSyntaxError:
+            return
+    
+    def _liberar(self, elemento):
+        """Libera un elemento ya procesado y sus hermanos anteriores"""
+        elemento.clear(keep_tail=True)
+        padre = elemento.getparent()
+        while padre is not None and elemento.getprevious() is not None:
+            del padre[0]
+    
+    def parsear_detalle(self, html):
+        """
+        Parsea el HTML del detalle del deudor
+        
+        Args:
+            html (str): HTML de la respuesta
+        
+        Returns:
+            dict: Diccionario con información detallada
+        """
+        raiz = self._construir_arbol(html)
+        campos = {}
+        
+        if raiz is not None:
+            elementos = ((e.get('id'), e) for e in raiz.iterfind('.//*[@id]'))
+            campos = extraer_campos_por_id(elementos, self._texto)
+        
+        return armar_detalle(campos)
+    
+    def _construir_arbol(self, html):
+        """Construye el árbol lxml (None si el documento está vacío)"""
+        if not html or not html.strip():
+            return None
+        
+        # lxml no acepta str con declaración de encoding (páginas XHTML de JSF)
+        html = PATRON_DECLARACION_XML.sub('', html, count=1)
+        try:
+            return lxml_html.document_fromstring(html)
+        except Exception:
+            return None
+    
+    def _parsear_fila(self, fila):
+        """Convierte una fila tr en diccionario (None si no tiene datos)"""
+        celdas = list(fila.iter('td'))
+        if len(celdas) < 4:
+            return None
+        
+        return {
+            'nombre_completo': self._texto(celdas[0]),
+            'tipo_documento': self._texto(celdas[1]),
+            'numero_documento': self._texto(celdas[2]),
+            'fecha_registro': self._texto(celdas[3]),
+            'id': self._extraer_id_deudor(fila)
+        }
+    
+    def _extraer_id_deudor(self, fila):
+        """Extrae el ID del deudor desde el botón de detalle"""
+        boton = next(fila.iter('button'), None)
+        if boton is None:
+            boton = next(fila.iter('a'), None)
+        if boton is not None:
+            match = PATRON_ID_DEUDOR.search(boton.get('onclick', ''))
+            if match:
+                return match.group(1)
+        return None
+    
+    def _texto(self, elemento):
+        """Equivalente a get_text(strip=True) de BeautifulSoup"""
+        partes = [elemento.text or '']
+        for hijo in elemento.iterdescendants():
+            if isinstance(hijo.tag, str):
+                partes.append(hijo.text or '')
+            partes.append(hijo.tail or '')
+        return ''.join(parte.strip() for parte in partes)
+
+
+PARSERS = {
+    ParserBeautifulSoup.nombre: ParserBeautifulSoup,
+    ParserLxml.nombre: ParserLxml,
+}
+
+
+def crear_parser(nombre=None):
+    """
+    Crea un backend de parseo
+    
+    Args:
+        nombre (str): 'lxml' o 'html.parser' (None = el más rápido disponible)
+    
+    Returns:
+        object: Instancia del backend
+    """
+    if nombre is None:
+        nombre = ParserLxml.nombre if lxml_html is not None else ParserBeautifulSoup.nombre
+    
+    if nombre not in PARSERS:
+        raise ValueError(f"Parser HTML no soportado: {nombre}")
+    
+    if nombre == ParserLxml.nombre and lxml_html is None:
+        raise ValueError("El parser 'lxml' requiere instalar lxml")
+    
+    return PARSERS[nombre]()
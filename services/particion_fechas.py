@@ -0,0 +1,121 @@
+"""
+Búsqueda por fechas dividida en sub-ventanas concurrentes
+Responsabilidad: Partir rangos amplios en semanas o meses, consultarlos en
+paralelo y unir los resultados sin duplicados
+"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+PARTICION_SEMANAL = 'semanal'
+PARTICION_MENSUAL = 'mensual'
+
+
+def dividir_rango_fechas(fecha_inicio, fecha_fin, particion=PARTICION_MENSUAL):
+    """
+    Divide un rango en sub-ventanas consecutivas sin solapamiento
+    
+    Las ventanas mensuales siguen el calendario (la primera y la última
+    pueden ser parciales); las semanales son de 7 días desde fecha_inicio.
+    
+    Args:
+        fecha_inicio (datetime): Fecha inicial (inclusive)
+        fecha_fin (datetime): Fecha final (inclusive)
+        particion (str): PARTICION_SEMANAL o PARTICION_MENSUAL
+    
+    Returns:
+        list: Tuplas (inicio, fin) de datetime, con días inclusivos
+    """
+    if particion not in (PARTICION_SEMANAL, PARTICION_MENSUAL):
+        raise ValueError(f"Partición no soportada: {particion}")
+    
+    inicio = datetime(fecha_inicio.year, fecha_inicio.month, fecha_inicio.day)
+    fin = datetime(fecha_fin.year, fecha_fin.month, fecha_fin.day)
+    ventanas = []
+    
+    while inicio <= fin:
+        if particion == PARTICION_SEMANAL:
+            siguiente = inicio + timedelta(days=7)
+        elif inicio.month == 12:
+            siguiente = datetime(inicio.year + 1, 1, 1)
+        else:
+            siguiente = datetime(inicio.year, inicio.month + 1, 1)
+        
+        ventanas.append((inicio, min(siguiente - timedelta(days=1), fin)))
+        inicio = siguiente
+    
+    return ventanas
+
+
+def clave_fila(deudor):
+    """
+    Identifica una fila de resultados para no repetirla entre ventanas
+    
+    Args:
+        deudor (dict): Fila de resultados de APIRedam
+    
+    Returns:
+        tuple: ('id', id), o ('documento', tipo, número) si no trae id, o
+            la fila completa si tampoco trae número de documento
+    """
+    if deudor.get('id'):
+        return ('id', deudor['id'])
+    if deudor.get('numero_documento'):
+        return ('documento', deudor.get('tipo_documento'), deudor['numero_documento'])
+    return ('fila',) + tuple(sorted(deudor.items()))
+
+
+def buscar_fechas_particionado(crear_cliente, fecha_inicio, fecha_fin, captcha,
+                               particion=PARTICION_MENSUAL, max_concurrencia=4):
+    """
+    Consulta cada sub-ventana en paralelo y entrega resultados al completarse
+    
+    Cada hilo usa su propio cliente (ViewState independiente, porque JSF
+    solo conserva la última consulta de cada vista) dentro de la sesión que
+    resolvió el captcha; todos comparten el planificador, así que el límite
+    de tasa se respeta.
+    
+    Args:
+        crear_cliente (callable): Crea un APIRedam auxiliar en la sesión del
+            captcha
+        fecha_inicio (datetime): Fecha inicial
+        fecha_fin (datetime): Fecha final
+        captcha (str): Respuesta al captcha de esa sesión
+        particion (str): PARTICION_SEMANAL o PARTICION_MENSUAL
+        max_concurrencia (int): Ventanas consultadas a la vez
+    
+    Yields:
+        dict: Datos de cada deudor, sin repetir filas (ver clave_fila)
+    """
+    ventanas = dividir_rango_fechas(fecha_inicio, fecha_fin, particion)
+    hilos = max(1, min(max_concurrencia, len(ventanas)))
+    
+    clientes = queue.Queue()
+    for _ in range(hilos):
+        clientes.put(crear_cliente())
+    
+    def consultar(ventana):
+        cliente = clientes.get()
+        try:
+            return list(cliente.buscar_por_fechas(ventana[0], ventana[1], captcha))
+        finally:
+            clientes.put(cliente)
+    
+    vistos = set()
+    futuros = []
+    executor = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix='ventana-fechas')
+    try:
+        futuros = [executor.submit(consultar, ventana) for ventana in ventanas]
+        for futuro in as_completed(futuros):
+            for deudor in futuro.result():
+                clave = clave_fila(deudor)
+                if clave in vistos:
+                    continue
+                vistos.add(clave)
+                yield deudor
+    finally:
+        # Si el consumidor se detiene antes, no se consultan más ventanas
+        for futuro in futuros:
+            futuro.cancel()
+        executor.shutdown(wait=False)
@@ -0,0 +1,263 @@
+"""
+Planificador de consultas compuestas
+Responsabilidad: Resolver en el registro local una consulta con varios
+criterios (nombre, documento, rango de fechas, distrito) leyendo primero el
+índice más selectivo y combinando los demás por intersección o filtro, según
+lo que se estime más barato
+"""
+
+from datetime import datetime
+
+from services.conversion_redam import tipo_en_registro
+from services.registro_local import RegistroLocal, filtrar_por_nombres
+from utils.fechas import convertir_fecha
+
+ACCION_INDICE = 'indice'
+ACCION_RECORRIDO = 'recorrido'
+ACCION_INTERSECCION = 'interseccion'
+ACCION_FILTRO = 'filtro'
+
+# Condición sin índice: apellido materno y nombres (solo filtran)
+CONDICION_NOMBRES = 'nombres'
+
+# Costo por candidato de comprobar cada condición sobre el deudor; una
+# intersección cuesta leer el otro índice más COSTO_SONDEO por candidato
+COSTO_FILTRO = {
+    RegistroLocal.INDICE_DOCUMENTO: 1,
+    RegistroLocal.INDICE_PATERNO: 3,
+    RegistroLocal.INDICE_FECHA: 2,
+    RegistroLocal.INDICE_DISTRITO: 2,
+    CONDICION_NOMBRES: 4,
+}
+COSTO_SONDEO = 1
+
+def _en_fechas(deudor, fecha_inicio, fecha_fin):
+    fecha = convertir_fecha(deudor.fecha_registro)
+    return fecha is not None and fecha_inicio <= fecha <= fecha_fin
+
+
+def _en_distrito(deudor, distrito):
+    distrito = distrito.strip().upper()
+    return any((e.distrito_judicial or '').strip().upper() == distrito
+               for e in deudor.expedientes)
+
+
+# Condición -> función(deudor, *valores) que indica si el deudor la cumple
+FILTROS = {
+    RegistroLocal.INDICE_DOCUMENTO: lambda d, tipo, numero: (
+        d.tipo_documento == tipo and d.numero_documento == numero),
+    RegistroLocal.INDICE_PATERNO: lambda d, apellido: apellido in d.apellido_paterno.upper(),
+    RegistroLocal.INDICE_FECHA: _en_fechas,
+    RegistroLocal.INDICE_DISTRITO: _en_distrito,
+    CONDICION_NOMBRES: lambda d, materno, nombres: bool(filtrar_por_nombres([d], materno, nombres)),
+}
+
+
+def condiciones_de_criterios(criterios):
+    """
+    Traduce los criterios de Consulta.ejecutar_consulta a condiciones
+    
+    Args:
+        criterios (dict): Criterios de una consulta (cualquier tipo)
+    
+    Returns:
+        list: Tuplas (condición, valores)
+    """
+    condiciones = []
+    if criterios.get('numero_documento'):
+        condiciones.append((RegistroLocal.INDICE_DOCUMENTO,
+                            (tipo_en_registro(criterios.get('tipo_documento', '')),
+                             criterios['numero_documento'])))
+    if criterios.get('apellido_paterno'):
+        condiciones.append((RegistroLocal.INDICE_PATERNO, (criterios['apellido_paterno'],)))
+    if criterios.get('fecha_inicial') and criterios.get('fecha_final'):
+        condiciones.append((RegistroLocal.INDICE_FECHA,
+                            (criterios['fecha_inicial'], criterios['fecha_final'])))
+    if criterios.get('distrito_judicial'):
+        condiciones.append((RegistroLocal.INDICE_DISTRITO, (criterios['distrito_judicial'],)))
+    if criterios.get('apellido_materno') or criterios.get('nombres'):
+        condiciones.append((CONDICION_NOMBRES, (criterios.get('apellido_materno', ''),
+                                                criterios.get('nombres', ''))))
+    return condiciones
+
+
+class PasoPlan:
+    """
+    Un paso del plan: leer un índice, recorrer todo, intersecar o filtrar
+    """
+    
+    def __init__(self, accion, condicion, valores, filas, costo):
+        """
+        Constructor
+        
+        Args:
+            accion (str): ACCION_INDICE, ACCION_RECORRIDO, ACCION_INTERSECCION o ACCION_FILTRO
+            condicion (str): Índice o condición que se aplica (None en un recorrido)
+            valores (tuple): Valores de la condición
+            filas (float): Candidatos estimados después del paso
+            costo (float): Costo estimado del paso
+        """
+        self.accion = accion
+        self.condicion = condicion
+        self.valores = valores
+        self.filas = filas
+        self.costo = costo
+        self.filas_reales = None  # se completa al ejecutar
+    
+    def descripcion(self):
+        """Texto del paso, por ejemplo "intersección con índice distrito LIMA\""""
+        if self.valores and all(isinstance(v, datetime) for v in self.valores):
+            valores = ' - '.join(f"{v:%d/%m/%Y}" for v in self.valores)
+        else:
+            valores = ' '.join(str(v) for v in self.valores if v)
+        if self.accion == ACCION_RECORRIDO:
+            return "recorrido completo del registro"
+        if self.accion == ACCION_INDICE:
+            return f"índice {self.condicion} {valores}"
+        if self.accion == ACCION_INTERSECCION:
+            return f"intersección con índice {self.condicion} {valores}"
+        return f"filtro {self.condicion} {valores}"
+
+
+class PlanConsulta:
+    """
+    Plan elegido para una consulta compuesta, con su costo estimado
+    """
+    
+    def __init__(self, pasos):
+        self.pasos = pasos
+    
+    @property
+    def costo(self):
+        """float: Costo estimado total"""
+        return sum(paso.costo for paso in self.pasos)
+    
+    def explicar(self):
+        """
+        Describe el plan, un paso por línea
+        
+        Returns:
+            str: Pasos con filas y costo estimados (y filas reales si ya se ejecutó)
+        """
+        lineas = [f"Plan de consulta (costo estimado {self.costo:.0f}):"]
+        for numero, paso in enumerate(self.pasos, 1):
+            reales = f", reales {paso.filas_reales}" if paso.filas_reales is not None else ""
+            lineas.append(f"  {numero}. {paso.descripcion()}: ~{paso.filas:.0f} filas{reales}, "
+                          f"costo {paso.costo:.0f}")
+        return '\n'.join(lineas)
+    
+    def __str__(self):
+        return self.explicar()
+
+
+class PlanificadorConsulta:
+    """
+    Elige y ejecuta planes de consulta compuesta sobre un RegistroLocal
+    
+    El primer paso lee el índice de menor costo. Cada condición restante
+    (de la más a la menos selectiva) se resuelve intersecando con su índice
+    o filtrando los candidatos, lo que se estime más barato: filtrar cuesta
+    COSTO_FILTRO por candidato; intersecar, leer el otro índice más
+    COSTO_SONDEO por candidato. Tras cada paso los candidatos se estiman
+    suponiendo condiciones independientes.
+    """
+    
+    def __init__(self, registro):
+        """
+        Constructor
+        
+        Args:
+            registro (RegistroLocal): Registro sobre el que se consulta
+        """
+        self.registro = registro
+    
+    def planificar(self, criterios):
+        """
+        Elige el plan para unos criterios
+        
+        Args:
+            criterios (dict): Criterios de Consulta.ejecutar_consulta
+        
+        Returns:
+            PlanConsulta: Plan elegido
+        """
+        total = len(self.registro)
+        condiciones = condiciones_de_criterios(criterios)
+        
+        indexadas = []
+        filtros = []
+        for condicion, valores in condiciones:
+            if condicion == CONDICION_NOMBRES:
+                filtros.append((condicion, valores))
+            else:
+                filas, costo = self.registro.estimar(condicion, *valores)
+                indexadas.append((condicion, valores, filas, costo))
+        
+        pasos = []
+        if indexadas:
+            indexadas.sort(key=lambda c: (c[3], c[2]))
+            condicion, valores, filas, costo = indexadas.pop(0)
+            pasos.append(PasoPlan(ACCION_INDICE, condicion, valores, filas, costo))
+        else:
+            filas = total
+            pasos.append(PasoPlan(ACCION_RECORRIDO, None, (), filas, total))
+        
+        # Las más selectivas primero, para que los pasos siguientes vean menos candidatos
+        for condicion, valores, filas_indice, costo_indice in sorted(indexadas, key=lambda c: c[2]):
+            selectividad = filas_indice / total if total else 0
+            costo_filtro = filas * COSTO_FILTRO[condicion]
+            costo_interseccion = costo_indice + filas * COSTO_SONDEO
+            filas *= selectividad
+            if costo_interseccion < costo_filtro:
+                pasos.append(PasoPlan(ACCION_INTERSECCION, condicion, valores,
+                                      filas, costo_interseccion))
+            else:
+                pasos.append(PasoPlan(ACCION_FILTRO, condicion, valores, filas, costo_filtro))
+        
+        # Sin estadísticas para estas condiciones: se estima que no descartan
+        for condicion, valores in filtros:
+            pasos.append(PasoPlan(ACCION_FILTRO, condicion, valores,
+                                  filas, filas * COSTO_FILTRO[condicion]))
+        
+        return PlanConsulta(pasos)
+    
+    def ejecutar(self, plan):
+        """
+        Ejecuta un plan y anota en cada paso las filas reales
+        
+        Args:
+            plan (PlanConsulta): Plan de planificar
+        
+        Returns:
+            list: DeudorAlimentario que cumplen todas las condiciones, en el
+                orden del primer índice leído
+        """
+        candidatos = {}
+        for paso in plan.pasos:
+            if paso.accion == ACCION_RECORRIDO:
+                candidatos = {(d.tipo_documento, d.numero_documento): d for d in self.registro}
+            elif paso.accion == ACCION_INDICE:
+                candidatos = self.registro.candidatos(paso.condicion, *paso.valores)
+            elif paso.accion == ACCION_INTERSECCION:
+                otros = self.registro.candidatos(paso.condicion, *paso.valores)
+                candidatos = {clave: d for clave, d in candidatos.items() if clave in otros}
+            else:
+                cumple = FILTROS[paso.condicion]
+                candidatos = {clave: d for clave, d in candidatos.items()
+                              if cumple(d, *paso.valores)}
+            paso.filas_reales = len(candidatos)
+        
+        return list(candidatos.values())
+    
+    def consultar(self, criterios):
+        """
+        Planifica y ejecuta
+        
+        Args:
+            criterios (dict): Criterios de Consulta.ejecutar_consulta
+        
+        Returns:
+            tuple: (lista de DeudorAlimentario, PlanConsulta ejecutado)
+        """
+        plan = self.planificar(criterios)
+        return self.ejecutar(plan), plan
@@ -0,0 +1,211 @@
+"""
+Planificador de solicitudes salientes al REDAM
+Responsabilidad: Limitar la tasa de peticiones (token bucket) y dar
+preferencia a las consultas interactivas sobre las de lote
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+# Menor valor = mayor prioridad
+PRIORIDAD_INTERACTIVA = 0
+PRIORIDAD_LOTE = 1
+
+NOMBRES_PRIORIDAD = {
+    PRIORIDAD_INTERACTIVA: 'interactiva',
+    PRIORIDAD_LOTE: 'lote',
+}
+
+
+class MetricasPrioridad:
+    """
+    Acumula latencias de las solicitudes de una prioridad
+    """
+    
+    MUESTRAS = 1000  # latencias recientes para percentiles
+    
+    def __init__(self):
+        self.solicitudes = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+        self.latencia_total = 0.0
+        self.latencia_max = 0.0
+        self._recientes = deque(maxlen=self.MUESTRAS)
+    
+    def registrar(self, espera, latencia):
+        """
+        Registra una solicitud completada
+        
+        Args:
+            espera (float): Segundos en cola esperando turno
+            latencia (float): Segundos totales (espera + ejecución)
+        """
+        self.solicitudes += 1
+        self.espera_total += espera
+        self.espera_max = max(self.espera_max, espera)
+        self.latencia_total += latencia
+        self.latencia_max = max(self.latencia_max, latencia)
+        self._recientes.append(latencia)
+    
+    def resumen(self):
+        """
+        Retorna el resumen de métricas
+        
+        Returns:
+            dict: Conteo, esperas y latencias (en segundos)
+        """
+        if not self.solicitudes:
+            return {'solicitudes': 0}
+        
+        recientes = sorted(self._recientes)
+        return {
+            'solicitudes': self.solicitudes,
+            'espera_promedio': self.espera_total / self.solicitudes,
+            'espera_max': self.espera_max,
+            'latencia_promedio': self.latencia_total / self.solicitudes,
+            'latencia_p95': recientes[min(len(recientes) - 1, int(len(recientes) * 0.95))],
+            'latencia_max': self.latencia_max
+        }
+
+
+class PlanificadorSolicitudes:
+    """
+    Token bucket con cola de prioridad
+    
+    Cada solicitud consume un token. Los tokens se reponen a `tasa` por
+    segundo hasta un máximo de `rafaga`. Cuando no hay tokens, las
+    solicitudes esperan y se atienden por prioridad y luego por orden
+    de llegada.
+    """
+    
+    TASA_DEFECTO = 2.0   # solicitudes por segundo
+    RAFAGA_DEFECTO = 5
+    
+    _compartido = None
+    _lock_compartido = threading.Lock()
+    
+    def __init__(self, tasa=TASA_DEFECTO, rafaga=RAFAGA_DEFECTO):
+        """
+        Constructor
+        
+        Args:
+            tasa (float): Tokens repuestos por segundo
+            rafaga (int): Capacidad máxima del bucket
+        """
+        if tasa <= 0 or rafaga < 1:
+            raise ValueError("La tasa debe ser positiva y la ráfaga al menos 1")
+        
+        self.tasa = tasa
+        self.rafaga = rafaga
+        self._tokens = float(rafaga)
+        self._ultima_reposicion = time.monotonic()
+        
+        self._condicion = threading.Condition()
+        self._cola = []  # heap de (prioridad, secuencia)
+        self._secuencia = itertools.count()
+        self._metricas = {}
+    
+    @classmethod
+    def compartido(cls):
+        """
+        Retorna el planificador único del proceso
+        
+        Returns:
+            PlanificadorSolicitudes: Instancia compartida
+        """
+        with cls._lock_compartido:
+            if cls._compartido is None:
+                cls._compartido = cls()
+            return cls._compartido
+    
+    def configurar(self, tasa=None, rafaga=None):
+        """
+        Cambia el límite de tasa en caliente
+        
+        Args:
+            tasa (float): Nuevos tokens por segundo
+            rafaga (int): Nueva capacidad del bucket
+        """
+        with self._condicion:
+            self._reponer()
+            if tasa is not None:
+                self.tasa = tasa
+            if rafaga is not None:
+                self.rafaga = rafaga
+                self._tokens = min(self._tokens, rafaga)
+            self._condicion.notify_all()
+    
+    def ejecutar(self, funcion, *args, prioridad=PRIORIDAD_INTERACTIVA, **kwargs):
+        """
+        Espera turno y ejecuta la función en el hilo que llama
+        
+        Args:
+            funcion (callable): Solicitud a ejecutar
+            prioridad (int): PRIORIDAD_INTERACTIVA o PRIORIDAD_LOTE
+            *args, **kwargs: Argumentos de la función
+        
+        Returns:
+            object: Resultado de la función
+        """
+        inicio = time.monotonic()
+        self._adquirir(prioridad)
+        espera = time.monotonic() - inicio
+        
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            latencia = time.monotonic() - inicio
+            with self._condicion:
+                metricas = self._metricas.setdefault(prioridad, MetricasPrioridad())
+                metricas.registrar(espera, latencia)
+    
+    def _adquirir(self, prioridad):
+        """Bloquea hasta que la solicitud esté primera en la cola y haya token"""
+        turno = (prioridad, next(self._secuencia))
+        
+        with self._condicion:
+            heapq.heappush(self._cola, turno)
+            try:
+                while True:
+                    self._reponer()
+                    if self._cola[0] == turno and self._tokens >= 1:
+                        heapq.heappop(self._cola)
+                        self._tokens -= 1
+                        # El siguiente en la cola puede tener token disponible
+                        self._condicion.notify_all()
+                        return
+                    
+                    faltante = max(0.0, 1 - self._tokens)
+                    self._condicion.wait(timeout=max(faltante / self.tasa, 0.001))
+            except BaseException:
+                # Si el hilo se interrumpe, no bloquear a los demás
+                if turno in self._cola:
+                    self._cola.remove(turno)
+                    heapq.heapify(self._cola)
+                    self._condicion.notify_all()
+                raise
+    
+    def _reponer(self):
+        """Repone tokens según el tiempo transcurrido"""
+        ahora = time.monotonic()
+        transcurrido = ahora - self._ultima_reposicion
+        self._ultima_reposicion = ahora
+        self._tokens = min(self.rafaga, self._tokens + transcurrido * self.tasa)
+    
+    def obtener_metricas(self):
+        """
+        Retorna métricas por prioridad
+        
+        Returns:
+            dict: Nombre de prioridad -> resumen de latencias, y en cola
+        """
+        with self._condicion:
+            metricas = {
+                NOMBRES_PRIORIDAD.get(prioridad, str(prioridad)): m.resumen()
+                for prioridad, m in self._metricas.items()
+            }
+            metricas['en_cola'] = len(self._cola)
+            return metricas
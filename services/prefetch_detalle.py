@@ -0,0 +1,118 @@
+"""
+Precarga en segundo plano de detalles de deudores
+Responsabilidad: Descargar los detalles de los primeros resultados antes de
+que el usuario los solicite
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class PrefetchDetalle:
+    """
+    Descarga detalles en segundo plano con concurrencia acotada
+    
+    Cada nueva búsqueda abre una nueva generación: las descargas pendientes
+    de la búsqueda anterior se cancelan y las que ya estaban en curso se
+    descartan al terminar.
+    """
+    
+    def __init__(self, descargar, max_ids=10, max_concurrencia=3):
+        """
+        Constructor
+        
+        Args:
+            descargar (callable): Función id_deudor -> dict de detalle
+            max_ids (int): Cuántos resultados precargar por búsqueda
+            max_concurrencia (int): Descargas simultáneas como máximo
+        """
+        self.descargar = descargar
+        self.max_ids = max_ids
+        self.max_concurrencia = max_concurrencia
+        
+        self._executor = None
+        self._lock = threading.Lock()
+        self._generacion = 0
+        self._futuros = {}  # id_deudor -> Future
+        self.precargados = 0
+        self.cancelados = 0
+    
+    def programar(self, ids):
+        """
+        Cancela la precarga anterior y programa la de los primeros ids
+        
+        Args:
+            ids (iterable): IDs de deudor en el orden de los resultados
+        """
+        self.cancelar()
+        
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrencia,
+                    thread_name_prefix='prefetch-detalle'
+                )
+            
+            generacion = self._generacion
+            for id_deudor in ids:
+                if len(self._futuros) >= self.max_ids:
+                    break
+                if id_deudor is None or id_deudor in self._futuros:
+                    continue
+                self._futuros[id_deudor] = self._executor.submit(
+                    self._descargar, id_deudor, generacion
+                )
+    
+    def cancelar(self):
+        """Cancela la precarga en curso (por ejemplo, al iniciar otra búsqueda)"""
+        with self._lock:
+            self._generacion += 1
+            for futuro in self._futuros.values():
+                if futuro.cancel():
+                    self.cancelados += 1
+            self._futuros = {}
+    
+    def obtener(self, id_deudor, timeout=None):
+        """
+        Retorna el detalle precargado o en descarga
+        
+        Args:
+            id_deudor (str): ID del deudor
+            timeout (float): Segundos máximos de espera si aún se descarga
+        
+        Returns:
+            dict or None: Detalle, None si no fue precargado o falló
+        """
+        with self._lock:
+            futuro = self._futuros.get(id_deudor)
+        
+        if futuro is None or futuro.cancelled():
+            return None
+        
+        # Si aún no empezó, es mejor descargarlo directamente con prioridad
+        # interactiva que esperar su turno en la cola de lote
+        if futuro.cancel():
+            return None
+        
+        try:
+            return futuro.result(timeout=timeout)
+        except Exception:
+            return None
+    
+    def _descargar(self, id_deudor, generacion):
+        """Descarga un detalle si su búsqueda sigue vigente"""
+        if generacion != self._generacion:
+            return None
+        
+        detalle = self.descargar(id_deudor)
+        with self._lock:
+            self.precargados += 1
+        return detalle
+    
+    def cerrar(self):
+        """Cancela lo pendiente y libera los hilos"""
+        self.cancelar()
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
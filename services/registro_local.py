@@ -0,0 +1,459 @@
+"""
+Registro local indexado de deudores
+Responsabilidad: Responder búsquedas sin recorrer toda la lista y recordar
+qué datos y consultas siguen vigentes frente al REDAM
+"""
+
+import bisect
+import math
+import threading
+import time
+
+from utils.fechas import convertir_fecha
+
+
+def filtrar_por_nombres(deudores, apellido_materno="", nombres=""):
+    """
+    Deja los deudores cuyo apellido materno y nombres contienen los textos
+    
+    Args:
+        deudores (list): Lista de DeudorAlimentario
+        apellido_materno (str): Texto en mayúsculas (vacío: no filtra)
+        nombres (str): Texto en mayúsculas (vacío: no filtra)
+    
+    Returns:
+        list: Deudores que cumplen, en el mismo orden
+    """
+    if apellido_materno:
+        deudores = [d for d in deudores if apellido_materno in d.apellido_materno.upper()]
+    if nombres:
+        deudores = [d for d in deudores if nombres in d.nombres.upper()]
+    return deudores
+
+
+def _distritos(deudor):
+    """Distritos judiciales (en mayúsculas) de los expedientes de un deudor"""
+    return frozenset(e.distrito_judicial.strip().upper()
+                     for e in deudor.expedientes if e.distrito_judicial)
+
+
+class RegistroLocal:
+    """
+    Deudores en memoria con índices por documento, apellido, fecha y distrito
+    
+    Cada deudor y cada consulta remota guardan cuándo se actualizaron; pasado
+    `ttl` segundos se consideran vencidos y el controlador vuelve a consultar
+    el REDAM.
+    """
+    
+    TTL_DEFECTO = 24 * 3600  # segundos
+    
+    # Índices (estimar / candidatos, los usa el planificador de consultas)
+    INDICE_DOCUMENTO = 'documento'
+    INDICE_PATERNO = 'paterno'
+    INDICE_FECHA = 'fecha'
+    INDICE_DISTRITO = 'distrito'
+    
+    def __init__(self, deudores=(), ttl=TTL_DEFECTO):
+        """
+        Constructor
+        
+        Args:
+            deudores (iterable): DeudorAlimentario iniciales
+            ttl (float): Segundos de vigencia de datos y consultas
+        """
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._deudores = {}      # (tipo, numero) -> DeudorAlimentario
+        self._actualizado = {}   # (tipo, numero) -> time.time()
+        self._por_paterno = {}   # APELLIDO PATERNO -> {clave: DeudorAlimentario}
+        self._por_fecha = []     # lista ordenada de (datetime, clave)
+        self._por_distrito = {}  # DISTRITO JUDICIAL -> {clave: DeudorAlimentario}
+        self._consultas = {}     # clave de consulta -> (time.time(), claves de los resultados)
+        self._indexado = {}      # (tipo, numero) -> (apellido, fecha, distritos) en los índices
+        self._cobertura = None   # (inicio, fin, time.time()) replicado por sincronización
+        self.version = 0         # aumenta con cada cambio de deudores
+        
+        self.agregar_lote(deudores)
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._deudores)
+    
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._deudores.values()))
+    
+    @staticmethod
+    def _clave(deudor):
+        """Clave única de un deudor: tipo y número de documento"""
+        return (deudor.tipo_documento, deudor.numero_documento)
+    
+    @staticmethod
+    def _fecha(deudor):
+        """Fecha de registro como datetime, o None si no se puede leer"""
+        return convertir_fecha(deudor.fecha_registro)
+    
+    def agregar(self, deudor, actualizado=None):
+        """
+        Inserta o actualiza un deudor (upsert por documento)
+        
+        Si ya existía y el nuevo no trae expedientes, se conservan los
+        expedientes que ya se tenían.
+        
+        Args:
+            deudor (DeudorAlimentario): Deudor a guardar
+            actualizado (float): time.time() de los datos (por defecto ahora)
+        
+        Returns:
+            DeudorAlimentario: El deudor guardado
+        """
+        with self._lock:
+            fecha = self._guardar(deudor, actualizado)
+            if fecha is not None:
+                bisect.insort(self._por_fecha, (fecha, self._clave(deudor)))
+        
+        return deudor
+    
+    def agregar_lote(self, deudores):
+        """
+        Inserta o actualiza muchos deudores a la vez (carga inicial, réplica)
+        
+        Igual que llamar a agregar por cada uno, pero el índice de fechas se
+        ordena una sola vez al final en lugar de insertar en orden fila por
+        fila, que con cientos de miles de deudores es cuadrático.
+        
+        Args:
+            deudores (iterable): DeudorAlimentario, o pares
+                (DeudorAlimentario, actualizado)
+        
+        Returns:
+            int: Cantidad de deudores procesados
+        """
+        cantidad = 0
+        
+        with self._lock:
+            tocadas = set()
+            for elemento in deudores:
+                if isinstance(elemento, tuple):
+                    deudor, actualizado = elemento
+                else:
+                    deudor, actualizado = elemento, None
+                self._guardar(deudor, actualizado)
+                tocadas.add(self._clave(deudor))
+                cantidad += 1
+            
+            # Las claves tocadas ya no están en _por_fecha (_guardar las quitó)
+            for clave in tocadas:
+                fecha = self._indexado[clave][1]
+                if fecha is not None:
+                    self._por_fecha.append((fecha, clave))
+            if tocadas:
+                self._por_fecha.sort()
+        
+        return cantidad
+    
+    def _guardar(self, deudor, actualizado):
+        """
+        Guarda un deudor en todos los índices salvo el de fechas (con el
+        lock tomado)
+        
+        Returns:
+            datetime: Fecha de registro a indexar (None si no se puede leer)
+        """
+        clave = self._clave(deudor)
+        
+        anterior = self._deudores.get(clave)
+        if anterior is not None:
+            self._quitar_de_indices(clave)
+            if not deudor.expedientes:
+                deudor.expedientes = anterior.expedientes
+            if getattr(deudor, 'id_remoto', None) is None:
+                deudor.id_remoto = getattr(anterior, 'id_remoto', None)
+        
+        self._deudores[clave] = deudor
+        self._actualizado[clave] = time.time() if actualizado is None else actualizado
+        
+        apellido = deudor.apellido_paterno.upper()
+        self._por_paterno.setdefault(apellido, {})[clave] = deudor
+        
+        fecha = self._fecha(deudor)
+        
+        distritos = _distritos(deudor)
+        for distrito in distritos:
+            self._por_distrito.setdefault(distrito, {})[clave] = deudor
+        self._indexado[clave] = (apellido, fecha, distritos)
+        self.version += 1
+        
+        return fecha
+    
+    def _quitar_de_indices(self, clave):
+        """Elimina las entradas de índice con que se guardó un deudor"""
+        apellido, fecha, distritos = self._indexado.pop(clave)
+        for indice, valor in [(self._por_paterno, apellido)] + [
+                (self._por_distrito, distrito) for distrito in distritos]:
+            grupo = indice.get(valor)
+            if grupo is not None:
+                grupo.pop(clave, None)
+                if not grupo:
+                    del indice[valor]
+        
+        if fecha is not None:
+            posicion = bisect.bisect_left(self._por_fecha, (fecha, clave))
+            if posicion < len(self._por_fecha) and self._por_fecha[posicion] == (fecha, clave):
+                del self._por_fecha[posicion]
+    
+    def buscar_por_documento(self, tipo_documento, numero_documento):
+        """
+        Busca un deudor por documento (acceso directo por índice)
+        
+        Args:
+            tipo_documento (str): Tipo de documento
+            numero_documento (str): Número de documento
+        
+        Returns:
+            DeudorAlimentario: Deudor o None
+        """
+        with self._lock:
+            return self._deudores.get((tipo_documento, numero_documento))
+    
+    def buscar_por_nombres(self, apellido_paterno, apellido_materno="", nombres=""):
+        """
+        Busca deudores cuyos nombres contienen los textos dados
+        
+        Mantiene la búsqueda por subcadena, pero el apellido paterno se
+        compara una vez por apellido distinto y no una vez por deudor.
+        
+        Args:
+            apellido_paterno (str): Apellido paterno (en mayúsculas)
+            apellido_materno (str): Apellido materno (opcional)
+            nombres (str): Nombres (opcional)
+        
+        Returns:
+            list: Lista de DeudorAlimentario
+        """
+        grupos = self.agrupar_por_paterno(apellido_paterno, apellido_materno, nombres)
+        return [deudor for deudores in grupos.values() for deudor in deudores]
+    
+    def agrupar_por_paterno(self, apellido_paterno, apellido_materno="", nombres=""):
+        """
+        Igual que buscar_por_nombres, pero agrupando por apellido paterno
+        
+        Args:
+            apellido_paterno (str): Apellido paterno (en mayúsculas)
+            apellido_materno (str): Apellido materno (opcional)
+            nombres (str): Nombres (opcional)
+        
+        Returns:
+            dict: APELLIDO PATERNO -> lista no vacía de DeudorAlimentario
+        """
+        grupos = {}
+        
+        with self._lock:
+            for apellido, grupo in self._por_paterno.items():
+                if apellido_paterno not in apellido:
+                    continue
+                
+                deudores = filtrar_por_nombres(list(grupo.values()), apellido_materno, nombres)
+                if deudores:
+                    grupos[apellido] = deudores
+        
+        return grupos
+    
+    def buscar_por_fechas(self, fecha_inicio, fecha_fin):
+        """
+        Busca deudores con fecha de registro dentro del rango
+        
+        Args:
+            fecha_inicio (datetime): Fecha inicial
+            fecha_fin (datetime): Fecha final
+        
+        Returns:
+            list: Lista de DeudorAlimentario ordenada por fecha
+        """
+        with self._lock:
+            desde, hasta = self._rango_fechas(fecha_inicio, fecha_fin)
+            return [self._deudores[clave] for _, clave in self._por_fecha[desde:hasta]]
+    
+    def _rango_fechas(self, fecha_inicio, fecha_fin):
+        """Posiciones [desde, hasta) de _por_fecha dentro del rango de fechas"""
+        desde = bisect.bisect_left(self._por_fecha, (fecha_inicio,))
+        # La clave (chr(0x10FFFF),) es mayor que cualquier (tipo, número)
+        hasta = bisect.bisect_right(self._por_fecha, (fecha_fin, (chr(0x10FFFF),)), desde)
+        return desde, hasta
+    
+    def buscar_por_distrito(self, distrito_judicial):
+        """
+        Busca deudores con algún expediente en el distrito judicial
+        
+        Args:
+            distrito_judicial (str): Nombre exacto del distrito
+        
+        Returns:
+            list: Lista de DeudorAlimentario
+        """
+        return list(self.candidatos(self.INDICE_DISTRITO, distrito_judicial).values())
+    
+    def estimar(self, indice, *valores):
+        """
+        Estima lo que cuesta leer un índice y cuántos deudores entrega
+        
+        Los conteos son exactos (salen de la estructura del índice sin
+        recorrer los deudores); el costo cuenta las comparaciones necesarias
+        para ubicarlos más una por deudor entregado.
+        
+        Args:
+            indice (str): INDICE_DOCUMENTO, INDICE_PATERNO, INDICE_FECHA o INDICE_DISTRITO
+            *valores: (tipo, número), (apellido,), (inicio, fin) o (distrito,)
+        
+        Returns:
+            tuple: (deudores, costo)
+        """
+        with self._lock:
+            if indice == self.INDICE_DOCUMENTO:
+                return (1 if tuple(valores) in self._deudores else 0), 1
+            
+            if indice == self.INDICE_PATERNO:
+                apellido_paterno = valores[0]
+                filas = sum(len(grupo) for apellido, grupo in self._por_paterno.items()
+                            if apellido_paterno in apellido)
+                return filas, len(self._por_paterno) + filas
+            
+            if indice == self.INDICE_FECHA:
+                desde, hasta = self._rango_fechas(*valores)
+                filas = max(0, hasta - desde)
+                return filas, 2 * math.log2(len(self._por_fecha) + 1) + filas
+            
+            if indice == self.INDICE_DISTRITO:
+                filas = len(self._por_distrito.get(valores[0].strip().upper(), ()))
+                return filas, 1 + filas
+        
+        raise Exception(f"Índice desconocido: {indice}")
+    
+    def candidatos(self, indice, *valores):
+        """
+        Lee un índice
+        
+        Args:
+            indice (str): INDICE_DOCUMENTO, INDICE_PATERNO, INDICE_FECHA o INDICE_DISTRITO
+            *valores: Los mismos que en estimar
+        
+        Returns:
+            dict: (tipo, número) -> DeudorAlimentario, en el orden del índice
+        """
+        with self._lock:
+            if indice == self.INDICE_DOCUMENTO:
+                deudor = self._deudores.get(tuple(valores))
+                return {tuple(valores): deudor} if deudor is not None else {}
+            
+            if indice == self.INDICE_PATERNO:
+                apellido_paterno = valores[0]
+                resultado = {}
+                for apellido, grupo in self._por_paterno.items():
+                    if apellido_paterno in apellido:
+                        resultado.update(grupo)
+                return resultado
+            
+            if indice == self.INDICE_FECHA:
+                desde, hasta = self._rango_fechas(*valores)
+                deudores = self._deudores
+                return {clave: deudores[clave] for _, clave in self._por_fecha[desde:hasta]}
+            
+            if indice == self.INDICE_DISTRITO:
+                return dict(self._por_distrito.get(valores[0].strip().upper(), {}))
+        
+        raise Exception(f"Índice desconocido: {indice}")
+    
+    def vigente(self, deudor):
+        """
+        Indica si los datos del deudor no han vencido
+        
+        Args:
+            deudor (DeudorAlimentario): Deudor del registro
+        
+        Returns:
+            bool: True si se actualizó hace menos de ttl segundos
+        """
+        with self._lock:
+            actualizado = self._actualizado.get(self._clave(deudor))
+        return actualizado is not None and time.time() - actualizado < self.ttl
+    
+    def registrar_consulta(self, clave_consulta, deudores=()):
+        """
+        Recuerda que una consulta se respondió desde el REDAM y con qué deudores
+        
+        Args:
+            clave_consulta (tuple): Criterios normalizados
+            deudores (iterable): DeudorAlimentario que devolvió el REDAM
+        """
+        claves = tuple(self._clave(deudor) for deudor in deudores)
+        with self._lock:
+            self._consultas[clave_consulta] = (time.time(), claves)
+    
+    def consulta_vigente(self, clave_consulta):
+        """
+        Indica si la consulta se respondió desde el REDAM hace menos de ttl
+        
+        Args:
+            clave_consulta (tuple): Criterios normalizados
+        
+        Returns:
+            bool: True si el resultado local está completo y vigente
+        """
+        return self.resultados_consulta(clave_consulta) is not None
+    
+    def resultados_consulta(self, clave_consulta):
+        """
+        Deudores con que el REDAM respondió una consulta que sigue vigente
+        
+        Se devuelven los mismos deudores de esa respuesta y no los que
+        encuentren los índices locales: el nombre completo del REDAM se
+        separa en apellidos por espacios ("DE LA CRUZ" queda partido), así
+        que los índices no siempre vuelven a encontrar lo que el REDAM devolvió.
+        
+        Args:
+            clave_consulta (tuple): Criterios normalizados
+        
+        Returns:
+            list: DeudorAlimentario en el orden del REDAM, o None si la
+                consulta no se hizo o ya venció
+        """
+        with self._lock:
+            consulta = self._consultas.get(clave_consulta)
+            if consulta is None or time.time() - consulta[0] >= self.ttl:
+                return None
+            return [self._deudores[clave] for clave in consulta[1] if clave in self._deudores]
+    
+    def registrar_cobertura(self, fecha_inicio, fecha_fin, sincronizado=None):
+        """
+        Recuerda el rango de fechas que está replicado completo
+        
+        Args:
+            fecha_inicio (datetime): Primer día replicado
+            fecha_fin (datetime): Último día replicado
+            sincronizado (float): time.time() de la sincronización (por defecto ahora)
+        """
+        with self._lock:
+            self._cobertura = (fecha_inicio, fecha_fin,
+                               time.time() if sincronizado is None else sincronizado)
+    
+    def fechas_cubiertas(self, fecha_inicio, fecha_fin):
+        """
+        Indica si el rango está dentro de la réplica y esta sigue vigente
+        
+        Args:
+            fecha_inicio (datetime): Fecha inicial
+            fecha_fin (datetime): Fecha final
+        
+        Returns:
+            bool: True si la búsqueda por fechas puede responderse localmente
+        """
+        with self._lock:
+            cobertura = self._cobertura
+        if cobertura is None:
+            return False
+        
+        desde, hasta, sincronizado = cobertura
+        # La cobertura es por días: fecha_fin puede traer hora
+        return (desde <= fecha_inicio and fecha_fin.date() <= hasta.date()
+                and time.time() - sincronizado < self.ttl)
@@ -0,0 +1,255 @@
+"""
+Sincronización incremental de la réplica local del REDAM
+Responsabilidad: Recorrer el registro remoto por ventanas de fechas, guardar
+los deudores con su detalle y recordar hasta dónde se llegó
+
+Uso:
+    python -m services.sincronizacion
+    python -m services.sincronizacion --base-url http://127.0.0.1:8765/redam --captcha X
+
+Sin --captcha, se guarda el captcha de cada ventana en captcha_sincronizacion.png
+y se pide la respuesta por consola.
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from services.almacen_registro import AlmacenRegistro
+from services.conversion_redam import deudor_desde_resultado, completar_con_detalle
+from services.particion_fechas import dividir_rango_fechas, PARTICION_MENSUAL, PARTICION_SEMANAL
+from services.planificador import PRIORIDAD_LOTE
+
+# Puntos de control en el almacén
+CLAVE_INICIO = 'sincronizado_desde'
+CLAVE_HASTA = 'sincronizado_hasta'
+CLAVE_EJECUCION = 'ultima_sincronizacion'
+
+FORMATO_FECHA = '%d/%m/%Y'
+
+ARCHIVO_CAPTCHA = 'captcha_sincronizacion.png'
+
+
+class SincronizadorRegistro:
+    """
+    Copia el registro remoto al almacén local, ventana por ventana
+    
+    Tras cada ventana se guardan sus deudores y el punto de control en la
+    misma transacción. Una ejecución interrumpida se retoma en la ventana
+    que quedó a medias, y las siguientes solo piden lo posterior al último
+    punto de control (el último día se vuelve a pedir, porque pudo
+    sincronizarse antes de terminar).
+    """
+    
+    # El REDAM existe desde la Ley 28970 (2007)
+    FECHA_INICIO_DEFECTO = datetime(2007, 1, 1)
+    
+    def __init__(self, api, almacen, registro=None, particion=PARTICION_MENSUAL,
+                 fecha_inicio=FECHA_INICIO_DEFECTO, descargar_detalles=True):
+        """
+        Constructor
+        
+        Args:
+            api (APIRedam): Cliente del REDAM
+            almacen (AlmacenRegistro): Réplica local donde se guarda
+            registro (RegistroLocal): Registro en memoria a mantener al día
+                (opcional)
+            particion (str): PARTICION_SEMANAL o PARTICION_MENSUAL
+            fecha_inicio (datetime): Inicio de la primera sincronización
+            descargar_detalles (bool): Si True, también se descarga el
+                expediente de cada deudor
+        """
+        self.api = api
+        self.almacen = almacen
+        self.registro = registro
+        self.particion = particion
+        self.fecha_inicio = fecha_inicio
+        self.descargar_detalles = descargar_detalles
+    
+    def inicio_pendiente(self):
+        """
+        Fecha desde la que falta sincronizar
+        
+        Returns:
+            datetime: Último día sincronizado, o fecha_inicio si nunca se hizo
+        """
+        hasta = self.almacen.obtener_punto_control(CLAVE_HASTA)
+        if hasta is None:
+            return self.fecha_inicio
+        return datetime.strptime(hasta, FORMATO_FECHA)
+    
+    def sincronizar(self, captcha='', hasta=None, detener=None, progreso=None,
+                    resolver_captcha=None):
+        """
+        Descarga las ventanas pendientes hasta la fecha indicada
+        
+        Un error en una ventana detiene la sincronización; lo ya guardado
+        se conserva y la próxima ejecución empieza por esa ventana.
+        
+        El captcha del REDAM sirve para una búsqueda: con resolver_captcha,
+        antes de cada ventana se descarga uno nuevo de la sesión y se pide
+        su respuesta.
+        
+        Args:
+            captcha (str): Código captcha fijo (servidor simulado, o si
+                no se indica resolver_captcha)
+            hasta (datetime): Último día a sincronizar (por defecto hoy)
+            detener (threading.Event): Si se activa, se para al terminar la
+                ventana en curso (opcional)
+            progreso (callable): Se llama con (inicio, fin, deudores) al
+                guardar cada ventana (opcional)
+            resolver_captcha (callable): Recibe la imagen del captcha (bytes)
+                y retorna su respuesta (opcional)
+        
+        Returns:
+            dict: Ventanas, deudores y detalles descargados, y si terminó
+        """
+        hasta = hasta or datetime.now()
+        desde = self.inicio_pendiente()
+        ventanas = dividir_rango_fechas(desde, hasta, self.particion)
+        
+        if self.almacen.obtener_punto_control(CLAVE_INICIO) is None:
+            self.almacen.guardar_punto_control(CLAVE_INICIO, desde.strftime(FORMATO_FECHA))
+        
+        resumen = {'ventanas': 0, 'deudores': 0, 'detalles': 0, 'completa': False}
+        
+        with self.api.con_prioridad(PRIORIDAD_LOTE):
+            for inicio, fin in ventanas:
+                if detener is not None and detener.is_set():
+                    break
+                
+                if resolver_captcha is not None:
+                    captcha = self._resolver_captcha(resolver_captcha)
+                deudores, detalles = self._descargar_ventana(inicio, fin, captcha)
+                self.almacen.guardar_lote(deudores, puntos_control={
+                    CLAVE_HASTA: fin.strftime(FORMATO_FECHA),
+                    CLAVE_EJECUCION: time.time()
+                })
+                
+                if self.registro is not None:
+                    for deudor in deudores:
+                        self.registro.agregar(deudor)
+                
+                resumen['ventanas'] += 1
+                resumen['deudores'] += len(deudores)
+                resumen['detalles'] += detalles
+                if progreso is not None:
+                    progreso(inicio, fin, len(deudores))
+            else:
+                resumen['completa'] = True
+        
+        if self.registro is not None:
+            self.registrar_cobertura(self.registro)
+        return resumen
+    
+    def _resolver_captcha(self, resolver_captcha):
+        """Descarga un captcha de la sesión del cliente y obtiene su respuesta"""
+        imagen = self.api.obtener_captcha_imagen()
+        if not imagen:
+            raise Exception("No se pudo obtener el captcha del REDAM")
+        return resolver_captcha(imagen)
+    
+    def _descargar_ventana(self, inicio, fin, captcha):
+        """
+        Busca los deudores de una ventana y, si corresponde, su detalle
+        
+        La ventana se consulta por semanas en paralelo
+        (buscar_por_fechas_particionado) y el listado se recorre completo
+        antes de pedir detalles.
+        
+        Args:
+            inicio (datetime): Primer día de la ventana
+            fin (datetime): Último día de la ventana
+            captcha (str): Código captcha
+        
+        Returns:
+            tuple: (lista de DeudorAlimentario, detalles descargados)
+        """
+        filas = list(self.api.buscar_por_fechas_particionado(
+            inicio, fin, captcha, particion=PARTICION_SEMANAL))
+        deudores = []
+        detalles = 0
+        
+        for fila in filas:
+            deudor = deudor_desde_resultado(fila)
+            if self.descargar_detalles and deudor.id_remoto:
+                detalle = self.api.obtener_detalle_deudor(deudor.id_remoto)
+                if detalle:
+                    completar_con_detalle(deudor, detalle)
+                    detalles += 1
+            deudores.append(deudor)
+        
+        return deudores, detalles
+    
+    def registrar_cobertura(self, registro):
+        """
+        Indica al registro en memoria qué rango de fechas está replicado
+        
+        Args:
+            registro (RegistroLocal): Registro a actualizar
+        """
+        desde = self.almacen.obtener_punto_control(CLAVE_INICIO)
+        hasta = self.almacen.obtener_punto_control(CLAVE_HASTA)
+        ejecucion = self.almacen.obtener_punto_control(CLAVE_EJECUCION)
+        if desde is None or hasta is None or ejecucion is None:
+            return
+        
+        registro.registrar_cobertura(
+            datetime.strptime(desde, FORMATO_FECHA),
+            datetime.strptime(hasta, FORMATO_FECHA),
+            float(ejecucion)
+        )
+
+
+def main():
+    """Ejecuta una sincronización desde la línea de comandos"""
+    from services.api_redam import APIRedam
+    
+    argumentos = argparse.ArgumentParser(description='Sincroniza la réplica local del REDAM')
+    argumentos.add_argument('--captcha', default='',
+                            help='Código captcha fijo (por defecto se pide uno por ventana)')
+    argumentos.add_argument('--hasta', help='Último día a sincronizar (dd/mm/aaaa, por defecto hoy)')
+    argumentos.add_argument('--desde', help='Inicio si aún no hay punto de control (dd/mm/aaaa)')
+    argumentos.add_argument('--particion', choices=(PARTICION_MENSUAL, PARTICION_SEMANAL),
+                            default=PARTICION_MENSUAL)
+    argumentos.add_argument('--sin-detalles', action='store_true',
+                            help='No descargar el expediente de cada deudor')
+    argumentos.add_argument('--base-url', help='URL base alternativa (servidor simulado)')
+    argumentos.add_argument('--ruta', help='Archivo SQLite de la réplica')
+    opciones = argumentos.parse_args()
+    
+    almacen = AlmacenRegistro(opciones.ruta)
+    sincronizador = SincronizadorRegistro(
+        APIRedam(base_url=opciones.base_url),
+        almacen,
+        particion=opciones.particion,
+        fecha_inicio=(datetime.strptime(opciones.desde, FORMATO_FECHA)
+                      if opciones.desde else SincronizadorRegistro.FECHA_INICIO_DEFECTO),
+        descargar_detalles=not opciones.sin_detalles
+    )
+    hasta = datetime.strptime(opciones.hasta, FORMATO_FECHA) if opciones.hasta else None
+    
+    def progreso(inicio, fin, cantidad):
+        print(f"{inicio:%d/%m/%Y} - {fin:%d/%m/%Y}: {cantidad} deudores")
+    
+    def pedir_captcha(imagen):
+        with open(ARCHIVO_CAPTCHA, 'wb') as archivo:
+            archivo.write(imagen)
+        return input(f"Código del captcha ({ARCHIVO_CAPTCHA}): ").strip()
+    
+    print(f"Sincronizando desde {sincronizador.inicio_pendiente():%d/%m/%Y}")
+    try:
+        resumen = sincronizador.sincronizar(
+            opciones.captcha, hasta, progreso=progreso,
+            resolver_captcha=None if opciones.captcha else pedir_captcha
+        )
+        print(f"Sincronización terminada: {resumen}")
+    except Exception as e:
+        print(f"Sincronización interrumpida (se retomará desde el último punto de control): {e}")
+    finally:
+        print(f"Réplica local: {len(almacen)} deudores")
+        almacen.cerrar()
+
+
+if __name__ == '__main__':
+    main()
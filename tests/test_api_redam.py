@@ -0,0 +1,112 @@
+"""
+Pruebas de APIRedam contra el servidor simulado de benchmarks
+"""
+
+import itertools
+from datetime import datetime
+
+import pytest
+import requests
+
+from benchmarks.servidor_simulado import EstadoSimulado, ServidorSimulado
+from services.api_redam import APIRedam
+from services.planificador import PlanificadorSolicitudes
+
+INICIO = datetime(2010, 1, 1)
+FIN = datetime(2010, 6, 30)
+
+
+@pytest.fixture
+def servidor():
+    servidor = ServidorSimulado(('127.0.0.1', 0), EstadoSimulado(filas=3000, filas_por_pagina=20))
+    servidor.iniciar_en_hilo()
+    yield servidor
+    servidor.shutdown()
+    servidor.server_close()
+
+
+def crear_api(servidor):
+    return APIRedam(base_url=servidor.base_url, usar_cache=False,
+                    planificador=PlanificadorSolicitudes(tasa=10000, rafaga=10000))
+
+
+def ids(resultados):
+    return [deudor['id'] for deudor in resultados]
+
+
+def respuesta(texto, metodo='POST', metodo_original=None):
+    """Respuesta armada a mano; con metodo_original, llegó tras una redirección"""
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = 'utf-8'
+    response._content = texto.encode('utf-8')
+    response.request = requests.Request(metodo, 'http://redam.test/consultaDeudor.xhtml').prepare()
+    if metodo_original is not None:
+        redireccion = requests.Response()
+        redireccion.status_code = 302
+        redireccion.request = requests.Request(metodo_original,
+                                               'http://redam.test/consultaDeudor.xhtml').prepare()
+        response.history = [redireccion]
+    return response
+
+
+PAGINA = '<form><input name="javax.faces.ViewState" value="1:2"/></form>'
+
+
+@pytest.mark.parametrize('response, expirado', [
+    (respuesta(PAGINA), False),
+    (respuesta('<html>javax.faces.application.ViewExpiredException</html>'), True),
+    (respuesta('<p>Su sesión ha expirado</p>'), True),
+    (respuesta(PAGINA, metodo='GET', metodo_original='POST'), True),
+    (respuesta('<html>Inicio</html>', metodo_original='POST'), True),
+    (respuesta(PAGINA, metodo_original='POST'), False),
+])
+def test_view_state_expirado(response, expirado):
+    assert APIRedam(usar_cache=False)._view_state_expirado(response) is expirado
+
+
+def test_busquedas_simultaneas_no_se_pisan_la_paginacion(servidor):
+    api = crear_api(servidor)
+    esperado_fechas = ids(api.buscar_por_fechas(INICIO, FIN, 'ABCD'))
+    esperado_dni = ids(api.buscar_por_dni('DNI', '10000042', 'ABCD'))
+    
+    fechas = api.buscar_por_fechas(INICIO, FIN, 'ABCD')
+    nombres = api.buscar_por_nombres('GARCIA', '', '', 'ABCD')
+    dni = api.buscar_por_dni('DNI', '10000042', 'ABCD')
+    obtenidas_fechas, obtenidas_nombres = [], []
+    for de_fechas, de_nombres in itertools.zip_longest(fechas, nombres):
+        if de_fechas is not None:
+            obtenidas_fechas.append(de_fechas['id'])
+        if de_nombres is not None:
+            obtenidas_nombres.append(de_nombres['id'])
+    
+    assert len(esperado_fechas) > 20  # más de una página
+    assert obtenidas_fechas == esperado_fechas
+    assert len(obtenidas_nombres) == 3000
+    assert ids(dni) == esperado_dni
+
+
+def test_paginacion_sigue_tras_renovar_el_view_state(servidor):
+    api = crear_api(servidor)
+    esperado = ids(api.buscar_por_fechas(INICIO, FIN, 'ABCD'))
+    
+    obtenidos = []
+    for deudor in api.buscar_por_fechas(INICIO, FIN, 'ABCD'):
+        obtenidos.append(deudor['id'])
+        if len(obtenidos) == 30:  # a mitad de la segunda página
+            servidor.estado.expirar_todos()
+    
+    assert len(esperado) > 40
+    assert obtenidos == esperado
+    assert api.obtener_estado_sesion()['refrescos'] == 1
+
+
+def test_paginacion_se_detiene_si_el_servidor_repite_la_pagina(servidor, monkeypatch):
+    api = crear_api(servidor)
+    obtener_pagina = APIRedam._obtener_pagina
+    monkeypatch.setattr(APIRedam, '_obtener_pagina',
+                        lambda self, tabla_id, primera_fila, filas: obtener_pagina(
+                            self, tabla_id, 20, filas))
+    
+    # La segunda página se entrega; la tercera repite la segunda
+    assert len(ids(api.buscar_por_fechas(INICIO, FIN, 'ABCD'))) == 40
@@ -0,0 +1,79 @@
+"""
+Pruebas de la caché en disco de detalles: vencimiento y límite LRU
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from services import cache_detalle
+from services.cache_detalle import CacheDetalle
+
+
+@pytest.fixture
+def reloj(monkeypatch):
+    """Reloj manual para la caché: reloj.ahora son los segundos actuales"""
+    reloj = SimpleNamespace(ahora=1000.0)
+    monkeypatch.setattr(cache_detalle, 'time', SimpleNamespace(time=lambda: reloj.ahora))
+    return reloj
+
+
+def crear_cache(tmp_path, **opciones):
+    return CacheDetalle(str(tmp_path / 'cache.db'), **opciones)
+
+
+def test_detalle_vence_tras_el_ttl(tmp_path, reloj):
+    cache = crear_cache(tmp_path, ttl=60)
+    cache.guardar('1', {'numero_expediente': 'EXP-1'})
+    
+    reloj.ahora += 59
+    assert cache.obtener('1') == {'numero_expediente': 'EXP-1'}
+    
+    reloj.ahora += 2
+    assert cache.obtener('1') is None
+    assert len(cache) == 0
+    assert cache.obtener_estadisticas() == {'entradas': 0, 'aciertos': 1, 'fallos': 1}
+
+
+def test_purgar_vencidos(tmp_path, reloj):
+    cache = crear_cache(tmp_path, ttl=60)
+    cache.guardar('viejo', {})
+    reloj.ahora += 50
+    cache.guardar('nuevo', {})
+    reloj.ahora += 20
+    
+    assert cache.purgar_vencidos() == 1
+    assert cache.obtener('nuevo') == {}
+
+
+def test_al_superar_el_limite_se_elimina_el_menos_usado(tmp_path, reloj):
+    cache = crear_cache(tmp_path, max_entradas=2)
+    cache.guardar('a', {'id': 'a'})
+    reloj.ahora += 1
+    cache.guardar('b', {'id': 'b'})
+    reloj.ahora += 1
+    assert cache.obtener('a') == {'id': 'a'}  # acceso aún sin escribir en disco
+    reloj.ahora += 1
+    
+    cache.guardar('c', {'id': 'c'})
+    
+    assert cache.obtener('b') is None
+    assert cache.obtener('a') == {'id': 'a'}
+    assert cache.obtener('c') == {'id': 'c'}
+
+
+def test_los_accesos_pendientes_se_guardan_al_cerrar(tmp_path, reloj):
+    cache = crear_cache(tmp_path, max_entradas=2)
+    cache.guardar('a', {})
+    reloj.ahora += 1
+    cache.guardar('b', {})
+    reloj.ahora += 1
+    cache.obtener('a')
+    cache.cerrar()
+    
+    reloj.ahora += 1
+    cache = crear_cache(tmp_path, max_entradas=2)
+    cache.guardar('c', {})
+    
+    assert cache.obtener('b') is None
+    assert cache.obtener('a') == {}
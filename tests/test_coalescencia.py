@@ -0,0 +1,79 @@
+"""
+Pruebas de la coalescencia de búsquedas idénticas
+"""
+
+import threading
+import time
+
+import pytest
+
+from services.coalescencia import CoalescedorSolicitudes, ResultadosCompartidos
+
+
+def test_lector_atrasado_no_espera_la_pagina_en_curso():
+    pagina_pedida = threading.Event()
+    liberar = threading.Event()
+    
+    def paginas():
+        yield 1
+        yield 2
+        pagina_pedida.set()
+        liberar.wait(5)  # la siguiente página tarda
+        yield 3
+    
+    compartidos = ResultadosCompartidos(paginas())
+    adelantado = iter(compartidos)
+    assert [next(adelantado), next(adelantado)] == [1, 2]
+    
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(next(adelantado)))
+    hilo.start()
+    assert pagina_pedida.wait(5)
+    
+    # Mientras el otro consumidor espera la página 3, lo ya obtenido se lee sin bloquear
+    atrasado = iter(compartidos)
+    assert [next(atrasado), next(atrasado)] == [1, 2]
+    assert hilo.is_alive()
+    
+    liberar.set()
+    hilo.join(5)
+    assert resultado == [3]
+    assert list(atrasado) == [3]
+
+
+def test_el_error_llega_a_todos_los_consumidores():
+    def paginas():
+        yield 1
+        raise ValueError("sin conexión")
+    
+    compartidos = ResultadosCompartidos(paginas())
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            list(compartidos)
+
+
+def test_busquedas_identicas_comparten_una_ejecucion():
+    coalescedor = CoalescedorSolicitudes()
+    liberar = threading.Event()
+    ejecuciones = []
+    
+    def buscar():
+        ejecuciones.append(1)
+        liberar.wait(5)
+        yield from range(3)
+    
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(
+        list(coalescedor.iterar('clave', buscar)))) for _ in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    limite = time.monotonic() + 5
+    while coalescedor.obtener_estadisticas()['ahorradas'] < 2 and time.monotonic() < limite:
+        time.sleep(0.01)
+    liberar.set()
+    for hilo in hilos:
+        hilo.join(5)
+    
+    assert resultados == [[0, 1, 2]] * 3
+    assert len(ejecuciones) == 1
+    assert coalescedor.obtener_estadisticas()['en_curso'] == 0
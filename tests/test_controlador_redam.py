@@ -0,0 +1,118 @@
+"""
+Pruebas del modo híbrido del controlador: registro local primero y REDAM
+cuando el registro no alcanza
+"""
+
+from datetime import datetime
+
+from controllers.controlador_redam import ControladorREDAM
+from models.deudor_alimentario import DeudorAlimentario
+
+
+class APIFalsa:
+    """Devuelve siempre las mismas filas y cuenta las consultas"""
+    
+    def __init__(self, filas):
+        self.filas = filas
+        self.consultas = 0
+        self.particionadas = 0
+    
+    def _buscar(self, *criterios):
+        self.consultas += 1
+        return iter([dict(fila) for fila in self.filas])
+    
+    buscar_por_nombres = _buscar
+    buscar_por_dni = _buscar
+    buscar_por_fechas = _buscar
+    
+    def buscar_por_fechas_particionado(self, *criterios):
+        self.particionadas += 1
+        return self._buscar(*criterios)
+
+
+def crear_controlador(tmp_path, filas, **opciones):
+    api = APIFalsa(filas)
+    controlador = ControladorREDAM(usar_api_real=True, api=api,
+                                   ruta_registro=str(tmp_path / 'registro.db'), **opciones)
+    return controlador, api
+
+
+def test_repetir_busqueda_por_apellido_compuesto(tmp_path):
+    fila = {'id': '7', 'nombre_completo': 'DE LA CRUZ QUISPE ROSA', 'tipo_documento': 'DNI',
+            'numero_documento': '40000007', 'fecha_registro': '01/02/2024'}
+    controlador, api = crear_controlador(tmp_path, [fila])
+    
+    primera = controlador.buscar_por_nombres('DE LA CRUZ', captcha='ABCD')
+    repetida = controlador.buscar_por_nombres('de la cruz ')
+    
+    assert [d.numero_documento for d in primera] == ['40000007']
+    assert [d.numero_documento for d in repetida] == ['40000007']
+    assert api.consultas == 1
+
+
+def test_repetir_busqueda_por_documento_con_tipo_del_redam(tmp_path):
+    fila = {'id': '8', 'nombre_completo': 'RAMOS TITO ANA', 'tipo_documento': 'D.N.I.',
+            'numero_documento': '40000008', 'fecha_registro': '01/02/2024'}
+    controlador, api = crear_controlador(tmp_path, [fila])
+    
+    primera = controlador.buscar_por_dni('DNI', '40000008', captcha='ABCD')
+    repetida = controlador.buscar_por_dni('DNI', '40000008')
+    
+    assert [d.tipo_documento for d in primera] == ['DNI']
+    assert [d.numero_documento for d in repetida] == ['40000008']
+    assert api.consultas == 1
+    assert controlador.registro.buscar_por_documento('DNI', '40000008') is not None
+
+
+def test_busqueda_por_fechas_remota_es_particionada(tmp_path):
+    fila = {'id': '11', 'nombre_completo': 'PAZ SOTO LUIS', 'tipo_documento': 'DNI',
+            'numero_documento': '40000011', 'fecha_registro': '10/01/2015'}
+    controlador, api = crear_controlador(tmp_path, [fila])
+    
+    deudores = controlador.buscar_por_fechas(datetime(2015, 1, 1), datetime(2015, 3, 31))
+    
+    assert [d.numero_documento for d in deudores] == ['40000011']
+    assert api.particionadas == 1
+
+
+def test_consulta_vencida_vuelve_al_redam(tmp_path):
+    fila = {'id': '9', 'nombre_completo': 'DE LA CRUZ QUISPE ROSA', 'tipo_documento': 'DNI',
+            'numero_documento': '40000009', 'fecha_registro': '01/02/2024'}
+    controlador, api = crear_controlador(tmp_path, [fila], ttl_registro=0)
+    
+    controlador.buscar_por_nombres('DE LA CRUZ')
+    controlador.buscar_por_nombres('DE LA CRUZ')
+    
+    assert api.consultas == 2
+
+
+def test_respuesta_local_suficiente(tmp_path):
+    controlador, _ = crear_controlador(tmp_path, [])
+    deudor = controlador.registro.agregar(
+        DeudorAlimentario('PAZ', 'SOTO', 'LUIS', 'DNI', '40000010', '01/02/2024'))
+    
+    assert not controlador._respuesta_local_suficiente([])
+    assert controlador._respuesta_local_suficiente([deudor])
+    
+    controlador.registro.agregar(deudor, actualizado=0)
+    assert not controlador._respuesta_local_suficiente([deudor])
+    
+    controlador.usar_api = False
+    assert controlador._respuesta_local_suficiente([])
+
+
+def test_exportar_busqueda_avisa_el_progreso(tmp_path, monkeypatch):
+    monkeypatch.setattr('services.exportacion.AVISO_PROGRESO', 2)
+    filas = [{'id': str(i), 'nombre_completo': f'QUISPE MAMANI ANA {i}', 'tipo_documento': 'DNI',
+              'numero_documento': f'4100000{i}', 'fecha_registro': '01/02/2024'}
+             for i in range(5)]
+    controlador, api = crear_controlador(tmp_path, filas)
+    avisos = []
+    
+    total = controlador.exportar_busqueda(str(tmp_path / 'resultados.csv'),
+                                          ControladorREDAM.BUSQUEDA_NOMBRES, 'QUISPE', '', 'ANA',
+                                          captcha='ABCD', progreso=avisos.append)
+    
+    assert total == 5
+    assert avisos == [2, 4]
+    assert (tmp_path / 'resultados.csv').read_text(encoding='utf-8-sig').count('\n') == 6
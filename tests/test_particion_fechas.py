@@ -0,0 +1,52 @@
+"""
+Pruebas de la búsqueda por fechas particionada
+"""
+
+from datetime import datetime
+
+from services.particion_fechas import (buscar_fechas_particionado, dividir_rango_fechas,
+                                       PARTICION_SEMANAL)
+
+
+class ClienteFalso:
+    """Responde cada ventana con las filas de filas_por_mes[mes]"""
+    
+    def __init__(self, filas_por_mes):
+        self.filas_por_mes = filas_por_mes
+    
+    def buscar_por_fechas(self, inicio, fin, captcha):
+        return iter(self.filas_por_mes.get(inicio.month, []))
+
+
+def buscar(filas_por_mes):
+    return list(buscar_fechas_particionado(
+        lambda: ClienteFalso(filas_por_mes), datetime(2024, 1, 1), datetime(2024, 3, 31), 'ABCD'))
+
+
+def test_ventanas_mensuales_y_semanales():
+    assert dividir_rango_fechas(datetime(2024, 1, 15), datetime(2024, 3, 3, 23, 59)) == [
+        (datetime(2024, 1, 15), datetime(2024, 1, 31)),
+        (datetime(2024, 2, 1), datetime(2024, 2, 29)),
+        (datetime(2024, 3, 1), datetime(2024, 3, 3)),
+    ]
+    semanas = dividir_rango_fechas(datetime(2024, 1, 1), datetime(2024, 1, 10), PARTICION_SEMANAL)
+    assert semanas == [(datetime(2024, 1, 1), datetime(2024, 1, 7)),
+                       (datetime(2024, 1, 8), datetime(2024, 1, 10))]
+
+
+def test_no_repite_deudores_entre_ventanas():
+    fila = {'id': '1', 'numero_documento': '40000001', 'nombre_completo': 'PAZ SOTO LUIS'}
+    sin_id = {'id': '', 'tipo_documento': 'DNI', 'numero_documento': '40000002'}
+    
+    resultados = buscar({1: [fila, sin_id], 2: [dict(fila), dict(sin_id)]})
+    
+    assert resultados == [fila, sin_id]
+
+
+def test_filas_sin_id_ni_documento_no_se_descartan():
+    filas = [{'id': '', 'numero_documento': '', 'nombre_completo': nombre}
+             for nombre in ('PAZ SOTO LUIS', 'RAMOS TITO ANA')]
+    
+    resultados = buscar({1: filas, 3: [dict(filas[0])]})
+    
+    assert sorted(f['nombre_completo'] for f in resultados) == ['PAZ SOTO LUIS', 'RAMOS TITO ANA']
@@ -3,5 +3,8 @@ Paquete de utilidades
 """
 
 from .validaciones import Validaciones
+from .validacion_masiva import ValidacionMasiva, ResultadoValidacion
+from .fechas import convertir_fecha, FORMATO_FECHA
 
-__all__ = ['Validaciones']
+__all__ = ['Validaciones', 'ValidacionMasiva', 'ResultadoValidacion',
+           'convertir_fecha', 'FORMATO_FECHA']
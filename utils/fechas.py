@@ -0,0 +1,68 @@
+"""
+Conversión rápida de fechas dd/mm/yyyy
+Responsabilidad: Convertir las fechas de registro y de los formularios sin
+pasar por datetime.strptime, recordando las ya convertidas
+"""
+
+import functools
+from datetime import datetime
+
+FORMATO_FECHA = '%d/%m/%Y'
+
+# Fechas distintas que se recuerdan (cubre unos 180 años día por día)
+TAMANO_MEMO_FECHAS = 65536
+
+
+def _convertir(texto):
+    """
+    Convierte dd/mm/yyyy a datetime, con el mismo resultado que strptime
+    
+    El caso común (dos dígitos, barra, dos dígitos, barra, cuatro dígitos)
+    se lee por posiciones; cualquier otro texto (por ejemplo "1/3/2024")
+    se deja a strptime.
+    
+    Args:
+        texto (str): Fecha en formato dd/mm/yyyy
+    
+    Returns:
+        datetime or None: Fecha, o None si el texto no es una fecha válida
+    """
+    if not isinstance(texto, str):
+        return None
+    
+    if len(texto) == 10 and texto[2] == '/' and texto[5] == '/':
+        digitos = texto[:2] + texto[3:5] + texto[6:]
+        if digitos.isascii() and digitos.isdigit():
+            try:
+                return datetime(int(texto[6:]), int(texto[3:5]), int(texto[:2]))
+            except ValueError:
+                return None
+    
+    try:
+        return datetime.strptime(texto, FORMATO_FECHA)
+    except ValueError:
+        return None
+
+
+@functools.lru_cache(maxsize=TAMANO_MEMO_FECHAS)
+def convertir_fecha(texto):
+    """
+    Convierte dd/mm/yyyy a datetime, recordando los textos ya convertidos
+    
+    Las fechas de registro se repiten mucho (miles de deudores por día),
+    así que casi todas las llamadas se resuelven en la memoria. El datetime
+    devuelto se comparte entre llamadas (es inmutable).
+    
+    Args:
+        texto (str): Fecha en formato dd/mm/yyyy
+    
+    Returns:
+        datetime or None: Fecha, o None si el texto no es una fecha válida
+    
+    Ejemplos:
+        >>> convertir_fecha("15/03/2024")
+        datetime.datetime(2024, 3, 15, 0, 0)
+        >>> convertir_fecha("31/02/2024")
+        None
+    """
+    return _convertir(texto)
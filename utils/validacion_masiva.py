@@ -0,0 +1,282 @@
+"""
+Clase ValidacionMasiva - Validación de columnas completas
+Responsabilidad: Validar documentos y nombres de archivos de verificación
+masiva, devolviendo una máscara de filas válidas y el motivo de cada error
+"""
+
+from utils.validaciones import PATRON_NOMBRES, PATRON_PASAPORTE
+from utils.fechas import convertir_fecha
+
+try:
+    import numpy as np
+except ImportError:  # numpy es opcional: las máscaras serán listas
+    np = None
+
+
+MOTIVO_VACIO = "Vacío"
+MOTIVO_DNI = "DNI debe tener 8 dígitos"
+MOTIVO_CARNET = "Carnet de extranjería debe tener 9 dígitos"
+MOTIVO_PASAPORTE = "Pasaporte debe tener entre 6 y 12 caracteres alfanuméricos"
+MOTIVO_NOMBRES = "Contiene caracteres inválidos"
+MOTIVO_TIPO = "Tipo de documento no válido"
+MOTIVO_FECHA = "Fecha no válida (dd/mm/aaaa)"
+
+# Nombres con que llega cada tipo de documento (como en Consulta y TabDNI)
+TIPOS_DOCUMENTO = {
+    'DNI': 'DNI',
+    'CE': 'CE',
+    'CARNET DE EXTRANJERÍA': 'CE',
+    'CARNET DE EXTRANJERIA': 'CE',
+    'PASAPORTE': 'PASAPORTE',
+}
+
+
+class ResultadoValidacion:
+    """
+    Resultado de validar una columna
+    
+    Atributos:
+        mascara: True por fila válida (numpy.ndarray de bool si la columna
+            era un arreglo NumPy/Arrow y numpy está instalado; si no, list)
+        motivos (dict): Índice de fila -> motivo, solo para filas inválidas
+    """
+    
+    def __init__(self, mascara, motivos):
+        self.mascara = mascara
+        self.motivos = motivos
+    
+    def __len__(self):
+        return len(self.mascara)
+    
+    @property
+    def validos(self):
+        """int: Cantidad de filas válidas"""
+        return len(self.mascara) - len(self.motivos)
+    
+    @property
+    def invalidos(self):
+        """int: Cantidad de filas inválidas"""
+        return len(self.motivos)
+    
+    def filas_invalidas(self):
+        """
+        Returns:
+            list: Índices de las filas inválidas, en orden
+        """
+        return sorted(self.motivos)
+
+
+def _a_lista(columna):
+    """
+    Convierte la columna en lista de str (o None)
+    
+    Returns:
+        tuple: (lista, True si la columna era un arreglo NumPy/Arrow)
+    """
+    if isinstance(columna, list):
+        return columna, False
+    if hasattr(columna, 'to_pylist'):  # pyarrow.Array / ChunkedArray
+        return columna.to_pylist(), True
+    if hasattr(columna, 'tolist'):  # numpy.ndarray
+        return columna.tolist(), True
+    return list(columna), False
+
+
+def _resultado(valores, mascara, es_arreglo, motivo):
+    """Arma el resultado calculando el motivo solo de las filas inválidas"""
+    motivos = {i: motivo(valores[i]) for i, valida in enumerate(mascara) if not valida}
+    if es_arreglo and np is not None:
+        mascara = np.fromiter(mascara, dtype=bool, count=len(mascara))
+    return ResultadoValidacion(mascara, motivos)
+
+
+def _es_dni(valor):
+    """Igual que Validaciones.validar_dni (isdecimal equivale a \\d)"""
+    if not valor:
+        return False
+    valor = valor.strip()
+    return len(valor) == 8 and valor.isdecimal()
+
+
+def _es_carnet(valor):
+    """Igual que Validaciones.validar_carnet_extranjeria"""
+    if not valor:
+        return False
+    valor = valor.strip()
+    return len(valor) == 9 and valor.isdecimal()
+
+
+def _es_pasaporte(valor):
+    """Igual que Validaciones.validar_pasaporte"""
+    if not valor:
+        return False
+    valor = valor.strip()
+    if len(valor) < 6 or len(valor) > 12:
+        return False
+    # En ASCII, [A-Z0-9] sobre el texto en mayúsculas es isalnum; el resto
+    # (p. ej. "ß", que en mayúsculas es "SS") se resuelve con el patrón
+    if valor.isascii():
+        return valor.isalnum()
+    return PATRON_PASAPORTE.match(valor.upper()) is not None
+
+
+def _motivo_documento(motivo):
+    """Función de motivo para un validador de documento"""
+    return lambda valor: MOTIVO_VACIO if not valor or not valor.strip() else motivo
+
+
+def _motivo_fecha(valor):
+    return MOTIVO_VACIO if not valor or not valor.strip() else MOTIVO_FECHA
+
+
+VALIDADORES_DOCUMENTO = {
+    'DNI': (_es_dni, _motivo_documento(MOTIVO_DNI)),
+    'CE': (_es_carnet, _motivo_documento(MOTIVO_CARNET)),
+    'PASAPORTE': (_es_pasaporte, _motivo_documento(MOTIVO_PASAPORTE)),
+}
+
+
+class ValidacionMasiva:
+    """
+    Validadores de columnas completas, con las mismas reglas que Validaciones
+    
+    Aceptan listas, iterables, arreglos NumPy de texto o arreglos Arrow de
+    strings. Los valores vacíos o None son inválidos. Los patrones están
+    compilados una sola vez y, cuando la regla lo permite, se usan métodos
+    de str (isdecimal, isalnum) que son más rápidos que una expresión
+    regular por fila.
+    """
+    
+    @staticmethod
+    def validar_dni(columna):
+        """
+        Valida una columna de DNI (8 dígitos)
+        
+        Args:
+            columna: Números de documento
+        
+        Returns:
+            ResultadoValidacion: Máscara y motivos
+        """
+        valores, es_arreglo = _a_lista(columna)
+        mascara = [_es_dni(v) for v in valores]
+        return _resultado(valores, mascara, es_arreglo, VALIDADORES_DOCUMENTO['DNI'][1])
+    
+    @staticmethod
+    def validar_carnet_extranjeria(columna):
+        """
+        Valida una columna de carnets de extranjería (9 dígitos)
+        
+        Args:
+            columna: Números de carnet
+        
+        Returns:
+            ResultadoValidacion: Máscara y motivos
+        """
+        valores, es_arreglo = _a_lista(columna)
+        mascara = [_es_carnet(v) for v in valores]
+        return _resultado(valores, mascara, es_arreglo, VALIDADORES_DOCUMENTO['CE'][1])
+    
+    @staticmethod
+    def validar_pasaporte(columna):
+        """
+        Valida una columna de pasaportes (6 a 12 caracteres alfanuméricos)
+        
+        Args:
+            columna: Números de pasaporte
+        
+        Returns:
+            ResultadoValidacion: Máscara y motivos
+        """
+        valores, es_arreglo = _a_lista(columna)
+        mascara = [_es_pasaporte(v) for v in valores]
+        return _resultado(valores, mascara, es_arreglo, VALIDADORES_DOCUMENTO['PASAPORTE'][1])
+    
+    @staticmethod
+    def validar_nombres(columna):
+        """
+        Valida una columna de nombres o apellidos (letras, espacios y guiones)
+        
+        Args:
+            columna: Textos a validar
+        
+        Returns:
+            ResultadoValidacion: Máscara y motivos
+        """
+        valores, es_arreglo = _a_lista(columna)
+        
+        # Una sola pasada: cada fila se recorta y compara una vez, y el
+        # motivo sale de ese mismo resultado (igual que Validaciones.validar_nombres)
+        coincide = PATRON_NOMBRES.match
+        mascara = []
+        agregar = mascara.append
+        motivos = {}
+        for i, valor in enumerate(valores):
+            texto = valor.strip() if valor else ''
+            if not texto:
+                agregar(False)
+                motivos[i] = MOTIVO_VACIO
+            elif coincide(texto):
+                agregar(True)
+            else:
+                agregar(False)
+                motivos[i] = MOTIVO_NOMBRES
+        
+        if es_arreglo and np is not None:
+            mascara = np.fromiter(mascara, dtype=bool, count=len(mascara))
+        return ResultadoValidacion(mascara, motivos)
+    
+    @staticmethod
+    def validar_fechas(columna):
+        """
+        Valida una columna de fechas dd/mm/yyyy (como Validaciones.validar_fecha)
+        
+        Args:
+            columna: Fechas en texto
+        
+        Returns:
+            ResultadoValidacion: Máscara y motivos
+        """
+        valores, es_arreglo = _a_lista(columna)
+        mascara = [convertir_fecha(v) is not None for v in valores]
+        return _resultado(valores, mascara, es_arreglo, _motivo_fecha)
+    
+    @staticmethod
+    def validar_documentos(tipos, numeros):
+        """
+        Valida documentos de tipos mezclados, fila por fila según su tipo
+        
+        Args:
+            tipos: Tipo de cada fila (DNI, CE / CARNET DE EXTRANJERÍA, PASAPORTE)
+            numeros: Número de documento de cada fila
+        
+        Returns:
+            ResultadoValidacion: Máscara y motivos
+        """
+        tipos, tipos_arreglo = _a_lista(tipos)
+        numeros, numeros_arreglo = _a_lista(numeros)
+        if len(tipos) != len(numeros):
+            raise ValueError("Las columnas de tipo y número deben tener el mismo largo")
+        
+        # Un validador por tipo distinto, no una búsqueda por fila
+        por_tipo = {}
+        for tipo in set(tipos):
+            normalizado = TIPOS_DOCUMENTO.get((tipo or '').strip().upper())
+            por_tipo[tipo] = VALIDADORES_DOCUMENTO.get(normalizado)
+        
+        mascara = []
+        motivos = {}
+        for i, (tipo, numero) in enumerate(zip(tipos, numeros)):
+            validador = por_tipo[tipo]
+            if validador is None:
+                mascara.append(False)
+                motivos[i] = MOTIVO_TIPO
+            elif validador[0](numero):
+                mascara.append(True)
+            else:
+                mascara.append(False)
+                motivos[i] = validador[1](numero)
+        
+        if (tipos_arreglo or numeros_arreglo) and np is not None:
+            mascara = np.fromiter(mascara, dtype=bool, count=len(mascara))
+        return ResultadoValidacion(mascara, motivos)
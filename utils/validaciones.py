@@ -6,6 +6,16 @@ Responsabilidad: Validar formatos de datos según reglas de negocio
 import re
 from datetime import datetime
 
+from utils.fechas import convertir_fecha, FORMATO_FECHA
+
+# Patrones compilados una sola vez (también los usa ValidacionMasiva)
+# Solo letras (incluye tildes), espacios y guiones
+PATRON_NOMBRES = re.compile(r'^[A-ZÁÉÍÓÚÑa-záéíóúñ\s\-]+$')
+PATRON_DNI = re.compile(r'^\d{8}$')
+PATRON_CARNET_EXTRANJERIA = re.compile(r'^\d{9}$')
+PATRON_PASAPORTE = re.compile(r'^[A-Z0-9]+$')
+PATRON_ESPACIOS = re.compile(r'\s+')
+
 class Validaciones:
     """
     Clase utilitaria con métodos estáticos para validación de datos
@@ -33,9 +43,7 @@ class Validaciones:
         if not texto or not texto.strip():
             return False
         
-        # Patrón: solo letras (incluye tildes), espacios y guiones
-        patron = r'^[A-ZÁÉÍÓÚÑa-záéíóúñ\s\-]+$'
-        return bool(re.match(patron, texto.strip()))
+        return bool(PATRON_NOMBRES.match(texto.strip()))
     
     @staticmethod
     def validar_dni(dni):
@@ -63,8 +71,7 @@ class Validaciones:
         dni = dni.strip()
         
         # Debe tener exactamente 8 dígitos
-        patron = r'^\d{8}$'
-        return bool(re.match(patron, dni))
+        return bool(PATRON_DNI.match(dni))
     
     @staticmethod
     def validar_carnet_extranjeria(carnet):
@@ -81,8 +88,7 @@ class Validaciones:
             return False
         
         carnet = carnet.strip()
-        patron = r'^\d{9}$'
-        return bool(re.match(patron, carnet))
+        return bool(PATRON_CARNET_EXTRANJERIA.match(carnet))
     
     @staticmethod
     def validar_pasaporte(pasaporte):
@@ -104,11 +110,10 @@ class Validaciones:
         if len(pasaporte) < 6 or len(pasaporte) > 12:
             return False
         
-        patron = r'^[A-Z0-9]+$'
-        return bool(re.match(patron, pasaporte.upper()))
+        return bool(PATRON_PASAPORTE.match(pasaporte.upper()))
     
     @staticmethod
-    def validar_fecha(fecha_str, formato="%d/%m/%Y"):
+    def validar_fecha(fecha_str, formato=FORMATO_FECHA):
         """
         Valida y convierte una fecha en string a datetime
         
@@ -125,6 +130,10 @@ class Validaciones:
             >>> Validaciones.validar_fecha("32/13/2024")
             None
         """
+        # El formato habitual usa el conversor rápido con memoria
+        if formato == FORMATO_FECHA and isinstance(fecha_str, str):
+            return convertir_fecha(fecha_str)
+        
         try:
             fecha = datetime.strptime(fecha_str, formato)
             return fecha
@@ -201,7 +210,7 @@ class Validaciones:
         texto = texto.strip()
         
         # Reemplazar múltiples espacios por uno solo
-        texto = re.sub(r'\s+', ' ', texto)
+        texto = PATRON_ESPACIOS.sub(' ', texto)
         
         return texto
     
@@ -0,0 +1,330 @@
+"""
+Búsquedas fuera del hilo de la interfaz
+Responsabilidad: Ejecutar las consultas del controlador en el QThreadPool,
+entregar los resultados por lotes a medida que llegan, informar progreso y
+errores por señales, y cancelar las búsquedas que el usuario abandona o
+reemplaza
+"""
+
+import threading
+import time
+from collections import deque
+
+from PyQt5.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class SenalesTrabajador(QObject):
+    """
+    Señales de un TrabajadorBusqueda (QRunnable no puede emitir señales)
+    
+    Todas llevan el número de búsqueda para descartar las reemplazadas.
+    """
+    
+    lote = pyqtSignal(int, list)
+    resultados = pyqtSignal(int, list)
+    progreso = pyqtSignal(int, int)
+    error = pyqtSignal(int, str)
+    cancelada = pyqtSignal(int)
+
+
+class TrabajadorBusqueda(QRunnable):
+    """
+    Ejecuta una búsqueda en un hilo del pool
+    
+    Si la búsqueda retorna un generador (por ejemplo, resultados remotos
+    paginados), se consume elemento a elemento revisando la cancelación,
+    de modo que al cancelar no se piden más páginas.
+    
+    Los resultados se emiten por lotes: el primero en cuanto alcanza para
+    una pantalla (o pasa INTERVALO_LOTE), los siguientes cada
+    INTERVALO_LOTE, para no saturar el hilo de la interfaz con una señal
+    por fila. Al final se emite la lista completa.
+    """
+    
+    PRIMER_LOTE = 50  # filas: una pantalla de la tabla
+    INTERVALO_LOTE = 0.05  # segundos entre lotes
+    
+    def __init__(self, numero, funcion, args, cancelado):
+        """
+        Constructor
+        
+        Args:
+            numero (int): Número de búsqueda
+            funcion (callable): Método de búsqueda del controlador
+            args (tuple): Argumentos de la búsqueda
+            cancelado (threading.Event): Se activa para cancelar
+        """
+        super().__init__()
+        self.numero = numero
+        self.funcion = funcion
+        self.args = args
+        self.cancelado = cancelado
+        self.senales = SenalesTrabajador()
+    
+    def run(self):
+        try:
+            resultado = self.funcion(*self.args)
+            deudores = self._consumir(resultado)
+        except Exception as e:
+            if not self.cancelado.is_set():
+                self.senales.error.emit(self.numero, str(e))
+            else:
+                self.senales.cancelada.emit(self.numero)
+            return
+        
+        if self.cancelado.is_set():
+            self.senales.cancelada.emit(self.numero)
+        else:
+            self.senales.resultados.emit(self.numero, deudores)
+    
+    def _consumir(self, resultado):
+        """Recorre el resultado hasta el final o hasta que se cancele"""
+        deudores = []
+        enviados = 0
+        proximo_lote = time.monotonic() + self.INTERVALO_LOTE
+        
+        try:
+            for deudor in resultado:
+                if self.cancelado.is_set():
+                    break
+                deudores.append(deudor)
+                
+                if ((enviados == 0 and len(deudores) >= self.PRIMER_LOTE)
+                        or time.monotonic() >= proximo_lote):
+                    enviados = self._emitir_lote(deudores, enviados)
+                    proximo_lote = time.monotonic() + self.INTERVALO_LOTE
+        finally:
+            # Un generador cerrado deja de paginar en el servidor
+            cerrar = getattr(resultado, 'close', None)
+            if cerrar is not None:
+                cerrar()
+        
+        if not self.cancelado.is_set():
+            self._emitir_lote(deudores, enviados)
+        return deudores
+    
+    def _emitir_lote(self, deudores, enviados):
+        """
+        Emite los deudores aún no enviados y el total acumulado
+        
+        Returns:
+            int: Cantidad de deudores enviados hasta ahora
+        """
+        if len(deudores) > enviados:
+            self.senales.lote.emit(self.numero, deudores[enviados:])
+            self.senales.progreso.emit(self.numero, len(deudores))
+        return len(deudores)
+
+
+class GestorBusquedas(QObject):
+    """
+    Lanza búsquedas en el QThreadPool, una vigente a la vez
+    
+    Al iniciar una búsqueda nueva, la anterior se cancela y sus señales se
+    ignoran aunque todavía lleguen. Las señales propias se emiten en el
+    hilo de la interfaz.
+    
+    También mide el tiempo hasta la primera fila (desde iniciar hasta el
+    primer lote) de las últimas MUESTRAS_METRICA búsquedas.
+    """
+    
+    MUESTRAS_METRICA = 200
+    
+    lote = pyqtSignal(list)
+    resultados = pyqtSignal(list)
+    progreso = pyqtSignal(int)
+    error = pyqtSignal(str)
+    cancelada = pyqtSignal()
+    ocupado = pyqtSignal(bool)
+    
+    def __init__(self, parent=None, pool=None):
+        """
+        Constructor
+        
+        Args:
+            parent (QObject): Objeto padre
+            pool (QThreadPool): Pool a usar (por defecto el global)
+        """
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._numero = 0
+        self._cancelado = None
+        self._trabajadores = {}  # número -> trabajador, hasta que termine
+        self._inicio = None
+        self.primera_fila = None  # segundos, de la búsqueda vigente o última
+        self._muestras_primera_fila = deque(maxlen=self.MUESTRAS_METRICA)
+    
+    @property
+    def en_curso(self):
+        """bool: True si hay una búsqueda vigente sin terminar"""
+        return self._numero in self._trabajadores
+    
+    def iniciar(self, funcion, *args):
+        """
+        Inicia una búsqueda, cancelando la que estuviera en curso
+        
+        Args:
+            funcion (callable): Método de búsqueda del controlador
+            *args: Argumentos de la búsqueda
+        """
+        self._cancelar_vigente()
+        
+        self._numero += 1
+        self._cancelado = threading.Event()
+        trabajador = TrabajadorBusqueda(self._numero, funcion, args, self._cancelado)
+        trabajador.senales.lote.connect(self._al_recibir_lote)
+        trabajador.senales.resultados.connect(self._al_obtener_resultados)
+        trabajador.senales.progreso.connect(self._al_progresar)
+        trabajador.senales.error.connect(self._al_fallar)
+        trabajador.senales.cancelada.connect(self._al_terminar)
+        self._trabajadores[self._numero] = trabajador
+        
+        self._inicio = time.perf_counter()
+        self.primera_fila = None
+        self.ocupado.emit(True)
+        self.pool.start(trabajador)
+    
+    def cancelar(self):
+        """Cancela la búsqueda vigente (sus resultados se descartan)"""
+        if not self.en_curso:
+            return
+        self._cancelar_vigente()
+        self.ocupado.emit(False)
+        self.cancelada.emit()
+    
+    def _cancelar_vigente(self):
+        """Marca como cancelada la búsqueda vigente"""
+        if self._cancelado is not None:
+            self._cancelado.set()
+        # Sus señales posteriores no coinciden con el número vigente
+        self._numero += 1
+    
+    def _vigente(self, numero):
+        """Indica si la señal pertenece a la búsqueda vigente"""
+        return numero == self._numero
+    
+    def obtener_metricas(self):
+        """
+        Retorna el tiempo hasta la primera fila de las últimas búsquedas
+        
+        Returns:
+            dict: Cantidad de muestras y último, promedio y p95 en ms
+                (None si no hay muestras)
+        """
+        muestras = sorted(self._muestras_primera_fila)
+        if not muestras:
+            return {'muestras': 0, 'ultimo_ms': None, 'promedio_ms': None, 'p95_ms': None}
+        
+        p95 = muestras[min(len(muestras) - 1, int(len(muestras) * 0.95))]
+        return {
+            'muestras': len(muestras),
+            'ultimo_ms': self._muestras_primera_fila[-1] * 1000,
+            'promedio_ms': sum(muestras) / len(muestras) * 1000,
+            'p95_ms': p95 * 1000
+        }
+    
+    def _al_recibir_lote(self, numero, deudores):
+        if not self._vigente(numero):
+            return
+        if self.primera_fila is None:
+            self.primera_fila = time.perf_counter() - self._inicio
+            self._muestras_primera_fila.append(self.primera_fila)
+        self.lote.emit(deudores)
+    
+    def _al_obtener_resultados(self, numero, deudores):
+        if self._al_terminar(numero):
+            self.resultados.emit(deudores)
+    
+    def _al_progresar(self, numero, cantidad):
+        if self._vigente(numero):
+            self.progreso.emit(cantidad)
+    
+    def _al_fallar(self, numero, mensaje):
+        if self._al_terminar(numero):
+            self.error.emit(mensaje)
+    
+    def _al_terminar(self, numero):
+        """
+        Libera el trabajador y, si era el vigente, avisa que terminó
+        
+        Returns:
+            bool: True si era la búsqueda vigente
+        """
+        self._trabajadores.pop(numero, None)
+        if not self._vigente(numero):
+            return False
+        self.ocupado.emit(False)
+        return True
+
+
+class EstadoBusqueda(QWidget):
+    """
+    Indicador "Buscando..." con botón Cancelar, enlazado a un GestorBusquedas
+    """
+    
+    def __init__(self, gestor, parent=None):
+        """
+        Constructor
+        
+        Args:
+            gestor (GestorBusquedas): Gestor cuyas búsquedas se muestran
+            parent (QWidget): Widget padre
+        """
+        super().__init__(parent)
+        self.gestor = gestor
+        
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        
+        self.label_estado = QLabel()
+        self.label_estado.setStyleSheet("color: #555555; font-size: 12px;")
+        
+        self.btn_cancelar = QPushButton("Cancelar")
+        self.btn_cancelar.setStyleSheet("""
+            QPushButton {
+                background-color: #f0f0f0;
+                border: 1px solid #cccccc;
+                border-radius: 3px;
+                padding: 5px 15px;
+            }
+            QPushButton:hover {
+                background-color: #e0e0e0;
+            }
+        """)
+        self.btn_cancelar.clicked.connect(gestor.cancelar)
+        
+        layout.addStretch()
+        layout.addWidget(self.label_estado)
+        layout.addWidget(self.btn_cancelar)
+        layout.addStretch()
+        self.setLayout(layout)
+        
+        gestor.ocupado.connect(self._al_cambiar_ocupado)
+        gestor.progreso.connect(self._al_progresar)
+        gestor.resultados.connect(self._al_terminar)
+        gestor.cancelada.connect(lambda: self._mostrar("Búsqueda cancelada", False))
+        self._mostrar("", False)
+    
+    def _al_cambiar_ocupado(self, ocupado):
+        if ocupado:
+            self._mostrar("Buscando...", True)
+        else:
+            self._mostrar("", False)
+    
+    def _al_progresar(self, cantidad):
+        self._mostrar(f"Buscando... {cantidad} resultados hasta ahora", True)
+    
+    def _al_terminar(self, deudores):
+        if not deudores:
+            return
+        texto = f"{len(deudores)} resultados"
+        if self.gestor.primera_fila is not None:
+            texto += f" (primera fila en {self.gestor.primera_fila * 1000:.0f} ms)"
+        self._mostrar(texto, False)
+    
+    def _mostrar(self, texto, cancelable):
+        """Actualiza el texto y la visibilidad del botón Cancelar"""
+        self.label_estado.setText(texto)
+        self.btn_cancelar.setVisible(cancelable)
+        self.setVisible(bool(texto))
@@ -0,0 +1,94 @@
+"""
+Captcha de las pestañas de búsqueda
+Responsabilidad: Mostrar el captcha vigente del controlador, sea el código
+local (texto) o la imagen descargada del REDAM
+"""
+
+import weakref
+from PyQt5.QtCore import QThreadPool
+from PyQt5.QtGui import QPixmap
+from views.tareas_fondo import ejecutar_en_fondo
+
+LARGO_CODIGO_LOCAL = 4
+LARGO_CODIGO_REDAM = 8  # el REDAM no fija el largo de su captcha
+
+
+def mostrar_captcha(label, entrada, captcha):
+    """
+    Muestra un captcha y deja la entrada lista para escribir la respuesta
+    
+    Args:
+        label (QLabel): Donde se muestra el captcha
+        entrada (QLineEdit): Donde el usuario escribe la respuesta
+        captcha (str or bytes): Código local o imagen del REDAM
+    """
+    if isinstance(captcha, bytes):
+        imagen = QPixmap()
+        imagen.loadFromData(captcha)
+        label.setPixmap(imagen)
+        entrada.setMaxLength(LARGO_CODIGO_REDAM)
+    else:
+        label.setText(captcha)
+        entrada.setMaxLength(LARGO_CODIGO_LOCAL)
+    
+    entrada.clear()
+    entrada.setFocus()
+
+
+# Las descargas del captcha del REDAM van de a una y en el orden pedido:
+# el REDAM solo acepta el último captcha de la sesión, que así es siempre
+# el del último pedido
+_pool_captcha = None
+_ultimo_pedido = weakref.WeakKeyDictionary()
+
+
+def renovar_captcha(controlador, label, entrada):
+    """
+    Genera un captcha nuevo y lo muestra
+    
+    El código local se muestra enseguida. La imagen del REDAM se descarga
+    en segundo plano y se muestra al llegar; si mientras tanto se pidió
+    otro captcha, el pedido viejo ya no se descarga.
+    
+    Args:
+        controlador (ControladorREDAM): Controlador de la aplicación
+        label (QLabel): Donde se muestra el captcha
+        entrada (QLineEdit): Donde el usuario escribe la respuesta
+    """
+    global _pool_captcha
+    
+    if not controlador.usar_api:
+        mostrar_captcha(label, entrada, controlador.generar_captcha())
+        return
+    
+    if _pool_captcha is None:
+        _pool_captcha = QThreadPool()
+        _pool_captcha.setMaxThreadCount(1)
+    
+    pedido = _ultimo_pedido.get(controlador, 0) + 1
+    _ultimo_pedido[controlador] = pedido
+    label.setText("Cargando...")
+    entrada.clear()
+    
+    def mostrar(captcha):
+        if captcha is not None:
+            mostrar_captcha(label, entrada, captcha)
+    
+    ejecutar_en_fondo(_descargar_captcha, controlador, pedido,
+                      al_terminar=mostrar, pool=_pool_captcha)
+
+
+def _descargar_captcha(controlador, pedido):
+    """
+    Descarga el captcha de un pedido, salvo que ya haya uno más nuevo
+    
+    Args:
+        controlador (ControladorREDAM): Controlador de la aplicación
+        pedido (int): Número del pedido
+    
+    Returns:
+        str or bytes: Captcha, o None si el pedido quedó viejo
+    """
+    if _ultimo_pedido.get(controlador) != pedido:
+        return None
+    return controlador.generar_captcha()
@@ -0,0 +1,279 @@
+"""
+Monitor de latencia de la interfaz (opcional)
+Responsabilidad: Medir cuánto se atrasa el bucle de eventos de Qt, registrar
+los slots que lo bloquean más que un umbral y exportar estadísticas para
+detectar regresiones de rendimiento en la interfaz
+"""
+
+import functools
+import inspect
+import json
+import time
+from collections import deque
+
+from PyQt5.QtCore import QObject, QTimer
+
+# Monitor activo (None: monitoreo desactivado, trazar_bloqueo no mide nada)
+_monitor = None
+
+
+def activar(umbral_ms=100, intervalo_ms=50, ruta_salida=None):
+    """
+    Activa el monitor de latencia para toda la aplicación
+    
+    Debe llamarse con la QApplication ya creada.
+    
+    Args:
+        umbral_ms (float): Bloqueos desde los que se registra y avisa
+        intervalo_ms (int): Periodo del latido
+        ruta_salida (str): Archivo JSON donde exportar al salir (opcional)
+    
+    Returns:
+        MonitorLatencia: Monitor activo
+    """
+    global _monitor
+    if _monitor is None:
+        _monitor = MonitorLatencia(umbral_ms, intervalo_ms, ruta_salida)
+        _monitor.iniciar()
+    return _monitor
+
+
+def desactivar():
+    """Detiene el monitor activo y, si tenía ruta de salida, exporta"""
+    global _monitor
+    if _monitor is not None:
+        _monitor.detener()
+        _monitor = None
+
+
+def monitor_activo():
+    """
+    Returns:
+        MonitorLatencia: Monitor activo o None
+    """
+    return _monitor
+
+
+def trazar_bloqueo(funcion):
+    """
+    Decorador para slots: con el monitor activo, mide cuánto bloquean
+    
+    Sin monitor el costo es una comparación. El nombre registrado es el
+    de la función con su clase, por ejemplo "TabNombres.realizar_consulta".
+    """
+    nombre = funcion.__qualname__
+    
+    # PyQt pasa al slot todos los argumentos de la señal (clicked envía
+    # checked) y, con una función sin decorar, descarta los que sobran;
+    # como la envoltura acepta *args, se descartan aquí
+    codigo = funcion.__code__
+    maximo = None if codigo.co_flags & inspect.CO_VARARGS else codigo.co_argcount
+    
+    @functools.wraps(funcion)
+    def envoltura(*args, **kwargs):
+        if maximo is not None:
+            args = args[:maximo]
+        monitor = _monitor
+        if monitor is None:
+            return funcion(*args, **kwargs)
+        
+        traza = monitor.iniciar_operacion(nombre)
+        try:
+            return funcion(*args, **kwargs)
+        finally:
+            monitor.terminar_operacion(traza)
+    
+    return envoltura
+
+
+class MonitorLatencia(QObject):
+    """
+    Mide el atraso del bucle de eventos con un QTimer de latido
+    
+    Cada latido compara el tiempo real transcurrido con el periodo: la
+    diferencia es lo que el bucle tardó en atender al temporizador. Los
+    slots decorados con trazar_bloqueo informan su duración; si durante
+    un slot no hubo latidos, el bucle estuvo bloqueado todo ese tiempo. Si
+    los hubo, el slot abrió un diálogo modal con su propio bucle: solo
+    cuenta como bloqueo lo que tardó hasta el primer latido (por ejemplo,
+    una descarga antes de exec_()).
+    """
+    
+    MUESTRAS = 10000  # latidos recientes para los percentiles
+    
+    def __init__(self, umbral_ms=100, intervalo_ms=50, ruta_salida=None, parent=None):
+        """
+        Constructor
+        
+        Args:
+            umbral_ms (float): Bloqueos desde los que se registra y avisa
+            intervalo_ms (int): Periodo del latido
+            ruta_salida (str): Archivo JSON donde exportar al detener (opcional)
+            parent (QObject): Objeto padre
+        """
+        super().__init__(parent)
+        self.umbral = umbral_ms / 1000
+        self.intervalo = intervalo_ms / 1000
+        self.ruta_salida = ruta_salida
+        
+        self.latidos = 0
+        self._ultimo_latido = None
+        self._atrasos = deque(maxlen=self.MUESTRAS)
+        self.atraso_maximo = 0.0
+        self.bloqueos = 0
+        self.tiempo_bloqueado = 0.0
+        self._operaciones = {}  # nombre -> estadísticas
+        self._recientes = []    # operaciones lentas desde el último latido
+        self._activas = []      # [nombre, inicio, bloqueo hasta el primer latido] en curso
+        
+        self._timer = QTimer(self)
+        self._timer.setInterval(intervalo_ms)
+        self._timer.timeout.connect(self._latir)
+    
+    def iniciar(self):
+        """Empieza a medir"""
+        self._ultimo_latido = time.perf_counter()
+        self._timer.start()
+    
+    def detener(self):
+        """Deja de medir y exporta si hay ruta de salida"""
+        self._timer.stop()
+        if self.ruta_salida:
+            self.exportar(self.ruta_salida)
+    
+    def _latir(self):
+        ahora = time.perf_counter()
+        atraso = max(0.0, ahora - self._ultimo_latido - self.intervalo)
+        self._ultimo_latido = ahora
+        self.latidos += 1
+        self._atrasos.append(atraso)
+        self.atraso_maximo = max(self.atraso_maximo, atraso)
+        
+        # Primer latido dentro de un slot en curso: entró en un bucle anidado,
+        # y lo que bloqueó fue hasta aquí
+        for traza in self._activas:
+            if traza[2] is None:
+                traza[2] = ahora - traza[1]
+                self._medir(traza[0], traza[2])
+        
+        if atraso >= self.umbral:
+            self.bloqueos += 1
+            self.tiempo_bloqueado += atraso
+            causa = ", ".join(self._recientes) or "operación no trazada"
+            print(f" Interfaz bloqueada {atraso * 1000:.0f} ms ({causa})")
+        self._recientes = []
+    
+    def iniciar_operacion(self, nombre):
+        """
+        Empieza a medir un slot trazado
+        
+        Args:
+            nombre (str): Nombre del slot
+        
+        Returns:
+            list: Traza a pasar a terminar_operacion
+        """
+        traza = [nombre, time.perf_counter(), None]
+        self._activas.append(traza)
+        return traza
+    
+    def terminar_operacion(self, traza):
+        """
+        Termina de medir un slot trazado y registra cuánto bloqueó
+        
+        Args:
+            traza (list): Resultado de iniciar_operacion
+        """
+        duracion = time.perf_counter() - traza[1]
+        for posicion in range(len(self._activas) - 1, -1, -1):
+            if self._activas[posicion] is traza:
+                del self._activas[posicion]
+                break
+        self.registrar_operacion(traza[0], duracion, anidado=traza[2] is not None)
+    
+    def registrar_operacion(self, nombre, duracion, anidado=False):
+        """
+        Registra una llamada a un slot trazado
+        
+        Args:
+            nombre (str): Nombre del slot
+            duracion (float): Segundos que tardó
+            anidado (bool): True si el bucle de eventos siguió girando
+                durante el slot (diálogo modal): su bloqueo ya se midió al
+                primer latido y no se cuenta la duración total
+        """
+        estadisticas = self._estadisticas(nombre)
+        estadisticas['llamadas'] += 1
+        if anidado:
+            estadisticas['anidadas'] += 1
+            return
+        
+        self._medir(nombre, duracion)
+    
+    def _estadisticas(self, nombre):
+        return self._operaciones.setdefault(nombre, {
+            'llamadas': 0, 'lentas': 0, 'total': 0.0, 'maximo': 0.0, 'anidadas': 0
+        })
+    
+    def _medir(self, nombre, duracion):
+        """Acumula lo que un slot bloqueó la interfaz y avisa si fue lento"""
+        estadisticas = self._estadisticas(nombre)
+        estadisticas['total'] += duracion
+        estadisticas['maximo'] = max(estadisticas['maximo'], duracion)
+        if duracion >= self.umbral:
+            estadisticas['lentas'] += 1
+            self._recientes.append(nombre)
+            print(f" Slot lento: {nombre} bloqueó la interfaz {duracion * 1000:.0f} ms")
+    
+    def obtener_estadisticas(self):
+        """
+        Retorna las estadísticas acumuladas
+        
+        Returns:
+            dict: 'bucle' (atraso de los latidos en ms: percentiles, máximo,
+                bloqueos) y 'operaciones' (por slot: llamadas, lentas,
+                promedio y máximo en ms)
+        """
+        atrasos = sorted(self._atrasos)
+        
+        def percentil(p):
+            if not atrasos:
+                return None
+            return atrasos[min(len(atrasos) - 1, int(len(atrasos) * p))] * 1000
+        
+        operaciones = {}
+        for nombre, e in sorted(self._operaciones.items(),
+                                key=lambda item: item[1]['maximo'], reverse=True):
+            operaciones[nombre] = {
+                'llamadas': e['llamadas'],
+                'lentas': e['lentas'],
+                'promedio_ms': e['total'] / e['llamadas'] * 1000 if e['llamadas'] else None,
+                'maximo_ms': e['maximo'] * 1000,
+                'con_bucle_anidado': e['anidadas'],
+            }
+        
+        return {
+            'umbral_ms': self.umbral * 1000,
+            'intervalo_ms': self.intervalo * 1000,
+            'bucle': {
+                'latidos': self.latidos,
+                'p50_ms': percentil(0.50),
+                'p95_ms': percentil(0.95),
+                'p99_ms': percentil(0.99),
+                'maximo_ms': self.atraso_maximo * 1000,
+                'bloqueos': self.bloqueos,
+                'tiempo_bloqueado_ms': self.tiempo_bloqueado * 1000,
+            },
+            'operaciones': operaciones,
+        }
+    
+    def exportar(self, ruta):
+        """
+        Guarda las estadísticas en un archivo JSON
+        
+        Args:
+            ruta (str): Archivo de destino
+        """
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.obtener_estadisticas(), archivo, ensure_ascii=False, indent=2)
+        print(f"Estadísticas de latencia de la interfaz guardadas en {ruta}")
@@ -2,12 +2,16 @@
 TabFechas - Pestaña para búsqueda por rango de fechas
 """
 
+import functools
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QLineEdit, QPushButton, QDateEdit, QTableWidget, 
-                             QTableWidgetItem, QMessageBox, QHeaderView)
-from PyQt5.QtCore import Qt, QDate
+                             QLineEdit, QPushButton, QDateEdit, QMessageBox)
+from PyQt5.QtCore import QDate
 from PyQt5.QtGui import QFont
-from views.ventana_detalle import VentanaDetalle
+from views.ventana_detalle import abrir_detalle
+from views.tabla_resultados import TablaResultados, FiltroResultados, BotonExportar
+from views.busqueda_asincrona import GestorBusquedas, EstadoBusqueda
+from views.monitor_latencia import trazar_bloqueo
+from views.captcha import renovar_captcha
 from datetime import datetime
 
 class TabFechas(QWidget):
@@ -163,39 +167,35 @@ class TabFechas(QWidget):
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
         
+        # Búsquedas en segundo plano, con indicador y botón Cancelar
+        self.busquedas = GestorBusquedas(self)
+        self.busquedas.lote.connect(self.agregar_resultados)
+        self.busquedas.resultados.connect(self.mostrar_resultados)
+        self.busquedas.error.connect(self.mostrar_error)
+        self.estado_busqueda = EstadoBusqueda(self.busquedas)
+        self.busqueda_actual = None  # (tipo, *criterios) de la búsqueda en curso
+        layout.addWidget(self.estado_busqueda)
+        
         # Tabla de resultados
-        self.tabla_resultados = QTableWidget()
-        self.tabla_resultados.setColumnCount(5)
-        self.tabla_resultados.setHorizontalHeaderLabels([
-            "Apellidos y Nombres", "Tipo Doc.", "N° Documento", 
-            "Fecha Registro", "Detalle"
-        ])
-        self.tabla_resultados.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.tabla_resultados.setStyleSheet("""
-            QTableWidget {
-                border: 1px solid #cccccc;
-                gridline-color: #e0e0e0;
-            }
-            QHeaderView::section {
-                background-color: #8B0000;
-                color: white;
-                padding: 10px;
-                font-weight: bold;
-            }
-        """)
+        self.tabla_resultados = TablaResultados()
+        self.tabla_resultados.detalle_solicitado.connect(self.ver_detalle)
         self.tabla_resultados.setVisible(False)
+        self.filtro_resultados = FiltroResultados(self.tabla_resultados)
+        self.btn_exportar = BotonExportar(self.tabla_resultados, self.controlador)
+        barra_resultados = QHBoxLayout()
+        barra_resultados.addWidget(self.filtro_resultados)
+        barra_resultados.addWidget(self.btn_exportar)
+        layout.addLayout(barra_resultados)
         layout.addWidget(self.tabla_resultados)
         
         layout.addStretch()
         self.setLayout(layout)
     
     def generar_captcha(self):
-        """Genera y muestra un nuevo código captcha"""
-        codigo = self.controlador.generar_captcha()
-        self.label_captcha.setText(codigo)
-        self.input_captcha.clear()
-        self.input_captcha.setFocus()
+        """Genera y muestra un nuevo captcha (código local o imagen del REDAM)"""
+        renovar_captcha(self.controlador, self.label_captcha, self.input_captcha)
     
+    @trazar_bloqueo
     def realizar_consulta(self):
         """Ejecuta la consulta por fechas"""
         try:
@@ -224,69 +224,54 @@ class TabFechas(QWidget):
                     "El rango máximo permitido es de 3 meses (90 días).")
                 return
             
-            self.setCursor(Qt.WaitCursor)
+            # Convertir a datetime para la búsqueda
+            fecha_inicio_dt = datetime.combine(fecha_inicio, datetime.min.time())
+            fecha_fin_dt = datetime.combine(fecha_fin, datetime.max.time())
             
-            try:
-                # Convertir a datetime para la búsqueda
-                fecha_inicio_dt = datetime.combine(fecha_inicio, datetime.min.time())
-                fecha_fin_dt = datetime.combine(fecha_fin, datetime.max.time())
-                
-                resultados = self.controlador.buscar_por_fechas(
-                    fecha_inicio_dt, fecha_fin_dt
-                )
-                self.mostrar_resultados(resultados)
-            finally:
-                self.setCursor(Qt.ArrowCursor)
-                
+            self.tabla_resultados.limpiar()
+            self.busqueda_actual = (self.controlador.BUSQUEDA_FECHAS, fecha_inicio_dt, fecha_fin_dt)
+            self.busquedas.iniciar(
+                functools.partial(self.controlador.iterar_busqueda, captcha=captcha),
+                *self.busqueda_actual
+            )
+        
         except Exception as e:
-            self.setCursor(Qt.ArrowCursor)
-            QMessageBox.critical(self, "Error", f"Error: {str(e)}")
-            self.generar_captcha()
+            self.mostrar_error(str(e))
+    
+    def mostrar_error(self, mensaje):
+        """Informa un error de la consulta y renueva el captcha"""
+        QMessageBox.critical(self, "Error", f"Error: {mensaje}")
+        self.generar_captcha()
     
+    @trazar_bloqueo
     def mostrar_resultados(self, deudores):
-        """Muestra los resultados en la tabla"""
+        """Cierra la búsqueda con todos los resultados"""
+        # El captcha del REDAM sirve para una sola búsqueda
+        if self.controlador.captcha_remoto:
+            self.generar_captcha()
+        
         if not deudores:
             QMessageBox.information(self, "Sin resultados",
                 "No se encontraron registros en el rango de fechas especificado.")
             self.tabla_resultados.setVisible(False)
             return
         
-        self.tabla_resultados.setRowCount(len(deudores))
-        
-        for i, deudor in enumerate(deudores):
-            self.tabla_resultados.setItem(i, 0, 
-                QTableWidgetItem(deudor.obtener_nombre_completo()))
-            self.tabla_resultados.setItem(i, 1, 
-                QTableWidgetItem(deudor.tipo_documento))
-            self.tabla_resultados.setItem(i, 2, 
-                QTableWidgetItem(deudor.numero_documento))
-            self.tabla_resultados.setItem(i, 3, 
-                QTableWidgetItem(deudor.fecha_registro))
-            
-            btn_detalle = QPushButton("Ver Detalle")
-            btn_detalle.setStyleSheet("""
-                QPushButton {
-                    background-color: #4CAF50;
-                    color: white;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background-color: #45a049;
-                }
-            """)
-            btn_detalle.clicked.connect(
-                lambda checked, d=deudor: self.ver_detalle(d)
-            )
-            self.tabla_resultados.setCellWidget(i, 4, btn_detalle)
-        
+        # Las filas ya se agregaron por lotes (agregar_resultados); la
+        # exportación puede repetir la búsqueda en lugar de copiarlas
+        self.tabla_resultados.busqueda = self.busqueda_actual
+        self.tabla_resultados.setVisible(True)
+    
+    @trazar_bloqueo
+    def agregar_resultados(self, deudores):
+        """Agrega a la tabla un lote de resultados apenas llega"""
+        self.tabla_resultados.agregar_progresivo(deudores)
         self.tabla_resultados.setVisible(True)
     
+    @trazar_bloqueo
     def ver_detalle(self, deudor):
         """Abre ventana de detalle"""
         try:
-            ventana_detalle = VentanaDetalle(deudor, self)
-            ventana_detalle.exec_()
+            # Con la API activa, el expediente se descarga en segundo plano
+            abrir_detalle(self.controlador, deudor, self)
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Error: {str(e)}")
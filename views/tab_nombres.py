@@ -2,21 +2,32 @@
 TabNombres - Pestaña para búsqueda por nombres y apellidos
 """
 
+import functools
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                             QLineEdit, QPushButton, QTableWidget, 
-                             QTableWidgetItem, QMessageBox, QHeaderView)
-from PyQt5.QtCore import Qt
+                             QLineEdit, QPushButton, QMessageBox)
+from PyQt5.QtCore import QTimer
 from PyQt5.QtGui import QFont
-from views.ventana_detalle import VentanaDetalle
+from views.ventana_detalle import abrir_detalle
+from views.tabla_resultados import TablaResultados, FiltroResultados, BotonExportar
+from views.busqueda_asincrona import GestorBusquedas, EstadoBusqueda
+from views.monitor_latencia import trazar_bloqueo
+from views.captcha import renovar_captcha
 
 class TabNombres(QWidget):
     """
     Pestaña para consultar deudores por nombres y apellidos
+    
+    Con busqueda_en_vivo, además busca en el registro local mientras se
+    escribe (sin captcha), para instalaciones internas de confianza.
     """
     
-    def __init__(self, controlador):
+    RETARDO_EN_VIVO = 150  # ms sin teclear antes de buscar
+    MINIMO_EN_VIVO = 2     # caracteres del apellido paterno
+    
+    def __init__(self, controlador, busqueda_en_vivo=False):
         super().__init__()
         self.controlador = controlador
+        self.busqueda_en_vivo = busqueda_en_vivo
         self.init_ui()
     
     def init_ui(self):
@@ -40,6 +51,9 @@ class TabNombres(QWidget):
         nota.setWordWrap(True)
         layout.addWidget(nota)
         
+        if self.busqueda_en_vivo:
+            self._init_busqueda_en_vivo(layout)
+        
         # Sección CAPTCHA
         captcha_layout = QHBoxLayout()
         
@@ -128,36 +142,91 @@ class TabNombres(QWidget):
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
         
+        # Búsquedas en segundo plano, con indicador y botón Cancelar
+        self.busquedas = GestorBusquedas(self)
+        self.busquedas.lote.connect(self.agregar_resultados)
+        self.busquedas.resultados.connect(self.mostrar_resultados)
+        self.busquedas.error.connect(self.mostrar_error)
+        self.estado_busqueda = EstadoBusqueda(self.busquedas)
+        self.busqueda_actual = None  # (tipo, *criterios) de la búsqueda en curso
+        layout.addWidget(self.estado_busqueda)
+        
         # Tabla de resultados (inicialmente oculta)
-        self.tabla_resultados = QTableWidget()
-        self.tabla_resultados.setColumnCount(5)
-        self.tabla_resultados.setHorizontalHeaderLabels([
-            "Apellidos y Nombres", "Tipo Doc.", "N° Documento", 
-            "Fecha Registro", "Detalle"
-        ])
-        self.tabla_resultados.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.tabla_resultados.setStyleSheet("""
-            QTableWidget {
-                border: 1px solid #cccccc;
-                gridline-color: #e0e0e0;
-            }
-            QTableWidget::item {
-                padding: 8px;
-            }
-            QHeaderView::section {
-                background-color: #8B0000;
-                color: white;
-                padding: 10px;
-                font-weight: bold;
-                border: none;
-            }
-        """)
+        self.tabla_resultados = TablaResultados()
+        self.tabla_resultados.detalle_solicitado.connect(self.ver_detalle)
         self.tabla_resultados.setVisible(False)
+        self.filtro_resultados = FiltroResultados(self.tabla_resultados)
+        self.btn_exportar = BotonExportar(self.tabla_resultados, self.controlador)
+        barra_resultados = QHBoxLayout()
+        barra_resultados.addWidget(self.filtro_resultados)
+        barra_resultados.addWidget(self.btn_exportar)
+        layout.addLayout(barra_resultados)
         layout.addWidget(self.tabla_resultados)
         
         layout.addStretch()
         self.setLayout(layout)
     
+    def _init_busqueda_en_vivo(self, layout):
+        """
+        Prepara la búsqueda mientras se escribe
+        
+        Cada tecla reinicia un temporizador; al vencer se busca en segundo
+        plano. La sesión incremental reutiliza los candidatos anteriores
+        cuando el texto solo creció.
+        
+        Args:
+            layout (QVBoxLayout): Layout donde agregar el indicador
+        """
+        self.busqueda_incremental = self.controlador.crear_busqueda_incremental()
+        
+        self.busquedas_en_vivo = GestorBusquedas(self)
+        self.busquedas_en_vivo.resultados.connect(self.mostrar_en_vivo)
+        self.busquedas_en_vivo.error.connect(lambda mensaje: self.label_en_vivo.setText(mensaje))
+        
+        self.timer_en_vivo = QTimer(self)
+        self.timer_en_vivo.setSingleShot(True)
+        self.timer_en_vivo.setInterval(self.RETARDO_EN_VIVO)
+        self.timer_en_vivo.timeout.connect(self.buscar_en_vivo)
+        
+        for campo in (self.input_apellido_paterno, self.input_apellido_materno, self.input_nombres):
+            campo.textChanged.connect(self.timer_en_vivo.start)
+        
+        self.label_en_vivo = QLabel()
+        self.label_en_vivo.setStyleSheet("color: #555555; font-size: 11px;")
+        layout.addWidget(self.label_en_vivo)
+    
+    @trazar_bloqueo
+    def buscar_en_vivo(self):
+        """Busca en el registro local con el texto escrito hasta ahora"""
+        apellido_paterno = self.input_apellido_paterno.text().strip()
+        
+        if len(apellido_paterno) < self.MINIMO_EN_VIVO:
+            self.busquedas_en_vivo.cancelar()
+            self.tabla_resultados.limpiar()
+            self.tabla_resultados.setVisible(False)
+            self.label_en_vivo.setText("")
+            return
+        
+        self.busquedas.cancelar()
+        self.busquedas_en_vivo.iniciar(
+            self.busqueda_incremental.buscar,
+            apellido_paterno,
+            self.input_apellido_materno.text(),
+            self.input_nombres.text()
+        )
+    
+    @trazar_bloqueo
+    def mostrar_en_vivo(self, deudores):
+        """
+        Muestra los resultados de la búsqueda mientras se escribe
+        
+        Args:
+            deudores (list): Lista de objetos DeudorAlimentario
+        """
+        self.tabla_resultados.mostrar(deudores)
+        self.tabla_resultados.setVisible(bool(deudores))
+        self.label_en_vivo.setText(f"{len(deudores)} coincidencias en el registro local")
+    
     def _crear_campo(self, etiqueta, layout):
         """
         Crea un campo de entrada con su etiqueta
@@ -195,12 +264,10 @@ class TabNombres(QWidget):
         return input_field
     
     def generar_captcha(self):
-        """Genera y muestra un nuevo código captcha"""
-        codigo = self.controlador.generar_captcha()
-        self.label_captcha.setText(codigo)
-        self.input_captcha.clear()
-        self.input_captcha.setFocus()
+        """Genera y muestra un nuevo captcha (código local o imagen del REDAM)"""
+        renovar_captcha(self.controlador, self.label_captcha, self.input_captcha)
     
+    @trazar_bloqueo
     def realizar_consulta(self):
         """
         Ejecuta la consulta por nombres
@@ -227,85 +294,68 @@ class TabNombres(QWidget):
                 self.generar_captcha()
                 return
             
-            # Mostrar cursor de espera
-            self.setCursor(Qt.WaitCursor)
-            
-            try:
-                # Realizar búsqueda
-                resultados = self.controlador.buscar_por_nombres(
-                    apellido_paterno, apellido_materno, nombres
-                )
-                
-                # Mostrar resultados
-                self.mostrar_resultados(resultados)
-                
-            finally:
-                # Restaurar cursor normal
-                self.setCursor(Qt.ArrowCursor)
-            
+            # Realizar búsqueda fuera del hilo de la interfaz; si había
+            # otra en curso, se cancela
+            if self.busqueda_en_vivo:
+                self.timer_en_vivo.stop()
+                self.busquedas_en_vivo.cancelar()
+            self.tabla_resultados.limpiar()
+            self.busqueda_actual = (self.controlador.BUSQUEDA_NOMBRES,
+                                    apellido_paterno, apellido_materno, nombres)
+            self.busquedas.iniciar(
+                functools.partial(self.controlador.iterar_busqueda, captcha=captcha),
+                *self.busqueda_actual
+            )
+        
         except Exception as e:
-            self.setCursor(Qt.ArrowCursor)
-            QMessageBox.critical(self, "Error", 
-                f"Ocurrió un error al realizar la consulta:\n{str(e)}")
-            self.generar_captcha()
+            self.mostrar_error(str(e))
+    
+    def mostrar_error(self, mensaje):
+        """
+        Informa un error de la consulta y renueva el captcha
+        
+        Args:
+            mensaje (str): Descripción del error
+        """
+        QMessageBox.critical(self, "Error", 
+            f"Ocurrió un error al realizar la consulta:\n{mensaje}")
+        self.generar_captcha()
     
+    @trazar_bloqueo
     def mostrar_resultados(self, deudores):
         """
-        Muestra los deudores encontrados en la tabla
+        Cierra la búsqueda con todos los deudores encontrados
         
         Args:
-            deudores (list): Lista de objetos DeudorAlimentario
+            deudores (list): Lista completa de objetos DeudorAlimentario
         """
+        # El captcha del REDAM sirve para una sola búsqueda
+        if self.controlador.captcha_remoto:
+            self.generar_captcha()
+        
         if not deudores:
             QMessageBox.information(self, "Sin resultados",
                 "Los datos ingresados no presentan registros.")
             self.tabla_resultados.setVisible(False)
             return
         
-        # Configurar número de filas
-        self.tabla_resultados.setRowCount(len(deudores))
-        
-        # Llenar tabla
-        for i, deudor in enumerate(deudores):
-            # Columna 0: Nombre completo
-            self.tabla_resultados.setItem(i, 0, 
-                QTableWidgetItem(deudor.obtener_nombre_completo()))
-            
-            # Columna 1: Tipo de documento
-            self.tabla_resultados.setItem(i, 1, 
-                QTableWidgetItem(deudor.tipo_documento))
-            
-            # Columna 2: Número de documento
-            self.tabla_resultados.setItem(i, 2, 
-                QTableWidgetItem(deudor.numero_documento))
-            
-            # Columna 3: Fecha de registro
-            self.tabla_resultados.setItem(i, 3, 
-                QTableWidgetItem(deudor.fecha_registro))
-            
-            # Columna 4: Botón de detalle
-            btn_detalle = QPushButton(" Ver Detalle")
-            btn_detalle.setStyleSheet("""
-                QPushButton {
-                    background-color: #4CAF50;
-                    color: white;
-                    border: none;
-                    padding: 5px 10px;
-                    border-radius: 3px;
-                }
-                QPushButton:hover {
-                    background-color: #45a049;
-                }
-            """)
-            # Usar lambda para capturar el deudor actual
-            btn_detalle.clicked.connect(
-                lambda checked, d=deudor: self.ver_detalle(d)
-            )
-            self.tabla_resultados.setCellWidget(i, 4, btn_detalle)
+        # Las filas ya se agregaron por lotes (agregar_resultados); la
+        # exportación puede repetir la búsqueda en lugar de copiarlas
+        self.tabla_resultados.busqueda = self.busqueda_actual
+        self.tabla_resultados.setVisible(True)
+    
+    @trazar_bloqueo
+    def agregar_resultados(self, deudores):
+        """
+        Agrega a la tabla un lote de resultados apenas llega
         
-        # Mostrar tabla
+        Args:
+            deudores (list): Lote de objetos DeudorAlimentario
+        """
+        self.tabla_resultados.agregar_progresivo(deudores)
         self.tabla_resultados.setVisible(True)
     
+    @trazar_bloqueo
     def ver_detalle(self, deudor):
         """
         Abre ventana con el detalle completo del deudor
@@ -314,8 +364,8 @@ class TabNombres(QWidget):
             deudor (DeudorAlimentario): Deudor seleccionado
         """
         try:
-            ventana_detalle = VentanaDetalle(deudor, self)
-            ventana_detalle.exec_()
+            # Con la API activa, el expediente se descarga en segundo plano
+            abrir_detalle(self.controlador, deudor, self)
         except Exception as e:
             QMessageBox.critical(self, "Error", 
                 f"Error al abrir detalle:\n{str(e)}")
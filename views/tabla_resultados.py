@@ -0,0 +1,623 @@
+"""
+TablaResultados - Tabla de deudores compartida por las pestañas de búsqueda
+"""
+
+import time
+from collections import deque
+from datetime import datetime
+
+from PyQt5.QtWidgets import (QTableView, QHeaderView, QStyledItemDelegate, QStyle,
+                             QLineEdit, QPushButton, QFileDialog, QMessageBox)
+from PyQt5.QtCore import (Qt, QObject, QAbstractTableModel, QModelIndex, QRectF, QEvent,
+                          QTimer, pyqtSignal)
+from PyQt5.QtGui import QColor, QPainter, QPainterPath
+
+from services.exportacion import exportar
+from views.monitor_latencia import trazar_bloqueo
+from views.tareas_fondo import ejecutar_en_fondo
+from utils.fechas import convertir_fecha
+
+
+class ModeloResultados(QAbstractTableModel):
+    """
+    Modelo de solo lectura sobre una lista de DeudorAlimentario
+    
+    El texto de cada celda se calcula cuando la vista lo pide, es decir,
+    solo para las filas visibles.
+    
+    Ordena y filtra los resultados ya obtenidos sin volver a consultar. Las
+    filas visibles son posiciones en la lista de resultados; el orden se
+    hace con una sola llamada a sorted sobre claves tipadas calculadas una
+    vez por columna (la fecha de registro como datetime, el número de
+    documento como número), no comparación por comparación desde Qt.
+    """
+    
+    COLUMNAS = ["Apellidos y Nombres", "Tipo Doc.", "N° Documento",
+                "Fecha Registro", "Detalle"]
+    COLUMNA_DETALLE = 4
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._deudores = []   # todos, en orden de llegada
+        self._visibles = []   # posiciones en _deudores que pasan el filtro, en orden
+        self._orden = None    # (columna, Qt.SortOrder) o None
+        self._filtro = ""
+        self._claves = {}     # columna -> claves de orden alineadas con _deudores
+        self._textos = []     # texto de filtro alineado con _deudores
+        self._fechas = {}     # texto dd/mm/yyyy -> datetime
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._visibles)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNAS)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        
+        deudor = self._deudores[self._visibles[index.row()]]
+        columna = index.column()
+        if columna == 0:
+            return deudor.obtener_nombre_completo()
+        if columna == 1:
+            return deudor.tipo_documento
+        if columna == 2:
+            return deudor.numero_documento
+        if columna == 3:
+            return deudor.fecha_registro
+        return " Ver Detalle"
+    
+    def headerData(self, seccion, orientacion, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientacion == Qt.Horizontal:
+            return self.COLUMNAS[seccion]
+        return super().headerData(seccion, orientacion, role)
+    
+    def establecer_deudores(self, deudores):
+        """
+        Reemplaza los resultados mostrados
+        
+        Se conservan el orden y el filtro elegidos.
+        
+        Args:
+            deudores (list): Lista de objetos DeudorAlimentario
+        """
+        self.beginResetModel()
+        self._deudores = list(deudores)
+        self._claves = {}
+        self._textos = []
+        self._visibles = self._ordenar(self._filtrar(range(len(self._deudores))))
+        self.endResetModel()
+    
+    def agregar_deudores(self, deudores):
+        """
+        Agrega resultados al final sin redibujar los ya mostrados
+        
+        Si hay un orden elegido, los nuevos se ubican en su lugar.
+        
+        Args:
+            deudores (list): Lista de objetos DeudorAlimentario
+        """
+        if not deudores:
+            return
+        inicio = len(self._deudores)
+        self._deudores.extend(deudores)
+        nuevos = self._filtrar(range(inicio, len(self._deudores)))
+        if not nuevos:
+            return
+        
+        if self._orden is not None:
+            # Timsort aprovecha que los visibles ya están ordenados
+            self._cambiar_disposicion(self._ordenar(self._visibles + nuevos))
+            return
+        
+        inicio = len(self._visibles)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(nuevos) - 1)
+        self._visibles.extend(nuevos)
+        self.endInsertRows()
+    
+    def deudor(self, fila):
+        """
+        Retorna el deudor de una fila
+        
+        Args:
+            fila (int): Número de fila
+        
+        Returns:
+            DeudorAlimentario: Deudor mostrado en esa fila
+        """
+        return self._deudores[self._visibles[fila]]
+    
+    def total(self):
+        """
+        Returns:
+            int: Cantidad de resultados, incluidos los que oculta el filtro
+        """
+        return len(self._deudores)
+    
+    def muestra_todos(self):
+        """
+        Returns:
+            bool: True si se muestran todos los resultados en el orden de
+                llegada (sin filtro ni orden elegidos)
+        """
+        return not self._filtro and self._orden is None
+    
+    def deudores_visibles(self):
+        """
+        Recorre los deudores mostrados, en el orden y con el filtro actuales
+        
+        Yields:
+            DeudorAlimentario: Deudor de cada fila
+        """
+        deudores = self._deudores
+        for posicion in list(self._visibles):
+            yield deudores[posicion]
+    
+    @trazar_bloqueo
+    def sort(self, columna, orden=Qt.AscendingOrder):
+        """
+        Ordena los resultados (la vista lo llama al pulsar el encabezado)
+        
+        Args:
+            columna (int): Columna; una negativa o la de detalle vuelve al
+                orden de llegada
+            orden (Qt.SortOrder): Ascendente o descendente
+        """
+        if columna < 0 or columna == self.COLUMNA_DETALLE:
+            nuevo_orden = None
+        else:
+            nuevo_orden = (columna, orden)
+        if nuevo_orden == self._orden:
+            return
+        
+        self._orden = nuevo_orden
+        if nuevo_orden is None:
+            self._cambiar_disposicion(sorted(self._visibles))
+        else:
+            self._cambiar_disposicion(self._ordenar(self._visibles))
+    
+    def _cambiar_disposicion(self, visibles):
+        """
+        Reemplaza las filas visibles por otro orden de ellas (más las nuevas)
+        
+        Los índices persistentes (selección, fila actual) se mueven con su
+        deudor, para que la selección no quede sobre otra fila.
+        
+        Args:
+            visibles (list): Posiciones en _deudores; incluye todas las
+                visibles hasta ahora
+        """
+        self.layoutAboutToBeChanged.emit()
+        anteriores = self.persistentIndexList()
+        filas_anteriores = self._visibles
+        self._visibles = visibles
+        
+        if anteriores:
+            fila_de = {posicion: fila for fila, posicion in enumerate(visibles)}
+            self.changePersistentIndexList(anteriores, [
+                self.index(fila_de[filas_anteriores[indice.row()]], indice.column())
+                for indice in anteriores
+            ])
+        self.layoutChanged.emit()
+    
+    @trazar_bloqueo
+    def filtrar(self, texto):
+        """
+        Deja visibles los resultados cuyo nombre o documento contiene el texto
+        
+        Si el texto nuevo contiene al anterior, se filtra sobre lo que ya
+        estaba visible en lugar de sobre todos los resultados.
+        
+        Args:
+            texto (str): Texto a buscar (vacío: todos)
+        """
+        texto = texto.strip().upper()
+        if texto == self._filtro:
+            return
+        
+        refinar = self._filtro in texto
+        self._filtro = texto
+        
+        self.beginResetModel()
+        if refinar:
+            self._visibles = self._filtrar(self._visibles)
+        else:
+            self._visibles = self._ordenar(self._filtrar(range(len(self._deudores))))
+        self.endResetModel()
+    
+    def _filtrar(self, posiciones):
+        """Posiciones que pasan el filtro actual, en el mismo orden"""
+        texto = self._filtro
+        if not texto:
+            return list(posiciones)
+        
+        textos = self._textos
+        if len(textos) < len(self._deudores):
+            textos.extend(
+                f"{d.obtener_nombre_completo().upper()}\n{d.numero_documento}"
+                for d in self._deudores[len(textos):]
+            )
+        return [i for i in posiciones if texto in textos[i]]
+    
+    def _ordenar(self, posiciones):
+        """Posiciones en el orden actual (o tal cual si no hay orden)"""
+        if self._orden is None:
+            return posiciones
+        columna, orden = self._orden
+        
+        claves = self._claves.setdefault(columna, [])
+        if len(claves) < len(self._deudores):
+            claves.extend(self._claves_orden(columna, self._deudores[len(claves):]))
+        
+        return sorted(posiciones, key=claves.__getitem__,
+                      reverse=(orden == Qt.DescendingOrder))
+    
+    def _claves_orden(self, columna, deudores):
+        """
+        Claves tipadas de una columna para los deudores dados
+        
+        El documento numérico se rellena con ceros para que el orden de
+        texto sea el numérico; los no numéricos van después. Las fechas
+        ilegibles van al final del orden ascendente.
+        """
+        if columna == 0:
+            return [d.obtener_nombre_completo().upper() for d in deudores]
+        if columna == 1:
+            return [d.tipo_documento for d in deudores]
+        if columna == 2:
+            return [n.zfill(20) if n.isdigit() else '~' + n
+                    for n in (d.numero_documento for d in deudores)]
+        
+        # Las fechas se repiten mucho: cada texto se convierte una sola vez
+        fechas = self._fechas
+        return [fechas[t] if t in fechas else self._convertir_fecha(t)
+                for t in (d.fecha_registro for d in deudores)]
+    
+    def _convertir_fecha(self, texto):
+        """Convierte dd/mm/yyyy a datetime y lo recuerda (datetime.max si no se puede)"""
+        fecha = convertir_fecha(texto) or datetime.max
+        self._fechas[texto] = fecha
+        return fecha
+
+
+class DelegadoDetalle(QStyledItemDelegate):
+    """
+    Dibuja el botón "Ver Detalle" y detecta el clic, sin crear un widget
+    por fila
+    """
+    
+    COLOR = QColor('#4CAF50')
+    COLOR_HOVER = QColor('#45a049')
+    MARGEN = 4
+    
+    detalle_solicitado = pyqtSignal(int)
+    
+    def paint(self, painter, option, index):
+        rect = QRectF(option.rect.adjusted(self.MARGEN, self.MARGEN, -self.MARGEN, -self.MARGEN))
+        hover = bool(option.state & QStyle.State_MouseOver)
+        
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        camino = QPainterPath()
+        camino.addRoundedRect(rect, 3, 3)
+        painter.fillPath(camino, self.COLOR_HOVER if hover else self.COLOR)
+        painter.setPen(Qt.white)
+        painter.drawText(rect, Qt.AlignCenter, index.data())
+        painter.restore()
+    
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.MouseButtonRelease
+                and event.button() == Qt.LeftButton
+                and option.rect.contains(event.pos())):
+            self.detalle_solicitado.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+
+class TablaResultados(QTableView):
+    """
+    Vista de resultados con filas de alto fijo, de modo que solo se
+    consultan y dibujan las filas visibles aunque haya cientos de miles
+    
+    Los resultados que llegan por lotes (agregar_progresivo) se insertan en
+    tramos desde el bucle de eventos, sin bloquear la interfaz más de
+    PRESUPUESTO_TRAMO por vez.
+    """
+    
+    ALTO_FILA = 34
+    FILAS_POR_TRAMO = 2000
+    PRESUPUESTO_TRAMO = 0.008  # segundos por pasada del bucle de eventos
+    
+    detalle_solicitado = pyqtSignal(object)  # DeudorAlimentario
+    filas_mostradas = pyqtSignal(int)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        
+        self.modelo = ModeloResultados(self)
+        self.setModel(self.modelo)
+        
+        # (tipo, *criterios) de la búsqueda cuyos resultados se muestran
+        # completos; la pestaña lo indica al terminar la búsqueda
+        self.busqueda = None
+        
+        self.delegado_detalle = DelegadoDetalle(self)
+        self.setItemDelegateForColumn(ModeloResultados.COLUMNA_DETALLE, self.delegado_detalle)
+        self.delegado_detalle.detalle_solicitado.connect(
+            lambda fila: self.detalle_solicitado.emit(self.modelo.deudor(fila))
+        )
+        
+        # Alto fijo: la vista no mide cada fila al cargar los resultados
+        vertical = self.verticalHeader()
+        vertical.setSectionResizeMode(QHeaderView.Fixed)
+        vertical.setDefaultSectionSize(self.ALTO_FILA)
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        
+        # Orden por encabezado; al inicio, el de llegada
+        self.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.setSortingEnabled(True)
+        
+        # Lotes pendientes de insertar en el modelo
+        self._pendientes = deque()
+        self._timer_tramos = QTimer(self)
+        self._timer_tramos.setInterval(0)
+        self._timer_tramos.timeout.connect(self._insertar_tramos)
+        
+        self.setMouseTracking(True)  # para el hover del botón
+        self.setSelectionBehavior(QTableView.SelectRows)
+        self.setEditTriggers(QTableView.NoEditTriggers)
+        self.setWordWrap(False)
+        self.setStyleSheet("""
+            QTableView {
+                border: 1px solid #cccccc;
+                gridline-color: #e0e0e0;
+            }
+            QTableView::item {
+                padding: 8px;
+            }
+            QHeaderView::section {
+                background-color: #8B0000;
+                color: white;
+                padding: 10px;
+                font-weight: bold;
+                border: none;
+            }
+        """)
+    
+    @trazar_bloqueo
+    def mostrar(self, deudores):
+        """
+        Reemplaza los resultados mostrados
+        
+        Args:
+            deudores (list): Lista de objetos DeudorAlimentario
+        """
+        self._descartar_pendientes()
+        self.busqueda = None
+        self.modelo.establecer_deudores(deudores)
+        self.scrollToTop()
+        self.filas_mostradas.emit(self.modelo.rowCount())
+    
+    @trazar_bloqueo
+    def filtrar(self, texto):
+        """
+        Filtra los resultados mostrados por nombre o documento
+        
+        Args:
+            texto (str): Texto a buscar (vacío: todos)
+        """
+        self.modelo.filtrar(texto)
+        self.filas_mostradas.emit(self.modelo.rowCount())
+    
+    def agregar(self, deudores):
+        """
+        Agrega resultados al final
+        
+        Args:
+            deudores (list): Lista de objetos DeudorAlimentario
+        """
+        self.modelo.agregar_deudores(deudores)
+        self.filas_mostradas.emit(self.modelo.rowCount())
+    
+    def agregar_progresivo(self, deudores):
+        """
+        Encola resultados para agregarlos en tramos desde el bucle de eventos
+        
+        Si la tabla está vacía, el primer tramo se inserta de inmediato para
+        mostrar la primera pantalla sin esperar al temporizador.
+        
+        Args:
+            deudores (list): Lista de objetos DeudorAlimentario
+        """
+        if not deudores:
+            return
+        self._pendientes.append((deudores, 0))
+        if self.modelo.rowCount() == 0:
+            self._insertar_tramos()
+        if self._pendientes:
+            self._timer_tramos.start()
+    
+    def pendientes(self):
+        """
+        Returns:
+            int: Cantidad de filas encoladas aún no insertadas
+        """
+        return sum(len(lote) - desde for lote, desde in self._pendientes)
+    
+    def limpiar(self):
+        """Quita todos los resultados"""
+        self._descartar_pendientes()
+        self.busqueda = None
+        self.modelo.establecer_deudores([])
+        self.filas_mostradas.emit(0)
+    
+    @trazar_bloqueo
+    def _insertar_tramos(self):
+        """Inserta tramos pendientes hasta agotar el presupuesto de tiempo"""
+        limite = time.perf_counter() + self.PRESUPUESTO_TRAMO
+        
+        while self._pendientes:
+            lote, desde = self._pendientes.popleft()
+            hasta = desde + self.FILAS_POR_TRAMO
+            self.modelo.agregar_deudores(lote[desde:hasta])
+            if hasta < len(lote):
+                self._pendientes.appendleft((lote, hasta))
+            if time.perf_counter() >= limite:
+                break
+        
+        if not self._pendientes:
+            self._timer_tramos.stop()
+        self.filas_mostradas.emit(self.modelo.rowCount())
+    
+    def _descartar_pendientes(self):
+        """Olvida los lotes encolados que no llegaron a insertarse"""
+        self._pendientes.clear()
+        self._timer_tramos.stop()
+
+
+class SeguirVisibilidad(QObject):
+    """
+    Muestra u oculta un widget junto con una TablaResultados
+    """
+    
+    def __init__(self, widget, tabla):
+        """
+        Constructor
+        
+        Args:
+            widget (QWidget): Widget que acompaña a la tabla
+            tabla (TablaResultados): Tabla a seguir
+        """
+        super().__init__(widget)
+        self.widget = widget
+        self.tabla = tabla
+        tabla.installEventFilter(self)
+        widget.setVisible(not tabla.isHidden())
+    
+    def eventFilter(self, objeto, evento):
+        if objeto is self.tabla and evento.type() in (QEvent.Show, QEvent.Hide):
+            self.widget.setVisible(not self.tabla.isHidden())
+        return super().eventFilter(objeto, evento)
+
+
+class FiltroResultados(QLineEdit):
+    """
+    Campo para filtrar una TablaResultados mientras se escribe
+    
+    Se muestra y oculta junto con la tabla.
+    """
+    
+    RETARDO = 200  # ms sin teclear antes de filtrar
+    
+    def __init__(self, tabla, parent=None):
+        """
+        Constructor
+        
+        Args:
+            tabla (TablaResultados): Tabla a filtrar
+            parent (QWidget): Widget padre
+        """
+        super().__init__(parent)
+        self.tabla = tabla
+        
+        self.setPlaceholderText("Filtrar resultados por nombre o documento")
+        self.setClearButtonEnabled(True)
+        self.setStyleSheet("""
+            QLineEdit {
+                padding: 6px;
+                border: 1px solid #cccccc;
+                border-radius: 3px;
+            }
+        """)
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.RETARDO)
+        self._timer.timeout.connect(lambda: self.tabla.filtrar(self.text()))
+        self.textChanged.connect(self._timer.start)
+        
+        self.seguir_visibilidad = SeguirVisibilidad(self, tabla)
+
+
+class BotonExportar(QPushButton):
+    """
+    Botón que exporta las filas mostradas de una TablaResultados
+    
+    Se exporta lo que se ve: con el filtro y el orden elegidos. El formato
+    sale de la extensión del archivo. El archivo se escribe en el pool y
+    el botón muestra el avance hasta que termina.
+    
+    Si la tabla muestra completa, sin filtro ni orden, una búsqueda
+    terminada, se exporta con controlador.exportar_busqueda a medida que
+    se lee, sin copiar las filas; si no, se exporta una copia de las filas
+    visibles tomada al pulsar.
+    """
+    
+    FILTROS = ("CSV (*.csv);;JSON Lines (*.jsonl);;"
+               "Parquet (*.parquet);;Arrow IPC (*.arrow)")
+    TEXTO = "Exportar"
+    
+    def __init__(self, tabla, controlador=None, parent=None):
+        """
+        Constructor
+        
+        Args:
+            tabla (TablaResultados): Tabla a exportar
+            controlador (ControladorREDAM): Controlador para exportar la
+                búsqueda sin pasar por la tabla (opcional)
+            parent (QWidget): Widget padre
+        """
+        super().__init__(self.TEXTO, parent)
+        self.tabla = tabla
+        self.controlador = controlador
+        self.setStyleSheet("""
+            QPushButton {
+                background-color: #f0f0f0;
+                border: 1px solid #cccccc;
+                border-radius: 3px;
+                padding: 6px 15px;
+            }
+            QPushButton:hover {
+                background-color: #e0e0e0;
+            }
+        """)
+        self.clicked.connect(self.exportar)
+        self.seguir_visibilidad = SeguirVisibilidad(self, tabla)
+    
+    def exportar(self):
+        """Pide el archivo de destino y exporta las filas mostradas en el pool"""
+        ruta, _ = QFileDialog.getSaveFileName(self, "Exportar resultados", "resultados.csv",
+                                              self.FILTROS)
+        if not ruta:
+            return
+        
+        busqueda = self.tabla.busqueda
+        if (self.controlador is not None and busqueda is not None
+                and self.tabla.modelo.muestra_todos()):
+            funcion, args = self.controlador.exportar_busqueda, (ruta,) + tuple(busqueda)
+        else:
+            # La tabla puede cambiar mientras se escribe el archivo
+            funcion, args = exportar, (list(self.tabla.modelo.deudores_visibles()), ruta)
+        
+        self.setEnabled(False)
+        self.setText("Exportando...")
+        ejecutar_en_fondo(funcion, *args,
+                          al_terminar=lambda total: self._al_terminar(ruta, total),
+                          al_fallar=self._al_fallar,
+                          al_progresar=lambda total: self.setText(f"Exportando... {total}"))
+    
+    def _al_terminar(self, ruta, total):
+        """Informa la exportación terminada"""
+        self._restablecer()
+        QMessageBox.information(self, "Exportación", f"Se exportaron {total} deudores a\n{ruta}")
+    
+    def _al_fallar(self, mensaje):
+        """Informa el error de la exportación"""
+        self._restablecer()
+        QMessageBox.critical(self, "Error", f"No se pudo exportar:\n{mensaje}")
+    
+    def _restablecer(self):
+        """Deja el botón listo para otra exportación"""
+        self.setText(self.TEXTO)
+        self.setEnabled(True)
@@ -0,0 +1,95 @@
+"""
+Tareas cortas fuera del hilo de la interfaz
+Responsabilidad: Ejecutar en el QThreadPool una llamada que puede esperar a
+la red o al disco (detalle del deudor, captcha, exportación) y entregar su
+resultado, su progreso o su error por señales en el hilo de la interfaz
+"""
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class SenalesTarea(QObject):
+    """Señales de una TareaFondo (QRunnable no puede emitir señales)"""
+    
+    terminada = pyqtSignal(object)
+    fallida = pyqtSignal(str)
+    progreso = pyqtSignal(int)
+
+
+class TareaFondo(QRunnable):
+    """
+    Ejecuta una función en un hilo del pool
+    
+    Con con_progreso, la función recibe progreso=callable, que emite la
+    señal progreso (por ejemplo, filas escritas hasta ahora).
+    """
+    
+    def __init__(self, funcion, args, kwargs, con_progreso=False):
+        """
+        Constructor
+        
+        Args:
+            funcion (callable): Función a ejecutar
+            args (tuple): Argumentos posicionales
+            kwargs (dict): Argumentos con nombre
+            con_progreso (bool): Pasar progreso=callable a la función
+        """
+        super().__init__()
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = dict(kwargs)
+        self.senales = SenalesTarea()
+        if con_progreso:
+            self.kwargs['progreso'] = self.senales.progreso.emit
+    
+    def run(self):
+        try:
+            resultado = self.funcion(*self.args, **self.kwargs)
+        except Exception as e:
+            self.senales.fallida.emit(str(e))
+            return
+        self.senales.terminada.emit(resultado)
+
+
+# Tareas en curso: sus señales deben vivir hasta que la interfaz las reciba
+_en_curso = set()
+
+
+def ejecutar_en_fondo(funcion, *args, al_terminar=None, al_fallar=None, al_progresar=None,
+                      pool=None, **kwargs):
+    """
+    Ejecuta funcion(*args, **kwargs) en el pool y avisa en el hilo de la interfaz
+    
+    Las señales se conectan antes de iniciar la tarea, así que ningún
+    resultado se pierde aunque la función termine enseguida.
+    
+    Args:
+        funcion (callable): Función a ejecutar
+        *args: Argumentos de la función
+        al_terminar (callable): Recibe el resultado (opcional)
+        al_fallar (callable): Recibe el mensaje de error (opcional)
+        al_progresar (callable): Recibe el progreso; con él, la función
+            recibe progreso=callable (opcional)
+        pool (QThreadPool): Pool a usar (por defecto el global)
+        **kwargs: Argumentos con nombre de la función
+    
+    Returns:
+        SenalesTarea: Señales de la tarea
+    """
+    tarea = TareaFondo(funcion, args, kwargs, con_progreso=al_progresar is not None)
+    senales = tarea.senales
+    
+    if al_progresar is not None:
+        senales.progreso.connect(al_progresar)
+    if al_terminar is not None:
+        senales.terminada.connect(al_terminar)
+    if al_fallar is not None:
+        senales.fallida.connect(al_fallar)
+    
+    # Se conectan al final: se liberan después de avisar al llamador
+    _en_curso.add(senales)
+    senales.terminada.connect(lambda resultado: _en_curso.discard(senales))
+    senales.fallida.connect(lambda mensaje: _en_curso.discard(senales))
+    
+    (pool or QThreadPool.globalInstance()).start(tarea)
+    return senales
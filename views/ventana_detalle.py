@@ -4,20 +4,77 @@ VentanaDetalle - Ventana modal que muestra información completa del deudor
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QGroupBox, QGridLayout, QScrollArea,
-                             QWidget, QFrame)
-from PyQt5.QtCore import Qt
+                             QWidget, QFrame, QListView)
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
 from PyQt5.QtGui import QFont, QPixmap
+from views.monitor_latencia import trazar_bloqueo
+from views.tareas_fondo import ejecutar_en_fondo
+
+
+class ModeloExpedientes(QAbstractListModel):
+    """
+    Lista de expedientes con una línea de resumen por cada uno
+    
+    El resumen se arma cuando la vista lo pide, solo para las filas visibles.
+    """
+    
+    def __init__(self, expedientes, parent=None):
+        super().__init__(parent)
+        self._expedientes = expedientes
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._expedientes)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return None
+        
+        expediente = self._expedientes[index.row()]
+        return (f"N° {index.row() + 1}  |  {expediente.numero_expediente}  |  "
+                f"{expediente.distrito_judicial}  |  "
+                f"Total S/ {expediente.calcular_monto_total():.2f}")
+    
+    def expediente(self, fila):
+        """
+        Retorna el expediente de una fila
+        
+        Args:
+            fila (int): Número de fila
+        
+        Returns:
+            Expediente: Expediente de esa fila
+        """
+        return self._expedientes[fila]
+
 
 class VentanaDetalle(QDialog):
     """
     Ventana modal para mostrar el detalle completo de un deudor
+    
+    Con pocos expedientes se muestra la ficha de cada uno. Con más de
+    MAX_FICHAS se muestra una lista de resúmenes y solo la ficha del
+    expediente seleccionado, de modo que abrir el detalle cuesta lo mismo
+    tenga el deudor los expedientes que tenga.
     """
     
-    def __init__(self, deudor, parent=None):
+    MAX_FICHAS = 3
+    FILAS_VISIBLES_LISTA = 8
+    
+    def __init__(self, deudor, parent=None, cargando=False):
+        """
+        Constructor
+        
+        Args:
+            deudor (Deudor): Deudor a mostrar
+            parent (QWidget): Widget padre
+            cargando (bool): Los expedientes llegarán luego por actualizar()
+        """
         super().__init__(parent)
         self.deudor = deudor
+        self.cargando = cargando
         self.init_ui()
     
+    @trazar_bloqueo
     def init_ui(self):
         """Inicializa la interfaz"""
         self.setWindowTitle("Detalle del Deudor Alimentario Moroso")
@@ -42,30 +99,12 @@ class VentanaDetalle(QDialog):
         main_layout.addWidget(titulo)
         
         # Área con scroll
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; }")
-        
-        content_widget = QWidget()
-        content_layout = QVBoxLayout()
-        content_widget.setLayout(content_layout)
-        
-        # Sección: Datos Personales
-        grupo_personal = self._crear_grupo_datos_personales()
-        content_layout.addWidget(grupo_personal)
-        
-        # Sección: Datos Judiciales (por cada expediente)
-        if hasattr(self.deudor, 'expedientes') and self.deudor.expedientes:
-            for i, expediente in enumerate(self.deudor.expedientes):
-                grupo_judicial = self._crear_grupo_datos_judiciales(expediente, i+1)
-                content_layout.addWidget(grupo_judicial)
-        else:
-            label_sin_exp = QLabel("No hay expedientes disponibles")
-            label_sin_exp.setStyleSheet("color: orange; font-size: 14px; padding: 20px;")
-            content_layout.addWidget(label_sin_exp)
-        
-        scroll.setWidget(content_widget)
-        main_layout.addWidget(scroll)
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.scroll.setStyleSheet("QScrollArea { border: none; }")
+        aviso = "Cargando expedientes..." if self.cargando else None
+        self.scroll.setWidget(self._crear_contenido(aviso))
+        main_layout.addWidget(self.scroll)
         
         # Botón Cerrar
         btn_cerrar = QPushButton("CERRAR")
@@ -92,6 +131,64 @@ class VentanaDetalle(QDialog):
         
         self.setLayout(main_layout)
     
+    def _crear_contenido(self, aviso=None):
+        """
+        Crea el contenido del área con scroll
+        
+        Args:
+            aviso (str): Texto a mostrar en lugar de los expedientes (opcional)
+        
+        Returns:
+            QWidget: Datos personales y expedientes del deudor
+        """
+        content_widget = QWidget()
+        content_layout = QVBoxLayout()
+        content_widget.setLayout(content_layout)
+        
+        # Sección: Datos Personales
+        grupo_personal = self._crear_grupo_datos_personales()
+        content_layout.addWidget(grupo_personal)
+        
+        # Sección: Datos Judiciales (por cada expediente)
+        if aviso is not None:
+            label_aviso = QLabel(aviso)
+            label_aviso.setStyleSheet("color: #555; font-size: 14px; padding: 20px;")
+            content_layout.addWidget(label_aviso)
+        elif hasattr(self.deudor, 'expedientes') and len(self.deudor.expedientes) > self.MAX_FICHAS:
+            content_layout.addWidget(self._crear_lista_expedientes())
+        elif hasattr(self.deudor, 'expedientes') and self.deudor.expedientes:
+            for i, expediente in enumerate(self.deudor.expedientes):
+                grupo_judicial = self._crear_grupo_datos_judiciales(expediente, i+1)
+                content_layout.addWidget(grupo_judicial)
+        else:
+            label_sin_exp = QLabel("No hay expedientes disponibles")
+            label_sin_exp.setStyleSheet("color: orange; font-size: 14px; padding: 20px;")
+            content_layout.addWidget(label_sin_exp)
+        
+        return content_widget
+    
+    @trazar_bloqueo
+    def actualizar(self, deudor):
+        """
+        Muestra el deudor con el detalle ya completo
+        
+        Args:
+            deudor (Deudor): Deudor con sus expedientes
+        """
+        self.deudor = deudor
+        self.cargando = False
+        self.scroll.setWidget(self._crear_contenido())
+    
+    def mostrar_error(self, mensaje):
+        """
+        Reemplaza el aviso de carga por el error al obtener el detalle
+        
+        Args:
+            mensaje (str): Mensaje de error
+        """
+        self.cargando = False
+        self.scroll.setWidget(self._crear_contenido(f"No se pudo obtener el detalle: {mensaje}"))
+    
     def _crear_grupo_datos_personales(self):
         """Crea el grupo de datos personales"""
         grupo = QGroupBox("DATOS PERSONALES DEL DEUDOR")
@@ -144,6 +241,77 @@ class VentanaDetalle(QDialog):
         grupo.setLayout(layout)
         return grupo
     
+    def _crear_lista_expedientes(self):
+        """
+        Crea la lista de resúmenes con la ficha del expediente seleccionado
+        
+        Returns:
+            QWidget: Lista y contenedor de la ficha
+        """
+        contenedor = QWidget()
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        contenedor.setLayout(layout)
+        
+        titulo = QLabel(f"EXPEDIENTES ({len(self.deudor.expedientes)}) - "
+                        "seleccione uno para ver su ficha")
+        titulo.setFont(QFont('Arial', 10, QFont.Bold))
+        layout.addWidget(titulo)
+        
+        self.modelo_expedientes = ModeloExpedientes(self.deudor.expedientes, self)
+        self.lista_expedientes = QListView()
+        self.lista_expedientes.setModel(self.modelo_expedientes)
+        # Filas de igual alto y distribución por tandas: la vista no mide
+        # cada resumen antes de mostrarse
+        self.lista_expedientes.setUniformItemSizes(True)
+        self.lista_expedientes.setLayoutMode(QListView.Batched)
+        self.lista_expedientes.setStyleSheet("""
+            QListView {
+                border: 2px solid #4CAF50;
+                border-radius: 5px;
+            }
+            QListView::item {
+                padding: 6px;
+            }
+            QListView::item:selected {
+                background-color: #4CAF50;
+                color: white;
+            }
+        """)
+        alto_fila = self.lista_expedientes.sizeHintForRow(0)
+        self.lista_expedientes.setFixedHeight(alto_fila * self.FILAS_VISIBLES_LISTA + 6)
+        layout.addWidget(self.lista_expedientes)
+        
+        self.ficha_expediente = None
+        self.layout_ficha = QVBoxLayout()
+        layout.addLayout(self.layout_ficha)
+        
+        self.lista_expedientes.selectionModel().currentRowChanged.connect(
+            lambda actual, anterior: self.mostrar_expediente(actual.row())
+        )
+        self.lista_expedientes.setCurrentIndex(self.modelo_expedientes.index(0))
+        
+        return contenedor
+    
+    @trazar_bloqueo
+    def mostrar_expediente(self, fila):
+        """
+        Reemplaza la ficha mostrada por la del expediente de la fila
+        
+        Args:
+            fila (int): Fila de la lista de expedientes
+        """
+        if fila < 0:
+            return
+        if self.ficha_expediente is not None:
+            self.layout_ficha.removeWidget(self.ficha_expediente)
+            self.ficha_expediente.deleteLater()
+        
+        self.ficha_expediente = self._crear_grupo_datos_judiciales(
+            self.modelo_expedientes.expediente(fila), fila + 1
+        )
+        self.layout_ficha.addWidget(self.ficha_expediente)
+    
     def _crear_grupo_datos_judiciales(self, expediente, numero):
         """Crea el grupo de datos judiciales"""
         grupo = QGroupBox(f"EXPEDIENTE N° {numero}")
@@ -225,3 +393,26 @@ class VentanaDetalle(QDialog):
         
         layout.addWidget(label, row, col)
         layout.addWidget(value, row, col + 1, 1, colspan)
+
+
+def abrir_detalle(controlador, deudor, parent=None):
+    """
+    Abre la ventana de detalle de un deudor
+    
+    Si falta el expediente y hay que descargarlo del REDAM, la ventana se
+    abre enseguida con un aviso de carga y la descarga corre en el pool;
+    la ventana se completa al llegar el detalle.
+    
+    Args:
+        controlador (ControladorREDAM): Controlador de la aplicación
+        deudor (DeudorAlimentario): Deudor seleccionado
+        parent (QWidget): Widget padre de la ventana
+    """
+    if not controlador.requiere_detalle(deudor):
+        VentanaDetalle(deudor, parent).exec_()
+        return
+    
+    ventana = VentanaDetalle(deudor, parent, cargando=True)
+    ejecutar_en_fondo(controlador.completar_detalle, deudor,
+                      al_terminar=ventana.actualizar, al_fallar=ventana.mostrar_error)
+    ventana.exec_()
@@ -4,7 +4,7 @@ VentanaPrincipal - Ventana principal de la aplicación
 
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QTabWidget,
                              QLabel, QMessageBox, QStatusBar)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QFont
 
 # Importaciones locales
@@ -12,19 +12,37 @@ from controllers.controlador_redam import ControladorREDAM
 from views.tab_nombres import TabNombres
 from views.tab_dni import TabDNI
 from views.tab_fechas import TabFechas
+from services.circuito import ESTADO_ABIERTO, ESTADO_SEMIABIERTO
+from views.monitor_latencia import trazar_bloqueo
 
 class VentanaPrincipal(QMainWindow):
     """
     Ventana principal del sistema REDAM
     """
     
-    def __init__(self):
-        """Constructor de la ventana principal"""
+    # Emitida desde el hilo de la sonda; Qt la entrega en el hilo de la UI
+    estado_circuito_cambiado = pyqtSignal(str)
+    
+    def __init__(self, busqueda_en_vivo=False, usar_api_real=False, base_url=None,
+                 prefetch_detalles=0):
+        """
+        Constructor de la ventana principal
+        
+        Args:
+            busqueda_en_vivo (bool): Buscar por nombres mientras se escribe
+                (solo instalaciones internas de confianza)
+            usar_api_real (bool): Consultar el REDAM cuando el registro local
+                no alcanza (con el captcha del REDAM en las pestañas)
+            base_url (str): URL base alternativa del REDAM
+            prefetch_detalles (int): Detalles a precargar tras cada búsqueda
+                en el REDAM (0 la desactiva)
+        """
         super().__init__()
+        self.busqueda_en_vivo = busqueda_en_vivo
         
-        # Inicializar controlador (sin parámetros por ahora)
         try:
-            self.controlador = ControladorREDAM()
+            self.controlador = ControladorREDAM(usar_api_real=usar_api_real, base_url=base_url,
+                                               prefetch_detalles=prefetch_detalles)
             print("Controlador inicializado correctamente")
         except Exception as e:
             print(f" Error al inicializar controlador: {e}")
@@ -34,9 +52,14 @@ class VentanaPrincipal(QMainWindow):
         # Inicializar interfaz
         self.init_ui()
         
-        # Mostrar estado
+        # Mostrar estado y seguir los cambios del circuito de la API
+        self.estado_circuito_cambiado.connect(lambda estado: self.mostrar_estado_conexion())
+        circuito = self._obtener_circuito()
+        if circuito is not None:
+            circuito.agregar_observador(self.estado_circuito_cambiado.emit)
         self.mostrar_estado_conexion()
     
+    @trazar_bloqueo
     def init_ui(self):
         """Inicializa la interfaz de usuario"""
         self.setWindowTitle('Sistema REDAM - Poder Judicial del Perú')
@@ -91,7 +114,7 @@ class VentanaPrincipal(QMainWindow):
         
         # Crear pestañas
         try:
-            self.tab_nombres = TabNombres(self.controlador)
+            self.tab_nombres = TabNombres(self.controlador, self.busqueda_en_vivo)
             self.tab_dni = TabDNI(self.controlador)
             self.tab_fechas = TabFechas(self.controlador)
             
@@ -99,8 +122,14 @@ class VentanaPrincipal(QMainWindow):
             self.tabs.addTab(self.tab_dni, " DOCUMENTO DE IDENTIDAD")
             self.tabs.addTab(self.tab_fechas, "RANGO DE PERIODOS")
             
-            print(" Pestañas creadas correctamente")
+            # El REDAM solo acepta el último captcha de la sesión: se renueva
+            # el de la pestaña visible (los pedidos anteriores se descartan)
+            if self.controlador.usar_api:
+                self.tabs.currentChanged.connect(self.renovar_captcha)
+                self.renovar_captcha()
             
+            print(" Pestañas creadas correctamente")
+        
         except Exception as e:
             print(f" Error al crear pestañas: {e}")
             import traceback
@@ -119,9 +148,29 @@ class VentanaPrincipal(QMainWindow):
             }
         """)
     
+    def renovar_captcha(self, indice=None):
+        """Descarga un captcha nuevo para la pestaña visible"""
+        pestana = self.tabs.currentWidget()
+        if pestana is not None:
+            pestana.generar_captcha()
+    
+    def _obtener_circuito(self):
+        """Retorna el circuito de la API del controlador, si la usa"""
+        api = getattr(self.controlador, 'api', None)
+        return getattr(api, 'circuito', None)
+    
     def mostrar_estado_conexion(self):
         """Muestra el estado de conexión en la barra de estado"""
-        if hasattr(self.controlador, 'usar_api') and self.controlador.usar_api:
+        circuito = self._obtener_circuito()
+        estado = circuito.estado if circuito is not None else None
+        
+        if estado == ESTADO_ABIERTO:
+            mensaje = " Servidor del REDAM no disponible - verificando en segundo plano"
+            color = "red"
+        elif estado == ESTADO_SEMIABIERTO:
+            mensaje = " Verificando conexión con el REDAM..."
+            color = "orange"
+        elif hasattr(self.controlador, 'usar_api') and self.controlador.usar_api:
             mensaje = " Conectado a API real del REDAM"
             color = "green"
         else: